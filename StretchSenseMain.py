@@ -17,9 +17,11 @@
 
 """
 
+import os
 import stretchSenseLibrary
 import sys
 import time
+import numpy as np
 from PyQt4 import QtGui, QtCore, uic
 
 
@@ -36,46 +38,119 @@ class MainWindow(QtGui.QMainWindow):
         self.centralWidget()
 
 
-class SpiThread(QtCore.QThread):
+class AcquisitionThread(QtCore.QThread):
 
-    def __init__(self):
-        super(SpiThread, self).__init__()
+    """
+    Thread which reads a transport of the API continuously, away from the GUI thread. The frames received
+    are grouped and sent to the GUI every batchTime seconds through a queued signal.
+
+    """
+
+    # Time in seconds spent reading the transport before the frames are sent to the GUI
+    batchTime = 0.01
+
+    # Time in seconds stop() waits for the read in progress to return
+    stopTimeout = 1.0
+
+    def __init__(self, signalName):
+        super(AcquisitionThread, self).__init__()
 
-        self.timer = QtCore.QTimer(self)
-        self.timer.setInterval(10)
-        self.timer.timeout.connect(self.run)
+        self.signalName = signalName
+        self.running = False
+        self.timeEnd = 0
+
+        self.connect(self, QtCore.SIGNAL("finished()"), self.threadFinished, QtCore.Qt.QueuedConnection)
 
     def start(self):
-        self.timer.start()
-        self.run()
+        self.running = True
+
+        # A thread which has not finished its last read after stop() carries on reading
+        if self.isRunning():
+            return
+        super(AcquisitionThread, self).start()
 
     def stop(self):
-        self.timer.stop()
+        self.running = False
+
+        # A read blocked on the transport must not freeze the GUI, the thread then ends on its own
+        return self.wait(int(self.stopTimeout * 1000))
+
+    def threadFinished(self):
+        # Started again while it was finishing, after its loop had already ended
+        if self.running and not self.isRunning():
+            super(AcquisitionThread, self).start()
+
+    def read(self):
+        pass
 
     def run(self):
+        while self.running:
+            self.timeEnd = time.monotonic() + self.batchTime
+
+            while self.running and time.monotonic() < self.timeEnd:
+                self.read()
+
+            batch = stretchsenseObject.getFrames()
+            if batch:
+                self.emit(QtCore.SIGNAL(self.signalName), batch)
+
+
+class SpiThread(AcquisitionThread):
+
+    def __init__(self):
+        super(SpiThread, self).__init__("spiThreadDone(PyQt_PyObject)")
+
+        # Time of the next read when the bus is polled at the output data rate
+        self.timeNextRead = 0
+
+    def read(self):
+        configuration = stretchsenseObject.spiConfiguration
+        rate = stretchsenseObject.dictOutputDataRate.get(configuration.odrMode)
+
+        # Without the data ready interrupt spi_mode() does not wait, the bus is read once per sample
+        if (configuration.interruptMode == stretchSenseLibrary.INTERRUPT_DISABLED and
+                configuration.triggerMode == stretchSenseLibrary.TRIGGER_DISABLED and rate):
+            now = time.monotonic()
+
+            # Sleep until the next sample, or until the batch is sent to the GUI
+            if now < self.timeNextRead:
+                time.sleep(max(min(self.timeNextRead, self.timeEnd) - now, 0))
+                now = time.monotonic()
+                if now < self.timeNextRead:
+                    return
+
+            # After a late read the next one is a full period away, late reads do not pile up
+            self.timeNextRead += 1.0 / rate
+            if self.timeNextRead < now:
+                self.timeNextRead = now + 1.0 / rate
+
         stretchsenseObject.spi_mode()
-        self.emit(QtCore.SIGNAL("spiThreadDone()"))
 
 
-class BleThread(QtCore.QThread):
+class BleThread(AcquisitionThread):
 
     def __init__(self):
-        super(BleThread, self).__init__()
+        super(BleThread, self).__init__("bleThreadDone(PyQt_PyObject)")
 
-        self.timer = QtCore.QTimer(self)
-        self.timer.setInterval(10)
-        self.timer.timeout.connect(self.run)
+    def read(self):
+        if len(stretchsenseObject.ble_getListPeripheralInUse()) > 0:
+            stretchsenseObject.ble_waitNotifications()
+        else:
+            time.sleep(self.batchTime)
 
-    def start(self):
-        self.timer.start()
-        self.run()
 
-    def stop(self):
-        self.timer.stop()
+class ReplayThread(AcquisitionThread):
 
-    def run(self):
-        stretchsenseObject.ble_waitNotifications()
-        self.emit(QtCore.SIGNAL("bleThreadDone()"))
+    """
+    Thread which replays a recording opened with replay_open(), its frames are displayed as BLE frames.
+
+    """
+
+    def __init__(self):
+        super(ReplayThread, self).__init__("bleThreadDone(PyQt_PyObject)")
+
+    def read(self):
+        stretchsenseObject.replay_mode()
 
 
 class QCustomScanWidget(QtGui.QWidget):
@@ -132,80 +207,495 @@ class QCustomScanWidget(QtGui.QWidget):
         self.setIcon("_Icons/StretchSense_Logo_Blue_resized_15x15.png")
 
 
-class QCustomQWidget(QtGui.QWidget):
+class ValueTableModel(QtCore.QAbstractTableModel):
+
+    """
+    Model of a value table with one row per channel. The frames received are only stored, the rows are
+    updated by refresh() at the display rate and only the values whose displayed text changed are
+    signalled to the view.
+
+    """
+
+    headers = ["Address", "Channel Number", "Value (pF)"]
 
     def __init__(self, parent=None):
-        super(QCustomQWidget, self).__init__(parent)
-        self.textQVBoxLayout = QtGui.QVBoxLayout()
-        self.textUpQLabel = QtGui.QLabel()
-        self.textMiddleQLabel = QtGui.QLabel()
-        self.textDownQLabel = QtGui.QLabel()
-        self.textQVBoxLayout.addWidget(self.textUpQLabel)
-        self.textQVBoxLayout.addWidget(self.textMiddleQLabel)
-        self.textQVBoxLayout.addWidget(self.textDownQLabel)
-        self.allQHBoxLayout = QtGui.QHBoxLayout()
-        self.iconQLabel = QtGui.QLabel()
-        self.allQHBoxLayout.addWidget(self.iconQLabel, 0)
-        self.allQHBoxLayout.addLayout(self.textQVBoxLayout, 1)
-        self.setLayout(self.allQHBoxLayout)
-        self.myListOfCustomWidget = []
+        super(ValueTableModel, self).__init__(parent)
 
-        # Set stylesheet
+        self.listAddr = []
+        self.listChannelNumber = []
+        self.listValue = []
+        self.listText = []
+        self.dictFirstRow = {}
+        self.dictNumberOfRow = {}
+        self.dictPendingValues = {}
 
-        self.textUpQLabel.setStyleSheet('''background-color: rgba(0, 0, 0, 0);
-                                                color: rgb(0, 174, 239);
-                                                border-style: solid;
-                                                border-width: 1px;
-                                                border-color: transparent;''')
-        self.textMiddleQLabel.setStyleSheet('''background-color: rgba(0, 0, 0, 0);
-                                                color: rgb(63, 199, 189);
-                                                border-style: solid;
-                                                border-width: 1px;
-                                                border-color: transparent;''')
-        self.textDownQLabel.setStyleSheet('''background-color: rgba(0, 0, 0, 0);
-                                                color: rgb(237, 61, 150);
-                                                border-style: solid;
-                                                border-width: 1px;
-                                                border-color: transparent;''')
-        self.iconQLabel.setStyleSheet('''       background-color: rgba(255, 255, 255, 0);
-                                                border-style: solid;
-                                                border-width: 1px;
-                                                border-color: transparent;''')
+    def formatValue(self, value):
+        return "%g" % value
 
-    def setTextUp(self, text):
-        self.textUpQLabel.setText("Address = " + text)
+    def setChannels(self, listPeripheral):
 
-    def setTextMiddle(self, text):
-        self.textMiddleQLabel.setText("Channel Number = " + text)
+        """
+        Create one row for each channel.
 
-    def setTextDowm(self, text):
-        self.textDownQLabel.setText("Value = " + text + " pF")
+        :param listPeripheral: [StretchSensePeripheral] :
+            Channels to display, the channels of one device must follow each other.
 
-    def setIcon(self, imagePath):
-        self.iconQLabel.setPixmap(QtGui.QPixmap(imagePath))
+        """
 
-    def listOfCustomWidget(self, myWidget):
+        self.beginResetModel()
 
-        self.myListOfCustomWidget.append(myWidget)
+        self.listAddr = []
+        self.listChannelNumber = []
+        self.listValue = []
+        self.listText = []
+        self.dictFirstRow = {}
+        self.dictNumberOfRow = {}
+        self.dictPendingValues = {}
 
-    def setWidget(self, addr, index, value):
+        for myPeripheral in listPeripheral:
 
-        self.setTextUp(str(addr))
-        self.setTextMiddle(str(index))
-        self.setTextDowm(str(value))
-        self.setIcon("_Icons/StretchSense_Logo_Blue_resized_15x15.png")
+            if myPeripheral.addr == '':
+                continue
 
-    def update(self, addr, index, value):
+            if myPeripheral.addr not in self.dictFirstRow:
+                self.dictFirstRow[myPeripheral.addr] = len(self.listAddr)
+                self.dictNumberOfRow[myPeripheral.addr] = 0
 
-        self.setTextUp(str(addr))
-        self.setTextMiddle(str(index + 1))
-        self.setTextDowm(str(value))
-        if (value >= 10 and value <= 600):
-            self.iconQLabel.setStyleSheet('''background-color: rgb(0, 255, 0);
-                                             border-color: transparent;''')
-        else:
-            self.iconQLabel.setStyleSheet('''background-color: rgba(255, 0, 0, 160);
-                                             border-color: transparent;''')
+            self.dictNumberOfRow[myPeripheral.addr] += 1
+            self.listAddr.append(myPeripheral.addr)
+            self.listChannelNumber.append(str(int(myPeripheral.channelNumber) + 1))
+            self.listValue.append(myPeripheral.value)
+            self.listText.append(self.formatValue(myPeripheral.value))
+
+        self.endResetModel()
+
+    def pushFrames(self, batch):
+
+        """
+        Keep the last values received from each device until the next refresh.
+
+        :param batch: [StretchSenseFrame] :
+            Frames received.
+
+        """
+
+        for frame in batch:
+            self.dictPendingValues[frame.addr] = frame.values
+
+    def refresh(self):
+
+        """
+        Update the rows with the last values received and signal the values which changed.
+
+        """
+
+        if not self.dictPendingValues:
+            return
+
+        listRowChanged = []
+
+        for addr, values in self.dictPendingValues.items():
+            firstRow = self.dictFirstRow.get(addr)
+
+            if firstRow is None:
+                continue
+
+            for i in range(min(len(values), self.dictNumberOfRow[addr])):
+                text = self.formatValue(values[i])
+
+                if text != self.listText[firstRow + i]:
+                    self.listText[firstRow + i] = text
+                    self.listValue[firstRow + i] = values[i]
+                    listRowChanged.append(firstRow + i)
+
+        self.dictPendingValues = {}
+        listRowChanged.sort()
+
+        # Signal each run of consecutive rows at once
+        i = 0
+        while i < len(listRowChanged):
+            j = i
+            while j + 1 < len(listRowChanged) and listRowChanged[j + 1] == listRowChanged[j] + 1:
+                j += 1
+            self.emit(QtCore.SIGNAL("dataChanged(QModelIndex,QModelIndex)"), self.index(listRowChanged[i], 2), self.index(listRowChanged[j], 2))
+            i = j + 1
+
+    def rowCount(self, parent=QtCore.QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self.listAddr)
+
+    def columnCount(self, parent=QtCore.QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self.headers)
+
+    def data(self, index, role=QtCore.Qt.DisplayRole):
+        if not index.isValid():
+            return None
+
+        row = index.row()
+        column = index.column()
+
+        if role == QtCore.Qt.DisplayRole:
+            if column == 0:
+                return self.listAddr[row]
+            elif column == 1:
+                return self.listChannelNumber[row]
+            return self.listText[row]
+
+        if role == QtCore.Qt.BackgroundRole and column == 2:
+            if (self.listValue[row] >= 10 and self.listValue[row] <= 600):
+                return QtGui.QColor(0, 255, 0)
+            return QtGui.QColor(255, 0, 0, 160)
+
+        return None
+
+    def headerData(self, section, orientation, role=QtCore.Qt.DisplayRole):
+        if role == QtCore.Qt.DisplayRole and orientation == QtCore.Qt.Horizontal:
+            return self.headers[section]
+        return None
+
+
+def arrayToPolygon(x, y):
+
+    """
+    Build a QPolygonF from two NumPy arrays, the points are written directly in the memory of the polygon.
+
+    :param x: array :
+        Abscissa of each point.
+
+    :param y: array :
+        Ordinate of each point.
+
+    :returns: QPolygonF : Polygon made of the points.
+
+    """
+
+    polygon = QtGui.QPolygonF(len(x))
+    pointer = polygon.data()
+    pointer.setsize(2 * len(x) * np.dtype(np.float64).itemsize)
+    memory = np.frombuffer(pointer, np.float64)
+    memory[0::2] = x
+    memory[1::2] = y
+    return polygon
+
+
+class QLineGraphWidget(QtGui.QWidget):
+
+    """
+    Widget which draws the last historyTime seconds of every channel. Each channel is drawn as the minimum
+    and maximum of the samples falling in each pixel column. These columns are updated as the frames arrive,
+    so drawing costs the same whatever the sampling rate and the history length. The frames themselves are
+    kept in a StretchSenseRingBuffer, which grows with the rate of the device, to draw the columns again
+    when the widget is resized.
+
+    """
+
+    # Time in seconds displayed
+    historyTime = 30.0
+
+    # Highest number of frames per second kept for one device
+    maximumSampleRate = 2000
+
+    # Color of each channel
+    listColor = [QtGui.QColor(0, 174, 239), QtGui.QColor(237, 61, 150), QtGui.QColor(63, 199, 189),
+                 QtGui.QColor(247, 148, 29), QtGui.QColor(141, 198, 63), QtGui.QColor(102, 45, 145),
+                 QtGui.QColor(190, 30, 45), QtGui.QColor(0, 104, 56), QtGui.QColor(241, 90, 36),
+                 QtGui.QColor(65, 64, 66)]
+
+    def __init__(self, parent=None):
+        super(QLineGraphWidget, self).__init__(parent)
+
+        self.listAddr = []
+        self.dictNumberOfChannels = {}
+        self.dictBuffer = {}
+        self.newFrames = False
+
+        # Column of the samples of each device : index of the column held by each slot, minimum and maximum
+        self.dictColumns = {}
+        self.numberOfColumns = 0
+        self.columnTime = 1.0
+
+    def setChannels(self, listPeripheral, sampleRate=100):
+
+        """
+        Create a ring buffer for each device, the history of the devices already drawn is kept.
+
+        :param listPeripheral: [StretchSensePeripheral] :
+            Channels to draw.
+
+        :param sampleRate: int :
+            Number of frames per second expected from one device, the buffers grow if the devices are faster.
+
+        """
+
+        dictNumberOfChannels = {}
+
+        for myPeripheral in listPeripheral:
+
+            if myPeripheral.addr == '':
+                continue
+
+            dictNumberOfChannels[myPeripheral.addr] = dictNumberOfChannels.get(myPeripheral.addr, 0) + 1
+
+        if dictNumberOfChannels == self.dictNumberOfChannels:
+            return
+
+        for (addr, numberOfChannels) in dictNumberOfChannels.items():
+            if self.dictNumberOfChannels.get(addr) != numberOfChannels:
+                self.dictBuffer[addr] = stretchSenseLibrary.StretchSenseRingBuffer(numberOfChannels, int(self.historyTime * sampleRate))
+
+        self.listAddr = list(dictNumberOfChannels.keys())
+        self.dictNumberOfChannels = dictNumberOfChannels
+        self.dictBuffer = dict((addr, self.dictBuffer[addr]) for addr in self.listAddr)
+        self.resetColumns()
+        self.update()
+
+    def resetColumns(self):
+
+        """
+        Build the columns again from the frames kept, when the width of the widget or the channels change.
+
+        """
+
+        self.numberOfColumns = max(self.width(), 2)
+        self.columnTime = self.historyTime / self.numberOfColumns
+        self.dictColumns = {}
+
+        for addr in self.listAddr:
+            numberOfChannels = self.dictNumberOfChannels[addr]
+            columns = np.full(self.numberOfColumns, -1, dtype=np.int64)
+            minimum = np.zeros((self.numberOfColumns, numberOfChannels))
+            maximum = np.zeros((self.numberOfColumns, numberOfChannels))
+
+            (timestamps, values) = self.dictBuffer[addr].getSince(time.monotonic() - self.historyTime)
+
+            if len(timestamps) > 0:
+                index = (timestamps / self.columnTime).astype(np.int64)
+                first = np.flatnonzero(np.concatenate(([True], index[1:] != index[:-1])))
+                slots = index[first] % self.numberOfColumns
+                columns[slots] = index[first]
+                minimum[slots] = np.minimum.reduceat(values, first, axis=0)
+                maximum[slots] = np.maximum.reduceat(values, first, axis=0)
+
+            self.dictColumns[addr] = (columns, minimum, maximum)
+
+    def pushFrames(self, batch):
+
+        """
+        Store the frames received and add them to their column.
+
+        :param batch: [StretchSenseFrame] :
+            Frames received.
+
+        """
+
+        for frame in batch:
+            myBuffer = self.dictBuffer.get(frame.addr)
+
+            if myBuffer is None:
+                continue
+
+            timestamp = frame.timestamp / 1e9
+
+            # A full buffer which does not cover historyTime is too small for the rate of the device
+            if (myBuffer.count == myBuffer.length and myBuffer.length < self.historyTime * self.maximumSampleRate and
+                    timestamp - myBuffer.timestamps[myBuffer.index] < self.historyTime):
+                myBuffer.resize(min(2 * myBuffer.length, int(self.historyTime * self.maximumSampleRate)))
+
+            myBuffer.push(timestamp, frame.values)
+
+            (columns, minimum, maximum) = self.dictColumns[frame.addr]
+            index = int(timestamp / self.columnTime)
+            slot = index % self.numberOfColumns
+            numberOfValues = min(len(frame.values), minimum.shape[1])
+
+            if columns[slot] != index:
+                columns[slot] = index
+                minimum[slot, :numberOfValues] = frame.values[:numberOfValues]
+                maximum[slot, :numberOfValues] = frame.values[:numberOfValues]
+            else:
+                np.minimum(minimum[slot, :numberOfValues], frame.values[:numberOfValues], out=minimum[slot, :numberOfValues])
+                np.maximum(maximum[slot, :numberOfValues], frame.values[:numberOfValues], out=maximum[slot, :numberOfValues])
+
+            self.newFrames = True
+
+    def refresh(self):
+
+        """
+        Repaint the graph if new frames have been received while it is displayed.
+
+        """
+
+        if self.newFrames and self.isVisible():
+            self.newFrames = False
+            self.update()
+
+    def paintEvent(self, event):
+        painter = QtGui.QPainter(self)
+        painter.fillRect(self.rect(), QtCore.Qt.white)
+
+        if max(self.width(), 2) != self.numberOfColumns:
+            self.resetColumns()
+
+        height = self.height()
+        firstColumn = int(time.monotonic() / self.columnTime) - self.numberOfColumns + 1
+        listColumns = []
+
+        # Columns of the visible window only, in time order
+        for addr in self.listAddr:
+            (columns, minimum, maximum) = self.dictColumns[addr]
+            slots = np.flatnonzero(columns >= firstColumn)
+
+            if len(slots) == 0:
+                continue
+
+            slots = slots[np.argsort(columns[slots])]
+            listColumns.append((columns[slots] - firstColumn, minimum[slots], maximum[slots]))
+
+        if not listColumns:
+            painter.end()
+            return
+
+        low = min(minimum.min() for (x, minimum, maximum) in listColumns)
+        high = max(maximum.max() for (x, minimum, maximum) in listColumns)
+        if high - low < 1e-6:
+            high = low + 1.0
+        scale = (height - 1) / (high - low)
+
+        for (x, minimum, maximum) in listColumns:
+            xs = np.repeat(x, 2).astype(np.float64)
+            ys = np.empty(len(xs))
+
+            for channel in range(minimum.shape[1]):
+                ys[0::2] = (high - minimum[:, channel]) * scale
+                ys[1::2] = (high - maximum[:, channel]) * scale
+                painter.setPen(self.listColor[channel % len(self.listColor)])
+                painter.drawPolyline(arrayToPolygon(xs, ys))
+
+        painter.setPen(QtCore.Qt.black)
+        painter.drawText(4, 14, "%g pF" % high)
+        painter.drawText(4, height - 4, "%g pF" % low)
+        painter.end()
+
+
+class QBarGraphWidget(QtGui.QWidget):
+
+    """
+    Widget which draws one bar per channel with the last value received. All the bars are painted in a
+    single QPainter pass from an array of values, and each bar is scaled between the minimum and the maximum
+    seen on its channel, both decaying towards the current value so that the scale follows the sensor.
+
+    """
+
+    # Fraction of the distance to the current value covered by the minimum and maximum at each refresh
+    scaleDecay = 0.01
+
+    # Smallest range in pF displayed for a channel
+    minimumRange = 1.0
+
+    def __init__(self, parent=None):
+        super(QBarGraphWidget, self).__init__(parent)
+
+        self.dictIndex = {}
+        self.listChannels = []
+        self.values = np.zeros(0)
+        self.low = np.zeros(0)
+        self.high = np.zeros(0)
+        self.newFrames = False
+
+    def setChannels(self, listPeripheral):
+
+        """
+        Create a bar for each channel, the scale is kept if the channels did not change.
+
+        :param listPeripheral: [StretchSensePeripheral] :
+            Channels to draw.
+
+        """
+
+        listChannels = [(myPeripheral.addr, myPeripheral.channelNumber) for myPeripheral in listPeripheral if myPeripheral.addr != '']
+
+        if listChannels == self.listChannels:
+            return
+
+        self.listChannels = listChannels
+        self.dictIndex = {}
+        numberOfBars = 0
+
+        for myPeripheral in listPeripheral:
+
+            if myPeripheral.addr == '':
+                continue
+
+            if myPeripheral.addr not in self.dictIndex:
+                self.dictIndex[myPeripheral.addr] = numberOfBars
+            numberOfBars += 1
+
+        self.values = np.zeros(numberOfBars)
+        self.low = np.full(numberOfBars, np.inf)
+        self.high = np.full(numberOfBars, -np.inf)
+        self.update()
+
+    def pushFrames(self, batch):
+
+        """
+        Keep the last values received from each device.
+
+        :param batch: [StretchSenseFrame] :
+            Frames received.
+
+        """
+
+        for frame in batch:
+            index = self.dictIndex.get(frame.addr)
+
+            if index is not None:
+                self.values[index:index + len(frame.values)] = frame.values
+                self.newFrames = True
+
+    def refresh(self):
+
+        """
+        Update the scale and repaint the bars if new frames have been received while the graph is displayed.
+
+        """
+
+        if not self.newFrames or not self.isVisible():
+            return
+
+        self.newFrames = False
+        self.low = np.minimum(self.low, self.values)
+        self.high = np.maximum(self.high, self.values)
+        self.low += (self.values - self.low) * self.scaleDecay
+        self.high += (self.values - self.high) * self.scaleDecay
+        self.update()
+
+    def paintEvent(self, event):
+        painter = QtGui.QPainter(self)
+        painter.fillRect(self.rect(), QtCore.Qt.white)
+
+        numberOfBars = len(self.values)
+
+        if numberOfBars == 0:
+            painter.end()
+            return
+
+        width = self.width() / numberOfBars
+        height = self.height() - 20
+        center = (self.low + self.high) / 2
+        span = np.maximum(self.high - self.low, self.minimumRange)
+        ratio = np.clip((self.values - center) / span + 0.5, 0.0, 1.0)
+        ratio[~np.isfinite(ratio)] = 0.0
+
+        for (index, value) in enumerate(self.values):
+            barHeight = ratio[index] * height
+            painter.fillRect(QtCore.QRectF(index * width + 2, height - barHeight, width - 4, barHeight),
+                             QLineGraphWidget.listColor[index % len(QLineGraphWidget.listColor)])
+            painter.drawText(QtCore.QRectF(index * width, height, width, 20), QtCore.Qt.AlignCenter, "%.1f" % value)
+
+        painter.end()
 
 
 class StretchSenseApp(QtGui.QMainWindow, Ui_MainWindow):
@@ -227,20 +717,49 @@ class StretchSenseApp(QtGui.QMainWindow, Ui_MainWindow):
         self.indexBleShorted = 9
         self.spiRecordingButton = True
         self.bleRecordingButton = True
-        self.spiDataRecorded = ""
-        self.dataRecorded = ""
-        self.myCustomQWidget = QCustomQWidget()
-        self.listOfCustomWidget = []
+        self.spiRecorder = None
+        self.bleRecorder = None
+        self.listPeripheralConnected = []
+        self.listChannelsDisplayed = []
+        self.listPeripheralRecorded = []
+        self.dictLastValues = {}
         self.myListOfScanWidget = []
-        self.t0 = time.time()
+        self.t0 = time.monotonic_ns()
         self.counter = 0
-        self.myAddrToCheck = ""
+
+        # Recordings are streamed to recordDirectory, and split every recordMaxSize bytes or recordMaxTime seconds
+        self.recordDirectory = os.path.expanduser("~")
+        self.recordMaxSize = 100 * 1024 * 1024
+        self.recordMaxTime = 3600
+
+        # Value tables, refreshed at displayRate frames per second whatever the rate of the devices
+        self.displayRate = 30
+        self.spiValueTableModel = ValueTableModel()
+        self.bleValueTableModel = ValueTableModel()
+
+        for (myTable, myModel) in ((self.w_spiValueTable, self.spiValueTableModel), (self.w_bleValueTable, self.bleValueTableModel)):
+            myTable.setModel(myModel)
+            myTable.verticalHeader().hide()
+            myTable.horizontalHeader().setStretchLastSection(True)
+
+        self.lineGraph = QLineGraphWidget(self.w_lineGraphTab)
+        self.lineGraph.setGeometry(40, 120, 760, 525)
+        self.barGraph = QBarGraphWidget(self.w_barGraphTab)
+        self.barGraph.setGeometry(40, 120, 760, 525)
+
+        self.displayTimer = QtCore.QTimer(self)
+        self.displayTimer.setInterval(int(1000 / self.displayRate))
+        self.displayTimer.timeout.connect(self.displayRefresh)
+        self.displayTimer.start()
 
         self.SpiThread = SpiThread()
         self.BleThread = BleThread()
+        self.ReplayThread = ReplayThread()
 
-        self.connect(self.SpiThread, QtCore.SIGNAL("spiThreadDone()"), self.spiThreadDone, QtCore.Qt.DirectConnection)
-        self.connect(self.BleThread, QtCore.SIGNAL("bleThreadDone()"), self.bleThreadDone, QtCore.Qt.DirectConnection)
+        self.connect(self.SpiThread, QtCore.SIGNAL("spiThreadDone(PyQt_PyObject)"), self.spiThreadDone, QtCore.Qt.QueuedConnection)
+        self.connect(self.BleThread, QtCore.SIGNAL("bleThreadDone(PyQt_PyObject)"), self.bleThreadDone, QtCore.Qt.QueuedConnection)
+        self.connect(self.ReplayThread, QtCore.SIGNAL("bleThreadDone(PyQt_PyObject)"), self.bleThreadDone, QtCore.Qt.QueuedConnection)
+        self.connect(self, QtCore.SIGNAL("blePeripheralDiscovered(QString)"), self.blePeripheralDiscovered, QtCore.Qt.QueuedConnection)
 
         self.w_disconnectAll.clicked.connect(self.disconnectButton)
         self.w_disconnectAll2.clicked.connect(self.disconnectButton)
@@ -263,6 +782,8 @@ class StretchSenseApp(QtGui.QMainWindow, Ui_MainWindow):
         self.w_bleSelectButton.clicked.connect(self.bleTab)
         self.w_scanningButton2.clicked.connect(self.bleScanTab)
         self.w_rescanButton.clicked.connect(self.bleScan)
+        self.w_scanningButton.clicked.connect(self.bleScanTab)
+        self.w_valueTableButton.clicked.connect(self.bleValueTableTab)
         self.w_barGraphButton.clicked.connect(self.bleBarGraphTab)
         self.w_lineGraphButton.clicked.connect(self.bleLineGraphTab)
         self.w_valueTableButton2.clicked.connect(self.bleValueTableTab)
@@ -308,42 +829,72 @@ class StretchSenseApp(QtGui.QMainWindow, Ui_MainWindow):
         self.w_resolutionList.addItem("RESOLUTION 10fF")
         self.w_resolutionList.addItem("RESOLUTION 1fF")
 
-    def spiThreadDone(self):
+    def spiThreadDone(self, batch):
         #print("spiThreadDone()")
 
         """
         Action triggerd by the SPI thread that updates our values
 
+        :param batch: [StretchSenseFrame] :
+            Frames read by the SPI thread since the last update.
+
         """
 
-        for i in range(len(self.listOfCustomWidget)):
-            self.listOfCustomWidget[i].update(self.listPeripheralSpi[i].addr, self.listPeripheralSpi[i].channelNumber, self.listPeripheralSpi[i].value)
+        self.spiValueTableModel.pushFrames(batch)
 
-        self.t1 = time.time()
-        self.t1 -= self.t0
-        self.t1 = str(self.t1) + " ,"
-        self.spiDataRecorded += str(self.counter) + " ," + str(self.t1)
-        self.spiDataRecorded += stretchsenseObject.spi_getValuesCsv() + "\n"
-        self.counter += 1
+        if self.spiRecorder is None:
+            return
+
+        for frame in batch:
+            self.t1 = str((frame.timestamp - self.t0) / 1e9) + " ,"
+            self.spiRecorder.write(str(self.counter) + " ," + str(self.t1) + "".join("%s ," % value for value in frame.values) + "\n")
+            self.counter += 1
 
-    def bleThreadDone(self):
+    def bleThreadDone(self, batch):
         #print("bleThreadDone()")
 
         """
-        Action triggerd by the BLE thread that updates our values
+        Action triggerd by the BLE or the replay thread that updates our values
+
+        :param batch: [StretchSenseFrame] :
+            Frames received by the thread since the last update.
 
         """
 
-        for i in range(len(self.listOfCustomWidget)):
-            self.listOfCustomWidget[i].update(self.listPeripheralConnected[i].addr, self.listPeripheralConnected[i].channelNumber, self.listPeripheralConnected[i].value)
+        self.bleValueTableModel.pushFrames(batch)
+        self.lineGraph.pushFrames(batch)
+        self.barGraph.pushFrames(batch)
+
+        for frame in batch:
+            self.dictLastValues[frame.addr] = frame.values
+
+        if self.bleRecorder is None:
+            return
 
-        self.t1 = time.time()
-        self.t1 -= self.t0
-        self.t1 = str(self.t1) + " ,"
-        self.dataRecorded += str(self.counter) + " ," + str(self.t1)
-        self.dataRecorded += stretchsenseObject.ble_getValuesCsv() + "\n"
+        if len(batch) == 0:
+            return
+
+        # One row per batch with the last values of each channel, stamped with the reception of the last frame
+        listValues = [self.dictLastValues.get(myPeripheral.addr, ()) for myPeripheral in self.listPeripheralRecorded]
+        self.t1 = str((batch[-1].timestamp - self.t0) / 1e9) + " ,"
+        self.bleRecorder.write(str(self.counter) + " ," + str(self.t1) +
+                               "".join("%s ," % (values[int(myPeripheral.channelNumber)] if int(myPeripheral.channelNumber) < len(values) else myPeripheral.value)
+                                       for (myPeripheral, values) in zip(self.listPeripheralRecorded, listValues)) + "\n")
         self.counter += 1
 
+    def displayRefresh(self):
+        #print("displayRefresh()")
+
+        """
+        Action triggered at the display rate that repaints the values which changed
+
+        """
+
+        self.spiValueTableModel.refresh()
+        self.bleValueTableModel.refresh()
+        self.lineGraph.refresh()
+        self.barGraph.refresh()
+
     def closeEvent(self, event):
         #print("closeEvent()")
 
@@ -355,6 +906,14 @@ class StretchSenseApp(QtGui.QMainWindow, Ui_MainWindow):
             self.SpiThread.stop()
         if self.BleThread != 0:
             self.BleThread.stop()
+        self.ReplayThread.stop()
+        stretchsenseObject.ble_stopContinuousScanning()
+
+        # Recordings are already on disk, they are only closed
+        if self.spiRecorder is not None:
+            self.spiRecorder.close()
+        if self.bleRecorder is not None:
+            self.bleRecorder.close()
 
         super(QtGui.QMainWindow, self).closeEvent(event)
 
@@ -367,37 +926,44 @@ class StretchSenseApp(QtGui.QMainWindow, Ui_MainWindow):
 
         """
 
+        odrMode = None
+        interruptMode = None
+        triggerMode = None
+        filterMode = None
+        resolutionMode = None
+
         if (self.w_odrList.currentItem() is None):
             pass
         elif (self.w_odrList.currentItem().text()[:3] == "RAT"):
-            stretchSenseLibrary.ODR_MODE = self.w_odrList.currentRow()
-            #print(stretchSenseLibrary.ODR_MODE)
+            odrMode = self.w_odrList.currentRow()
+            #print(odrMode)
 
         if (self.w_interruptList.currentItem() is None):
             pass
         elif (self.w_interruptList.currentItem().text()[:3] == "INT"):
-            stretchSenseLibrary.INTERRUPT_MODE = self.w_interruptList.currentRow()
-            #print(stretchSenseLibrary.INTERRUPT_MODE)
+            interruptMode = self.w_interruptList.currentRow()
+            #print(interruptMode)
 
         if (self.w_triggerList.currentItem() is None):
             pass
         elif (self.w_triggerList.currentItem().text()[:3] == "TRI"):
-            stretchSenseLibrary.TRIGGER_MODE = self.w_triggerList.currentRow()
-            #print(stretchSenseLibrary.TRIGGER_MODE)
+            triggerMode = self.w_triggerList.currentRow()
+            #print(triggerMode)
 
         if (self.w_filterList.currentItem() is None):
             pass
         elif (self.w_filterList.currentItem().text()[:3] == "FIL"):
-            stretchSenseLibrary.FILTER_MODE = 2 ** (self.w_filterList.currentRow()) - 1
-            #print(stretchSenseLibrary.FILTER_MODE)
+            filterMode = 2 ** (self.w_filterList.currentRow()) - 1
+            #print(filterMode)
 
         if (self.w_resolutionList.currentItem() is None):
             pass
         elif (self.w_resolutionList.currentItem().text()[:3] == "RES"):
-            stretchSenseLibrary.RESOLUTION_MODE = self.w_resolutionList.currentRow()
-            #print(stretchSenseLibrary.RESOLUTION_MODE)
+            resolutionMode = self.w_resolutionList.currentRow()
+            #print(resolutionMode)
 
-        stretchsenseObject.spi_setup()
+        # A single configuration transfer, serialized with the reads of the SPI thread
+        stretchsenseObject.spi_reconfigure(odrMode, interruptMode, triggerMode, filterMode, resolutionMode)
 
     def spiGetSettings(self):
         #print("spiGetSettings()")
@@ -407,28 +973,30 @@ class StretchSenseApp(QtGui.QMainWindow, Ui_MainWindow):
         Get settings which are selected by the user in the lists.
 
         """
+        configuration = stretchsenseObject.spiConfiguration
+
         for row in range(self.w_odrList.count()):
-            if stretchSenseLibrary.ODR_MODE == row:
+            if configuration.odrMode == row:
                 myItem = self.w_odrList.item(row)
                 myItem.setSelected(1)
 
         for row in range(self.w_interruptList.count()):
-            if stretchSenseLibrary.INTERRUPT_MODE == row:
+            if configuration.interruptMode == row:
                 myItem = self.w_interruptList.item(row)
                 myItem.setSelected(1)
 
         for row in range(self.w_triggerList.count()):
-            if stretchSenseLibrary.TRIGGER_MODE == row:
+            if configuration.triggerMode == row:
                 myItem = self.w_triggerList.item(row)
                 myItem.setSelected(1)
 
         for row in range(self.w_filterList.count()):
-            if hex(stretchSenseLibrary.FILTER_MODE) == hex(2 ** row - 1):
+            if hex(configuration.filterMode) == hex(2 ** row - 1):
                 myItem = self.w_filterList.item(row)
                 myItem.setSelected(1)
 
         for row in range(self.w_resolutionList.count()):
-            if stretchSenseLibrary.RESOLUTION_MODE == row:
+            if configuration.resolutionMode == row:
                 myItem = self.w_resolutionList.item(row)
                 myItem.setSelected(1)
 
@@ -443,7 +1011,6 @@ class StretchSenseApp(QtGui.QMainWindow, Ui_MainWindow):
 
         self.spiGetSettings()
         self.spiSettings()
-        stretchsenseObject.spi_setup()
 
     def spiValueTable(self):
         #print("spiValueTable()")
@@ -453,36 +1020,15 @@ class StretchSenseApp(QtGui.QMainWindow, Ui_MainWindow):
 
         """
 
+        self.SpiThread.stop()
         self.spiSetSettings()
-        stretchsenseObject.spi_mode()
         self.listPeripheralSpi = stretchsenseObject.spi_getListPeripheral()
         numberOfSpiPeripheral = len(self.listPeripheralSpi)
-        self.listOfCustomWidget.clear()
+        self.spiValueTableModel.setChannels(self.listPeripheralSpi)
 
         if numberOfSpiPeripheral > 0:
 
             self.SpiThread.start()
-            self.w_listSpiDataPrinted.clear()
-
-            for myPeripheral in self.listPeripheralSpi:
-
-                self.myCustomQWidget = QCustomQWidget()
-
-                addr = myPeripheral.addr
-                index = int(myPeripheral.channelNumber)
-                value = myPeripheral.value
-                self.listOfCustomWidget.append(self.myCustomQWidget)
-                self.myCustomQWidget.setWidget(addr, index, value)
-
-                # Create QlistWidgetItem
-                self.myQListWidgetItem = QtGui.QListWidgetItem(self.w_listSpiDataPrinted)
-
-                # Set Size hint
-                self.myQListWidgetItem.setSizeHint(self.myCustomQWidget.sizeHint())
-
-                # Add QListWidgetItem into QListWidget
-                self.w_listSpiDataPrinted.addItem(self.myQListWidgetItem)
-                self.w_listSpiDataPrinted.setItemWidget(self.myQListWidgetItem, self.myCustomQWidget)
 
     def spiRecordButton(self):
         #print("spiRecordButton()")
@@ -495,83 +1041,102 @@ class StretchSenseApp(QtGui.QMainWindow, Ui_MainWindow):
         if self.spiRecordingButton is True:
             self.spiRecordData()
         elif self.spiRecordingButton is False:
-            self.spiStopRecordData(self.spiDataRecorded)
+            self.spiStopRecordData()
 
     def spiRecordData(self):
         #print("spiRecordData()")
 
         """
-        If the SPI record button pushed, we start recording the data.
+        If the SPI record button pushed, we start streaming the data to a new recording.
 
         """
 
         self.w_spiRecordButton.setText("Stop and save")
-        self.spiDataRecorded = ""
-        self.spiDataRecorded = "#, Sample Time         , SSL1, SSL2, SSL3, SSL4, SSL5, SSL6, SSL7, SSL8, SSL9, SSL10" + "\n"
+        self.spiRecorder = self.newRecorder(stretchsenseObject.spi_getListPeripheral())
         self.counter = 0
-        self.t0 = time.time()
         self.spiRecordingButton = False
 
-    def spiStopRecordData(self, data):
+    def spiStopRecordData(self):
         #print("spiStopRecordData()")
 
         """
 
-        Stop recording data and open the window to save the generated file.
-
-        :param data: string :
-            SPI Recorded data.
+        Stop recording data and open the window to move the recorded files.
 
         """
 
         if self.spiRecordingButton is False:
             self.w_spiRecordButton.setText("Start recording")
-            filename = QtGui.QFileDialog.getSaveFileName(self, "Save file", "/home/pi", ".csv")
-            if filename != 0:
-                self.recordData(data, filename)
-                self.spiRecordingButton = True
-            else:
-                self.w_generalTab.setCurrentIndex(self.mainTab)
+            recorder = self.spiRecorder
+            self.spiRecorder = None
+            self.spiRecordingButton = True
+            self.saveRecorder(recorder)
 
     def bleScan(self):
         #print("bleScan()")
 
         """
 
-        Start BLE scan by pushing the button.
+        Start BLE scan by pushing the button, devices are added to the list as soon as they are discovered.
 
         """
         self.w_listPeripheralPrinted.clear()
-        self.w_rescanButton.setText("Rescan 3 seconds")
-        self.scanTime = 3
-        stretchsenseObject.ble_scanning(self.scanTime)
+        self.w_rescanButton.setText("Rescan")
+        stretchsenseObject.ble_stopContinuousScanning()
         self.myListOfScanWidget.clear()
 
         listPeripheralAvailable = stretchsenseObject.ble_getListPeripheralAvailable()
-        numberOfPeripheralAvailable = len(listPeripheralAvailable) - 1
 
-        if numberOfPeripheralAvailable > 0:
+        for myPeripheralAvailable in list(listPeripheralAvailable):
 
-            for myPeripheralAvailable in listPeripheralAvailable:
+            if myPeripheralAvailable.addr != "":
+                self.blePeripheralDiscovered(myPeripheralAvailable.addr)
 
-                if myPeripheralAvailable.addr != "":
-                    self.myCustomQWidget = QCustomScanWidget()
+        stretchsenseObject.ble_startContinuousScanning(self.bleScanCallback)
 
-                    addr = myPeripheralAvailable.addr
-                    #gen = myPeripheralAvailable.gen
-                    self.myListOfScanWidget.append(self.myCustomQWidget)
-                    self.myCustomQWidget.setWidget(addr)  #, gen)
-                    #self.w_listPeripheralPrinted.addItem(myPeripheralAvailable.addr)
+    def bleScanCallback(self, device, isNewDevice):
+        #print("bleScanCallback()")
 
-                    # Create QlistWidgetItem
-                    self.myQListWidgetItem = QtGui.QListWidgetItem(self.w_listPeripheralPrinted)
+        """
 
-                    # Set Size hint
-                    self.myQListWidgetItem.setSizeHint(self.myCustomQWidget.sizeHint())
+        Called from the scanning thread, forwards the new devices to the GUI thread.
+
+        :param device: ScanEntry :
+            Device discovered by the scan.
+
+        :param isNewDevice: bool :
+            True the first time the device is discovered.
+
+        """
 
-                    # Add QListWidgetItem into QListWidget
-                    self.w_listPeripheralPrinted.addItem(self.myQListWidgetItem)
-                    self.w_listPeripheralPrinted.setItemWidget(self.myQListWidgetItem, self.myCustomQWidget)
+        if isNewDevice is True:
+            self.emit(QtCore.SIGNAL("blePeripheralDiscovered(QString)"), device.addr)
+
+    def blePeripheralDiscovered(self, addr):
+        #print("blePeripheralDiscovered()")
+
+        """
+
+        Add a device discovered by the scan to the list of devices available.
+
+        :param addr: string :
+            Address of the device.
+
+        """
+
+        self.myCustomQWidget = QCustomScanWidget()
+        self.myListOfScanWidget.append(self.myCustomQWidget)
+        self.myCustomQWidget.setWidget(addr)
+
+        # Create QlistWidgetItem
+        self.myQListWidgetItem = QtGui.QListWidgetItem(self.w_listPeripheralPrinted)
+
+        # Set Size hint
+        self.myQListWidgetItem.setSizeHint(self.myCustomQWidget.sizeHint())
+
+        # Add QListWidgetItem into QListWidget
+        self.w_listPeripheralPrinted.addItem(self.myQListWidgetItem)
+        self.w_listPeripheralPrinted.setItemWidget(self.myQListWidgetItem, self.myCustomQWidget)
 
     def bleConnectInList(self):
         #print("bleConnectInList()")
@@ -609,47 +1174,53 @@ class StretchSenseApp(QtGui.QMainWindow, Ui_MainWindow):
         print("bleValueTable()")
 
         """
-        Gets and displays BLE values in the GUI.
+        Gets and displays BLE values in the GUI, in the value table and in the graphs. The channels of the
+        recording are displayed instead while a recording is replayed.
 
         """
 
-        stretchsenseObject.ble_waitNotifications()
-        self.listPeripheralConnected = stretchsenseObject.ble_getListPeripheralIsConnected()
+        if stretchsenseObject.replay_isOpen():
+            listPeripheral = stretchsenseObject.replay_getListPeripheral()
+            myThread = self.ReplayThread
+        else:
+            listPeripheral = stretchsenseObject.ble_getListPeripheralIsConnected()
+            myThread = self.BleThread
+
+        # Switching between the value table and the graphs keeps the values and the history displayed
+        listChannels = [(myPeripheral.addr, myPeripheral.channelNumber) for myPeripheral in listPeripheral]
+        if myThread.isRunning() and listChannels == self.listChannelsDisplayed:
+            return
+
+        self.listPeripheralConnected = listPeripheral
+        self.listChannelsDisplayed = listChannels
         numberOfPeripheralConnected = len(self.listPeripheralConnected)
-        self.listOfCustomWidget.clear()
+        self.bleValueTableModel.setChannels(self.listPeripheralConnected)
+        self.lineGraph.setChannels(self.listPeripheralConnected)
+        self.barGraph.setChannels(self.listPeripheralConnected)
 
         if numberOfPeripheralConnected > 0:
 
-            self.BleThread.start()
-            self.w_listDataPrinted.clear()
-            for myPeripheral in self.listPeripheralConnected:
+            myThread.start()
 
-                self.myCustomQWidget = QCustomQWidget()
-                addr = myPeripheral.addr
-                index = int(myPeripheral.channelNumber)
-                value = myPeripheral.value
-                self.listOfCustomWidget.append(self.myCustomQWidget)
-                self.myCustomQWidget.setWidget(addr, index, value)
+    def replayFile(self, filename, speed=1.0):
+        #print("replayFile()")
 
-                if ((addr != self.myAddrToCheck) and (self.myAddrToCheck != "")):
-                    mySize = QtCore.QSize()
-                    mySize.setHeight(3)
-                    barItem = QtGui.QListWidgetItem(self.w_listDataPrinted)
-                    barItem.setBackgroundColor(QtGui.QColor(0, 174, 239))
-                    barItem.setSizeHint(mySize)
-                    self.w_listDataPrinted.addItem(barItem)
+        """
+        Replay a recording in the BLE value table and graphs, as if its devices were connected.
 
-                self.myAddrToCheck = addr
+        :param filename: string :
+            Recording or capture to replay.
 
-                # Create QlistWidgetItem
-                self.myQListWidgetItem = QtGui.QListWidgetItem(self.w_listDataPrinted)
+        :param speed: float :
+            1.0 to replay with the original timing, N to replay N times faster.
 
-                # Set Size hint
-                self.myQListWidgetItem.setSizeHint(self.myCustomQWidget.sizeHint())
+        """
 
-                # Add QListWidgetItem into QListWidget
-                self.w_listDataPrinted.addItem(self.myQListWidgetItem)
-                self.w_listDataPrinted.setItemWidget(self.myQListWidgetItem, self.myCustomQWidget)
+        self.BleThread.stop()
+        self.ReplayThread.stop()
+        stretchsenseObject.replay_open(filename, speed)
+        self.w_generalTab.setCurrentIndex(self.indexValueTable)
+        self.bleValueTable()
 
     def bleRecordButton(self):
         #print("bleRecordButton()")
@@ -662,42 +1233,36 @@ class StretchSenseApp(QtGui.QMainWindow, Ui_MainWindow):
         if self.bleRecordingButton is True:
             self.bleRecordData()
         elif self.bleRecordingButton is False:
-            self.bleStopRecordData(self.dataRecorded)
+            self.bleStopRecordData()
 
     def bleRecordData(self):
         #print("bleRecordData()")
 
         """
-        If the BLE record button pushed, we start recording the data.
+        If the BLE record button pushed, we start streaming the data to a new recording.
 
         """
 
         self.w_bleRecordButton.setText("Stop and save")
-        self.dataRecorded = ""
-        self.dataRecorded = "#, Sample Time         , Samples" + "\n"
+        self.listPeripheralRecorded = [myPeripheral for myPeripheral in self.listPeripheralConnected if myPeripheral.addr != '']
+        self.bleRecorder = self.newRecorder(self.listPeripheralRecorded)
         self.counter = 0
-        self.t0 = time.time()
         self.bleRecordingButton = False
 
-    def bleStopRecordData(self, data):
+    def bleStopRecordData(self):
         #print("bleStopRecordData()")
 
         """
-        Stop recording data and open the window to save the generated file.
-
-        :param data: string :
-            BLE Recorded data.
+        Stop recording data and open the window to move the recorded files.
 
         """
 
         if self.bleRecordingButton is False:
             self.w_bleRecordButton.setText("Start recording")
-            filename = QtGui.QFileDialog.getSaveFileName(self, "Save file", "/home/pi", ".csv")
-            if filename != 0:
-                self.recordData(data, filename)
-                self.bleRecordingButton = True
-            else:
-                self.w_generalTab.setCurrentIndex(self.indexBle)
+            recorder = self.bleRecorder
+            self.bleRecorder = None
+            self.bleRecordingButton = True
+            self.saveRecorder(recorder)
 
     def mainTab(self):
         #print("mainTab()")
@@ -707,10 +1272,8 @@ class StretchSenseApp(QtGui.QMainWindow, Ui_MainWindow):
 
         """
 
-        if self.spiDataRecorded == "":
-            pass
-        else:
-            self.spiStopRecordData(self.spiDataRecorded)
+        if self.spiRecorder is not None:
+            self.spiStopRecordData()
             stretchsenseObject.spi_close()
 
         if self.SpiThread != 0:
@@ -719,6 +1282,9 @@ class StretchSenseApp(QtGui.QMainWindow, Ui_MainWindow):
             self.BleThread.stop()
         else:
             pass
+        self.ReplayThread.stop()
+        stretchsenseObject.replay_close()
+        stretchsenseObject.ble_stopContinuousScanning()
 
         self.w_listPeripheralPrinted.clear()
         self.w_generalTab.setCurrentIndex(self.indexMain)
@@ -752,10 +1318,8 @@ class StretchSenseApp(QtGui.QMainWindow, Ui_MainWindow):
 
         """
 
-        if self.dataRecorded == "":
-            pass
-        else:
-            self.bleStopRecordData(self.dataRecorded)
+        if self.bleRecorder is not None:
+            self.bleStopRecordData()
 
         if self.SpiThread != 0:
             self.SpiThread.stop()
@@ -763,6 +1327,9 @@ class StretchSenseApp(QtGui.QMainWindow, Ui_MainWindow):
             self.BleThread.stop()
         else:
             pass
+        self.ReplayThread.stop()
+        stretchsenseObject.replay_close()
+        stretchsenseObject.ble_stopContinuousScanning()
         self.w_generalTab.setCurrentIndex(self.indexBleShorted)
 
     def bleValueTableTab(self):
@@ -786,7 +1353,7 @@ class StretchSenseApp(QtGui.QMainWindow, Ui_MainWindow):
 
         self.disconnectButton()
         self.w_generalTab.setCurrentIndex(self.indexScan)
-        self.w_rescanButton.setText("Scan 3 seconds")
+        self.w_rescanButton.setText("Scan")
 
     def bleBarGraphTab(self):
         #print("bleBarGraphTab()")
@@ -797,6 +1364,7 @@ class StretchSenseApp(QtGui.QMainWindow, Ui_MainWindow):
         """
 
         self.w_generalTab.setCurrentIndex(self.indexBarGraph)
+        self.bleValueTable()
 
     def bleLineGraphTab(self):
         #print("bleLineGraphTab()")
@@ -807,6 +1375,7 @@ class StretchSenseApp(QtGui.QMainWindow, Ui_MainWindow):
         """
 
         self.w_generalTab.setCurrentIndex(self.indexLineGraph)
+        self.bleValueTable()
 
     def infomationTab(self):
         #print("informationTab()")
@@ -831,29 +1400,51 @@ class StretchSenseApp(QtGui.QMainWindow, Ui_MainWindow):
         if self.BleThread != 0:
             self.BleThread.stop()
 
+        stretchsenseObject.ble_stopContinuousScanning()
         stretchsenseObject.ble_disconnectAllPeripherals()
-        self.listOfCustomWidget.clear()
+        self.bleValueTableModel.setChannels([])
+        self.lineGraph.setChannels([])
+        self.barGraph.setChannels([])
         self.w_listPeripheralPrinted.clear()
-        self.w_listDataPrinted.clear()
 
-    def recordData(self, recorded, filename):
-        #print("\033[0;35;40m recordData()\033[0m")
+    def newRecorder(self, listPeripheral):
+        #print("\033[0;35;40m newRecorder()\033[0m")
 
         """
-        Open a new file and write the data in.
+        Open a new recording in the record directory, named after the time it starts. The header and the
+        .json sidecar name one column per channel after its device address and channel number, the sidecar
+        also gives the date of the origin of the Sample Time column.
 
-        :param recorded: string
-            .csv file we want to record.
+        :param listPeripheral: [StretchSensePeripheral]
+            Channels recorded, in the order of the columns.
 
-        :param filename: path
-            Path to where we save the .csv file.
+        :returns: StretchSenseRecorder : Recording opened.
 
         """
 
-        if filename != '':
-            myFile = open(filename, "w+")
-            myFile.write(recorded)
-            myFile.close()
+        listColumns = stretchsenseObject.getChannelColumns(listPeripheral)
+        header = stretchsenseObject.getRecordingHeader(listColumns)
+        filename = os.path.join(self.recordDirectory, time.strftime("StretchSense_%Y%m%d_%H%M%S.csv"))
+        self.t0 = time.monotonic_ns()
+        return stretchSenseLibrary.StretchSenseRecorder(filename, header, self.recordMaxSize, self.recordMaxTime, listColumns,
+                                                        stretchsenseObject.timestampToWallClock(self.t0))
+
+    def saveRecorder(self, recorder):
+        #print("\033[0;35;40m saveRecorder()\033[0m")
+
+        """
+        Close a recording and move its files where the user wants them, they stay in the record directory
+        if the window is cancelled.
+
+        :param recorder: StretchSenseRecorder
+            Recording to save.
+
+        """
+
+        listSegment = recorder.close()
+        filename = QtGui.QFileDialog.getSaveFileName(self, "Save file", listSegment[0], ".csv")
+        if filename:
+            recorder.move(str(filename))
 
 
 def main():
@@ -864,6 +1455,13 @@ def main():
     window.setWindowTitle("StretchSense")
     window.setWindowIcon(QtGui.QIcon("_Icons/StretchSense_Logo_Blue_resized_64x64.png"))
     window.show()
+
+    # "python3 StretchSenseMain.py --replay <recording> [speed]" replays a recording instead of the devices
+    if "--replay" in sys.argv[:-1]:
+        index = sys.argv.index("--replay")
+        speed = float(sys.argv[index + 2]) if len(sys.argv) > index + 2 else 1.0
+        window.replayFile(sys.argv[index + 1], speed)
+
     sys.exit(app.exec_())
     StretchSenseApp.SpiThread.stop()
     StretchSenseApp.BleThread.stop()
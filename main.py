@@ -33,7 +33,7 @@ def mainBle():
     Those following lines are used to connect every StretchSense devices around and then stream
     their values into a terminal in a .csv format.
 
-    Make sure that timeBreak is superior to 0, and the program will run for the processor time you gave him.
+    Make sure that timeBreak is superior to 0, and the program will run for the time in seconds you gave him.
 
     Make sure that the correct BLE_MODE is selected at the end of the file.
 
@@ -49,8 +49,8 @@ def mainBle():
     def updateValue():
         print("updateValues()")
 
-        timePassed = stretchSenseLibrary.time.clock()
-        timeBreak = 5                                        # Choose the processor time to finish the program
+        timePassed = stretchSenseLibrary.time.monotonic() - timeStart
+        timeBreak = 5                                        # Choose the time in seconds to finish the program
 
         if timePassed < timeBreak:
             stretchsenseObject.ble_waitNotifications()
@@ -64,12 +64,13 @@ def mainBle():
     stretchsenseObject.ble_scanning(timeToScan)
     stretchsenseObject.ble_printAllPeripheralsAvailable()
     stretchsenseObject.ble_connectAllPeripheral()
-    stretchsenseObject.waitNotifications()
+    stretchsenseObject.ble_waitNotifications()
     stretchsenseObject.ble_listToCsv()
     numberOfPeripheralConnected = len(stretchsenseObject.ble_getListPeripheralIsConnected())
 
     if numberOfPeripheralConnected > 0:
 
+        timeStart = stretchSenseLibrary.time.monotonic()
         t = stretchSenseLibrary.RepeatedTimer(0.01, lambda: updateValue())
     else:
         pass
@@ -84,7 +85,7 @@ def mainSpi():
     Those following lines are used to stream the values of a 16FGV1.0 device from StretchSense,
     connected to the SPI0 port of a Raspberry Pi .
 
-    Make sure that timeBreak is superior than 0, and the program will run for the processor time you gave him.
+    Make sure that timeBreak is superior than 0, and the program will run for the time in seconds you gave him.
 
     Make sure that the correct SPI_MODE is selected at the end of the file.
 
@@ -99,8 +100,8 @@ def mainSpi():
     def updateValueSpi():
         #print("updateValueSpi()")
 
-        timePassed = stretchSenseLibrary.time.clock()
-        timeBreak = 5                                        # Choose the processor time to finish the program
+        timePassed = stretchSenseLibrary.time.monotonic() - timeStart
+        timeBreak = 5                                        # Choose the time in seconds to finish the program
 
         if timePassed < timeBreak:
             stretchsenseObject.spi_continuousModeCapacitance()
@@ -116,6 +117,7 @@ def mainSpi():
 
     if numberOfSpiPeripheralConnected > 0:
 
+        timeStart = stretchSenseLibrary.time.monotonic()
         t = stretchSenseLibrary.RepeatedTimer(0.01, lambda: updateValueSpi())
 
     else:
@@ -18,6 +18,7 @@ cd ..
 sudo rm -r py-spidev
 sudo apt-get install python-pyqt4
 sudo apt-get install python3-pyqt4
+sudo apt-get install python3-numpy
 sudo apt-get install qt4-designer
 cd /home/pi/Desktop/StretchSense/
 sudo chmod 0777 StretchSenseMain.py
@@ -17,16 +17,31 @@
 """
 
 from __future__ import print_function
-import argparse
+import asyncio
 import binascii
+import collections
+import functools
+import json
+import numbers
 import time
 import os
+import re
+import shutil
+import struct
 import sys
+import threading
+import numpy as np
 import RPi.GPIO as GPIO
 import spidev
-from threading import Timer, Lock
+from concurrent.futures import ThreadPoolExecutor
+from threading import Timer, Lock, Thread
 from bluepy import btle
 
+try:
+    import tomllib
+except ImportError:
+    tomllib = None
+
 
 class RepeatedTimer(object):
     #print("RepeatedTimer()")
@@ -176,6 +191,40 @@ TRIGGER_MODE = TRIGGER_DISABLED
 FILTER_MODE = FILTER_1PT
 RESOLUTION_MODE = RESOLUTION_100fF
 
+# Scan duplicate policy
+
+SCAN_NEW = 0x00
+SCAN_NEW_AND_UPDATED = 0x01
+SCAN_ALL = 0x02
+
+# BLE read engine modes
+
+READ_NOTIFICATIONS = 0x00
+READ_POLLING = 0x01
+
+# Frame sources used by the asynchronous API
+
+SOURCE_SPI = 0x00
+SOURCE_BLE = 0x01
+SOURCE_REPLAY = 0x02
+
+# Resampling used by StretchSenseAligner
+
+ALIGN_LINEAR = 0x00
+ALIGN_HOLD = 0x01
+
+# Edges reported by StretchSenseEventEngine
+
+EDGE_RISING = 0x00
+EDGE_FALLING = 0x01
+
+# Records of the raw transport log written by StretchSenseTransportLog
+
+RAW_DEVICE = 0x00
+RAW_SPI_CONFIG = 0x01
+RAW_SPI_DATA = 0x02
+RAW_BLE_DATA = 0x03
+
 
 """
 StretchSense Classes & generators for the different type of sensors.
@@ -231,1250 +280,5592 @@ class StretchSensePeripheral:
         self.color = ''
 
 
-class StretchSenseAPI():
-    #print("\033[0;35;40m StretchSenseAPI()\033[0m")
-
-    # This is the list of peripherals we are using for the SPI
+class StretchSenseScanConfiguration:
+    #print("\033[0;35;40m StretchSenseScanConfiguration()\033[0m")
 
-    listPeripheralSpi = [StretchSensePeripheral()]
+    """
+    Class which holds the settings used to scan for StretchSense devices.
 
-    # This is the list of peripherals we are using to connect to the BLE
+    :param hci: int:
+        Number of the Bluetooth interface used to scan, 0 for hci0.
 
-    listPeripheralInUse = [btle.Peripheral()]
+    :param sensitivity: int:
+        Advertisements received with a RSSI lower than this value in dBm are ignored.
 
-    # This is the list of StretchSense Bluetooth peripherals detected by the Raspberry Pi during a scan event
+    :param duplicates: int:
+        SCAN_NEW to report only new devices, SCAN_NEW_AND_UPDATED to also report devices whose
+        advertisement data changed, SCAN_ALL to report every advertisement.
 
-    listPeripheralAvailable = [StretchSensePeripheral()]
+    :param deviceName: string:
+        Local name the devices must advertise, None to accept any name.
 
-    # This is the list of StretchSense Bluetooth peripherals which are connected to the Raspberry Pi after being scanned
+    :param serviceUUIDs: [string]:
+        Service UUIDs the devices may advertise, at least one of them must be advertised. An empty
+        list accepts every device.
 
-    listPeripheralIsConnected = [StretchSensePeripheral()]
+    """
 
-    # This is the list of StretchSense Bluetooth peripherals which are saved to the Raspberry Pi after being connected once
+    def __init__(self, hci=0, sensitivity=-128, duplicates=SCAN_NEW_AND_UPDATED, deviceName='StretchSense', serviceUUIDs=()):
+        #print("\033[0;35;40m __init__().StretchSenseScanConfiguration()\033[0m")
 
-    listPeripheralIsOnceConnected = [StretchSensePeripheral()]
+        self.hci = int(hci)
+        self.sensitivity = int(sensitivity)
+        self.duplicates = int(duplicates)
+        self.deviceName = deviceName
+        self.serviceUUIDs = [str(uuid).lower() for uuid in serviceUUIDs]
 
-    """
 
-    Variables : Services & Characteristics UUID
+class StretchSenseSpiConfiguration:
+    #print("\033[0;35;40m StretchSenseSpiConfiguration()\033[0m")
 
     """
+    Class which holds the wiring and the settings of one 16FGV1.0 on the SPI bus. Settings left to None take
+    the value of the module constants, ODR_MODE, CE_PIN0... Pins are numbered as GPIOLAYOUT. ValueError
+    is raised for a mode which is not one of its constants and for negative buses or pins.
 
-    # The name we use to filter BLE scan results and find only StretchSense's sensors
-    deviceName = 'StretchSense'
+    :param addr: string:
+        Address given to the frames and channels of the circuit.
 
-    # The UUID used to filter Bluetooth scan results and find the services from StretchSense sensors Gen 3
-    serviceUUID3 = '00001701-7374-7265-7563-6873656e7365'
-    # The UUID used to filter the device characteristics and find the "data characteristic" from StretchSense sensors Gen 3
-    dataUUID3 = '00001702-7374-7265-7563-6873656e7365'
+    :param bus: int:
+        SPI bus of the Raspberry Pi.
 
-    # The UUID used to filter Bluetooth scan results and find the services from StretchSense sensors Gen 2
-    serviceUUID2 = '00001501-7374-7265-7563-6873656e7365'
-    # The UUID used to filter the device characteristics and find the "data characteristic" from StretchSense sensors Gen 2
-    dataUUID2 = '00001502-7374-7265-7563-6873656e7365'
+    :param device: int:
+        Chip select of the bus, SPI0 or SPI1.
 
-    # The UUID used to filter Bluetooth scan results and find the services from StretchSense circuit 10TT
-    serviceUUID10TT = '00601001-7374-7265-7563-6873656e7365'
-    # The UUID used to filter the device characteristics and find the "data characteristic" from StretchSense circuit 10TT
-    dataUUID10TT = '00601002-7374-7265-7563-6873656e7365'
+    :param maxSpeedHz: int:
+        Clock of the SPI bus in Hz.
 
-    """
+    :param cePin: int:
+        GPIO driving the chip select.
 
-    Variables : Set sensors & info
+    :param interruptPin: int:
+        GPIO receiving the data ready interrupt.
 
-    """
-    # Number of data samples within the filtering array
+    :param triggerPin: int:
+        GPIO driving the trigger input.
 
-    numberOfSample = 30
+    :param odrMode: int:
+        Output data rate, one of the RATE_* constants.
 
-    # Initialisation value of the sampling time value (SamplingTime = (value +1)*40ms)
+    :param interruptMode: int:
+        INTERRUPT_ENABLED or INTERRUPT_DISABLED.
 
-    samplingTimeNumber = 0
+    :param triggerMode: int:
+        TRIGGER_ENABLED or TRIGGER_DISABLED.
 
-    # Sized of the filter based on the number of samples
+    :param filterMode: int:
+        Filter, one of the FILTER_* constants.
 
-    filteringNumber = 0
+    :param resolutionMode: int:
+        Resolution, one of the RESOLUTION_* constants.
 
     """
 
-    Bluepy buffer Scanning class.
+    listSettings = ["addr", "bus", "device", "maxSpeedHz", "cePin", "interruptPin", "triggerPin",
+                    "odrMode", "interruptMode", "triggerMode", "filterMode", "resolutionMode"]
+
+    # Constants accepted by each setting, by name, pins and buses also accept other numbers
+
+    dictSettingConstants = {
+        "device": {"SPI0": SPI0, "SPI1": SPI1},
+        "cePin": {"CE_PIN0": CE_PIN0, "CE_PIN1": CE_PIN1},
+        "interruptPin": {"INTERRUPT_PIN": INTERRUPT_PIN},
+        "triggerPin": {"TRIGGER_PIN": TRIGGER_PIN},
+        "odrMode": {"RATE_OFF": RATE_OFF, "RATE_25HZ": RATE_25HZ, "RATE_50HZ": RATE_50HZ, "RATE_100HZ": RATE_100HZ,
+                    "RATE_166HZ": RATE_166HZ, "RATE_200HZ": RATE_200HZ, "RATE_250HZ": RATE_250HZ,
+                    "RATE_500HZ": RATE_500HZ, "RATE_1KHZ": RATE_1KHZ},
+        "interruptMode": {"INTERRUPT_DISABLED": INTERRUPT_DISABLED, "INTERRUPT_ENABLED": INTERRUPT_ENABLED},
+        "triggerMode": {"TRIGGER_DISABLED": TRIGGER_DISABLED, "TRIGGER_ENABLED": TRIGGER_ENABLED},
+        "filterMode": {"FILTER_0PT": FILTER_0PT, "FILTER_1PT": FILTER_1PT, "FILTER_3PT": FILTER_3PT,
+                       "FILTER_7PT": FILTER_7PT, "FILTER_15PT": FILTER_15PT, "FILTER_31PT": FILTER_31PT,
+                       "FILTER_63PT": FILTER_63PT, "FILTER_127PT": FILTER_127PT, "FILTER_255PT": FILTER_255PT},
+        "resolutionMode": {"RESOLUTION_1pF": RESOLUTION_1pF, "RESOLUTION_100fF": RESOLUTION_100fF,
+                           "RESOLUTION_10fF": RESOLUTION_10fF, "RESOLUTION_1fF": RESOLUTION_1fF}}
+
+    # Settings which only accept their constants
+    listModeSettings = ["device", "odrMode", "interruptMode", "triggerMode", "filterMode", "resolutionMode"]
+
+    # Settings written by the configuration package, in the order of its bytes after CONFIG
+    listPacketSettings = ["odrMode", "interruptMode", "triggerMode", "filterMode", "resolutionMode"]
+
+    # Length of the configuration package
+    packetLength = 22
+
+    def __init__(self, addr="SPI0", bus=0, device=SPI0, maxSpeedHz=2000000, cePin=None, interruptPin=None,
+                 triggerPin=None, odrMode=None, interruptMode=None, triggerMode=None, filterMode=None,
+                 resolutionMode=None):
+        #print("\033[0;35;40m __init__().StretchSenseSpiConfiguration()\033[0m")
+
+        self.addr = str(addr)
+        self.bus = self.checkSetting("bus", bus)
+        self.device = self.checkSetting("device", device)
+        self.maxSpeedHz = self.checkSetting("maxSpeedHz", maxSpeedHz)
+        self.cePin = self.checkSetting("cePin", CE_PIN0 if cePin is None else cePin)
+        self.interruptPin = self.checkSetting("interruptPin", INTERRUPT_PIN if interruptPin is None else interruptPin)
+        self.triggerPin = self.checkSetting("triggerPin", TRIGGER_PIN if triggerPin is None else triggerPin)
+        self.odrMode = self.checkSetting("odrMode", ODR_MODE if odrMode is None else odrMode)
+        self.interruptMode = self.checkSetting("interruptMode", INTERRUPT_MODE if interruptMode is None else interruptMode)
+        self.triggerMode = self.checkSetting("triggerMode", TRIGGER_MODE if triggerMode is None else triggerMode)
+        self.filterMode = self.checkSetting("filterMode", FILTER_MODE if filterMode is None else filterMode)
+        self.resolutionMode = self.checkSetting("resolutionMode", RESOLUTION_MODE if resolutionMode is None else resolutionMode)
+
+        if self.addr == '':
+            raise ValueError("The SPI setting addr must not be empty")
+
+        if len(set([self.cePin, self.interruptPin, self.triggerPin])) < 3:
+            raise ValueError("The SPI settings cePin, interruptPin and triggerPin must be different pins")
+
+    @classmethod
+    def checkSetting(cls, name, value):
 
-    """
+        """
 
-    class ScanPrint(btle.DefaultDelegate):
-        #print("\033[0;33;40m ScanPrint()\033[0m")
+        :param name: string :
+            Name of a numeric setting.
 
-        def __init__(self, opts):
-            #print("\033[0;33;40m __init__().ScanPrint()\033[0m")
-            btle.DefaultDelegate.__init__(self)
-            self.opts = opts
+        :param value: int :
+            Value given to the setting.
 
-        def handleDiscovery(self, dev, isNewDev, isNewData):
-            #print("\033[0;33;40m handleDiscovery()\033[0m")
+        :returns: int : The value, if it is an integer accepted by the setting, ValueError otherwise.
 
-            if isNewDev:
-                status = "new"
-            elif isNewData:
-                if self.opts.new:
-                    return
-                status = "update"
-            else:
-                if not self.opts.all:
-                    return
-                status = "old"
+        """
 
-            if dev.rssi < self.opts.sensitivity:
-                return
+        if isinstance(value, bool) or not isinstance(value, numbers.Integral):
+            raise ValueError("The SPI setting %s must be an integer, not %r" % (name, value))
 
-            if not dev.scanData:
-                print ('\t(no data)')
-            print()
+        value = int(value)
+        dictConstants = cls.dictSettingConstants.get(name, {})
 
-    """
+        if name in cls.listModeSettings and value not in dictConstants.values():
+            raise ValueError("Invalid value %d for the SPI setting %s, expected one of %s"
+                             % (value, name, ", ".join(sorted(dictConstants, key=dictConstants.get))))
 
-    Serial Peripheral Interface Functions
+        if value < 0 or (name == "maxSpeedHz" and value == 0):
+            raise ValueError("Invalid value %d for the SPI setting %s" % (value, name))
 
-    """
+        return value
 
-    def spi_generateTenChannel(self):
-        #print("\033[0;35;40m spi_generateTenChannel()\033[0m")
+    def getWiring(self):
 
         """
-        This function generate ten peripheral type StretchSensePeripheral used for the SPI.
+
+        :returns: tuple : Settings which can only be changed by a new setup of the bus.
 
         """
 
-        newSensor1 = StretchSensePeripheral()
-        newSensor1.addr = "SPI0"
-        newSensor1.uuid = self.serviceUUID3
-        newSensor1.value = 0
-        newSensor1.gen = 3
-        newSensor1.channelNumber = 0
+        return (self.bus, self.device, self.maxSpeedHz, self.cePin, self.interruptPin, self.triggerPin)
 
-        newSensor2 = StretchSensePeripheral()
-        newSensor2.addr = "SPI0"
-        newSensor2.uuid = self.serviceUUID3
-        newSensor2.value = 0
-        newSensor2.gen = 3
-        newSensor2.channelNumber = 1
+    def copy(self, **changes):
 
-        newSensor3 = StretchSensePeripheral()
-        newSensor3.addr = "SPI0"
-        newSensor3.uuid = self.serviceUUID3
-        newSensor3.value = 0
-        newSensor3.gen = 3
-        newSensor3.channelNumber = 2
+        """
 
-        newSensor4 = StretchSensePeripheral()
-        newSensor4.addr = "SPI0"
-        newSensor4.uuid = self.serviceUUID3
-        newSensor4.value = 0
-        newSensor4.gen = 3
-        newSensor4.channelNumber = 3
+        :param changes: dict :
+            Settings to change in the copy, None values are ignored.
 
-        newSensor5 = StretchSensePeripheral()
-        newSensor5.addr = "SPI0"
-        newSensor5.uuid = self.serviceUUID3
-        newSensor5.value = 0
-        newSensor5.gen = 3
-        newSensor5.channelNumber = 4
+        :returns: StretchSenseSpiConfiguration : Copy of the configuration.
 
-        newSensor6 = StretchSensePeripheral()
-        newSensor6.addr = "SPI0"
-        newSensor6.uuid = self.serviceUUID3
-        newSensor6.value = 0
-        newSensor6.gen = 3
-        newSensor6.channelNumber = 5
+        """
 
-        newSensor7 = StretchSensePeripheral()
-        newSensor7.addr = "SPI0"
-        newSensor7.uuid = self.serviceUUID3
-        newSensor7.value = 0
-        newSensor7.gen = 3
-        newSensor7.channelNumber = 6
+        dictSettings = self.toDict()
+        dictSettings.update((name, value) for (name, value) in changes.items() if value is not None)
+        return StretchSenseSpiConfiguration.fromDict(dictSettings)
 
-        newSensor8 = StretchSensePeripheral()
-        newSensor8.addr = "SPI0"
-        newSensor8.uuid = self.serviceUUID3
-        newSensor8.value = 0
-        newSensor8.gen = 3
-        newSensor8.channelNumber = 7
+    def toDict(self):
 
-        newSensor9 = StretchSensePeripheral()
-        newSensor9.addr = "SPI0"
-        newSensor9.uuid = self.serviceUUID3
-        newSensor9.value = 0
-        newSensor9.gen = 3
-        newSensor9.channelNumber = 8
+        """
 
-        newSensor10 = StretchSensePeripheral()
-        newSensor10.addr = "SPI0"
-        newSensor10.uuid = self.serviceUUID3
-        newSensor10.value = 0
-        newSensor10.gen = 3
-        newSensor10.channelNumber = 9
+        :returns: dict : Value of each setting.
 
-        self.listPeripheralSpi.append(newSensor1)
-        self.listPeripheralSpi.append(newSensor2)
-        self.listPeripheralSpi.append(newSensor3)
-        self.listPeripheralSpi.append(newSensor4)
-        self.listPeripheralSpi.append(newSensor5)
-        self.listPeripheralSpi.append(newSensor6)
-        self.listPeripheralSpi.append(newSensor7)
-        self.listPeripheralSpi.append(newSensor8)
-        self.listPeripheralSpi.append(newSensor9)
-        self.listPeripheralSpi.append(newSensor10)
+        """
 
-    def spi_setup(self):
-        #print("\033[0;33;40m spi_setup()\033[0m")
+        return dict((name, getattr(self, name)) for name in self.listSettings)
+
+    @classmethod
+    def fromDict(cls, dictSettings):
 
         """
 
-        Start the setup of the SPI communication.
+        Build a configuration from a dictionary, constants can be given by name : "odrMode": "RATE_200HZ".
+        Each setting only accepts the constants of its own family, ValueError is raised otherwise.
+
+        :param dictSettings: dict :
+            Value of each setting, missing settings take their default value.
+
+        :returns: StretchSenseSpiConfiguration : The configuration.
 
         """
-        # Creating a new setup requires get rid of the old one
-        del self.listPeripheralSpi[0:]
 
-        # Initialise SPI & GPIO ports
-        self.myDevice = spidev.SpiDev()
-        self.myDevice.close()
-        self.myDevice.open(0, SPI0)
-        self.myDevice.max_speed_hz = 2000000
-        self.myDevice.mode = 1
-        self.myDevice.lsbfirst = False
+        dictArguments = {}
 
-        self.capacitanceScalingFactor = 100
-        self.rawData = [0] * 20
-        self.spi_generateTenChannel()
+        for (name, value) in dictSettings.items():
+            if name not in cls.listSettings:
+                raise ValueError("Unknown SPI setting %s" % name)
 
-        # Initialise the data ready and chip enable pins
-        GPIO.setup(INTERRUPT_PIN, GPIO.IN)
-        GPIO.setup(CE_PIN0, GPIO.OUT, initial=GPIO.HIGH)
-        GPIO.setup(TRIGGER_PIN, GPIO.OUT)
+            if isinstance(value, str) and name != "addr":
+                dictConstants = cls.dictSettingConstants.get(name, {})
+                if value not in dictConstants:
+                    raise ValueError("Unknown value %s for the SPI setting %s" % (value, name))
+                value = dictConstants[value]
 
-        # Configure 16FGV1.0
-        self.spi_writeConfiguration()
+            dictArguments[name] = value
 
-        # Give the circuit the time to set up
-        time.sleep(0.01)
+        return cls(**dictArguments)
 
-        # Get capacitance scaling factor
-        self.capacitanceScalingFactor = self.spi_getCapacitanceScalingFactor(RESOLUTION_MODE)
+    def toPacket(self):
 
-    def spi_mode(self):
-        #print("spi_mode()")
+        """
+
+        :returns: [int] : Configuration package of the 16FGV1.0 writing these settings.
 
         """
 
-        This function is called before using the SPI transmission, it verify which mode we are using.
+        packet = [CONFIG] + [getattr(self, name) for name in self.listPacketSettings]
+        return packet + [0] * (self.packetLength - len(packet))
+
+    def fromPacket(self, packet):
 
         """
-        if (INTERRUPT_MODE == INTERRUPT_DISABLED & TRIGGER_MODE == TRIGGER_DISABLED):
-            self.spi_continuousModeCapacitance()
-        elif (INTERRUPT_MODE == INTERRUPT_ENABLED & TRIGGER_MODE == TRIGGER_DISABLED):
-            self.spi_continuousModeCapacitance()
-        elif (INTERRUPT_MODE == INTERRUPT_DISABLED & TRIGGER_MODE == TRIGGER_ENABLED):
-            self.spi_triggerModeCapacitance()
-        else:
-            pass
 
-    def spi_triggerModeCapacitance(self):
-        #print("\033[0;35;40m spi_triggerModeCapacitance()\033[0m")
+        Decode a configuration package written to a 16FGV1.0, the inverse of toPacket().
+
+        :param packet: [int] or bytes :
+            Configuration package.
+
+        :returns: StretchSenseSpiConfiguration : Copy of this configuration with the settings of the package.
 
         """
 
-        When TRIGGER is enable we use this SPI function.
+        packet = list(packet)
+
+        if len(packet) <= len(self.listPacketSettings) or packet[0] != CONFIG:
+            raise ValueError("Not a configuration package of the 16FGV1.0")
+
+        return self.copy(**dict(zip(self.listPacketSettings, packet[1:])))
+
+    @classmethod
+    def load(cls, filename):
 
         """
 
-        # Trigger a sample to begin
-        GPIO.output(TRIGGER_PIN, GPIO.HIGH)
-        GPIO.output(TRIGGER_PIN, GPIO.LOW)
+        Read a configuration from a JSON file, or a TOML file with Python 3.11 or later.
 
-        # Allow the circuit to start a sample
+        :param filename: string :
+            Path of the file, its extension gives its format.
 
-        time.sleep(0.1)
+        :returns: StretchSenseSpiConfiguration : The configuration.
 
-        # Read the sensor data
-        self.readData = self.spi_readCapacitance()
+        """
 
-        # Convert the raw data to capacitance
-        for i in range(10):
-            self.spi_extractCapacitance(self.readData, i)
+        if os.path.splitext(filename)[1].lower() == ".toml":
+            if tomllib is None:
+                raise ValueError("Reading %s requires tomllib, use a JSON file instead" % filename)
+            with open(filename, "rb") as myFile:
+                return cls.fromDict(tomllib.load(myFile))
 
-    def spi_continuousModeCapacitance(self):
-        #print("\033[0;35;40m spi_continuousModeCapacitance()\033[0m")
+        with open(filename) as myFile:
+            return cls.fromDict(json.load(myFile))
+
+    def save(self, filename):
 
         """
 
-        When INTERRUPT is enable or in continuous mode we use this SPI function.
+        Write the configuration in a JSON file.
+
+        :param filename: string :
+            Path of the file.
 
         """
 
-        # Check if the interrupt mode is enabled (in configuration)
-        if (INTERRUPT_MODE == INTERRUPT_ENABLED):
-            # Don't do anything until the interrupt goes low
-            while(GPIO.input(INTERRUPT_PIN) == GPIO.HIGH):
-                pass
+        with open(filename, "w") as myFile:
+            json.dump(self.toDict(), myFile, indent=4)
 
-        self.readData = self.spi_readCapacitance()
 
-        # Convert the raw data to capacitance
-        for i in range(10):
-            self.spi_extractCapacitance(self.readData, i)
+class StretchSenseFrame:
+    #print("\033[0;35;40m StretchSenseFrame()\033[0m")
 
-        # Wait for the next data packet to start sampling
-        if(INTERRUPT_MODE == INTERRUPT_ENABLED):
-            # Don't do anything until the interruptcoes high
-            while(GPIO.input(INTERRUPT_PIN) == GPIO.LOW):
-                pass
+    """
+    Class which holds the values sampled at the same time on every channel of one StretchSense device.
 
-    def spi_writeConfiguration(self):
-        #print("\033[0;35;40m spi_writeConfiguration()\033[0m")
+    :param addr: string:
+        Address of the device which produced the frame, "SPI0" by default for the 16FGV1.0.
 
-        """
+    :param gen: string:
+        This number is the generation of the device.
 
-        Function called in spi_setup() to write the configuration on the SPI bus.
+    :param values: [float]:
+        Capacitance of each channel of the device, ordered by channel number.
 
-        """
+    :param timestamp: int:
+        Time in nanoseconds given by time.monotonic_ns() when the values have been received from the device,
+        StretchSenseAPI.timestampToWallClock() converts it to a date.
 
-    # 16FGV1.0 requires a configuration package to start streaming the data
+    :param stale: bool:
+        True when a resampled frame holds values older than expected.
 
-        # Set the chip select to low to select device
-        GPIO.output(CE_PIN0, GPIO.LOW)
+    :param gap: int:
+        Number of frames of the device lost just before this one.
 
-        # Select configure package and sets it
-        self.myDevice.xfer2([CONFIG, ODR_MODE, INTERRUPT_MODE, TRIGGER_MODE, FILTER_MODE, RESOLUTION_MODE, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0])
+    :param overrun: bool:
+        True when the frame arrived much sooner than the sampling period of the device.
 
-        # Take the chip select to high to de-select
-        GPIO.output(CE_PIN0, GPIO.HIGH)
+    :param baseline: [float]:
+        Baseline of each channel removed from the values by StretchSenseAutoZero, None otherwise.
 
-    def spi_readCapacitance(self):
-        #print("\033[0;35;40m spi_readCapacitance()\033[0m")
+    :param configEpoch: int:
+        Number of configurations written to the device before this frame, frames with different numbers
+        have been sampled with different settings.
 
-        """
+    :param scalingFactor: int:
+        Number of counts of the device per unit of the values, None for devices without a resolution setting.
 
-        Function which read the capacitance in hexadecimal in the SPI bus.
+    :param saturated: bool:
+        True when a channel is at the top of the 16 bit range of the 16FGV1.0, its value is clipped.
 
-        :returns: int :
-            raw sensing from the 16FGV1.0
+    :param settled: bool:
+        False while the filter of the 16FGV1.0 still holds samples taken before its last configuration.
 
-        """
+    """
 
-    # 16FGV1.0 transmits data in the form of 10, 16bit capacitance values
+    def __init__(self):
+        #print("\033[0;35;40m __init__().StretchSenseFrame()\033[0m")
 
-        # Set the chip select to low to select the device
-        GPIO.output(CE_PIN0, GPIO.LOW)
+        # Mac Address of the device, or the SPI port
+        self.addr = ''
 
-        # Select Data package to return values
-        raw = self.myDevice.xfer2([DATA, PADDING, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0])
+        # Generation of the circuit
+        self.gen = ''
 
-        del raw[:2]
-        return raw
+        # Capacitance values of every channel of the device
+        self.values = []
 
-        #Take the chip select to high to de-select
-        GPIO.output(CE_PIN0, GPIO.HIGH)
+        # Time of acquisition in nanoseconds, on the time.monotonic_ns() clock
+        self.timestamp = 0
 
-    def spi_getCapacitanceScalingFactor(self, resolutionConfig):
-        #print("\033[0;33;40m spi_getCapacitanceScalingFactor()\033[0m")
+        # Set by StretchSenseAligner when the device did not send recent enough values
+        self.stale = False
 
-        """
+        # Set by StretchSenseLossTracker, frames lost before this one and frame received too early
+        self.gap = 0
+        self.overrun = False
 
-        The 16FGV1.0 has an adjustable LSB resolution this function scales raw data to capacitance based on
-        the configuration.
+        # Set by StretchSenseAutoZero, baseline of each channel
+        self.baseline = None
 
-        :param resolutionConfig: int :
-            Resolution set on the SPI bus during spi_writeConfiguration.
+        # Configuration of the device in use when the frame has been sampled
+        self.configEpoch = 0
 
-        :returns: int :
-            The scale of the resolution.
+        # Resolution of the values, set by the SPI transport
+        self.scalingFactor = None
 
-        """
+        # Set by the SPI transport, clipped values and samples mixed with the previous configuration
+        self.saturated = False
+        self.settled = True
 
-        if resolutionConfig == RESOLUTION_1pF:
-            return 1
 
-        elif resolutionConfig == RESOLUTION_100fF:
-            return 10
+class StretchSenseRateMeter(object):
+    #print("\033[0;35;40m StretchSenseRateMeter()\033[0m")
 
-        elif resolutionConfig == RESOLUTION_10fF:
-            return 100
+    """
+    Class which measures how many times per second an event happens, averaged over a window.
 
-        elif resolutionConfig == RESOLUTION_1fF:
-            return 1000
+    :param window: float:
+        Length of the averaging window in seconds.
 
-        return 1
+    """
 
-    def spi_extractCapacitance(self, raw, channel):
-        #print("\033[0;35;40m spi_extractCapacitance()\033[0m")
+    def __init__(self, window=1.0):
+        #print("\033[0;35;40m __init__().StretchSenseRateMeter()\033[0m")
+
+        self.window = window
+        self.count = 0
+        self.rate = 0.0
+        self.timeStart = time.monotonic()
+
+    def tick(self, now=None):
 
         """
 
-        Does the conversion of the raw value received by the 16FGV1.0 into a decimal value.
+        Count one event.
 
-        :param raw: int :
-            Raw is the raw value that we read on the SPI bus.
-        :param channel: int :
-            Number from 0 to 9 corresponding of the channel number to convert the raw value.
+        :param now: float :
+            time.monotonic() of the event, read from the clock when omitted.
 
         """
 
-        capacitance = 0.0
-        numberOfSpiPeripheral = len(self.listPeripheralSpi)
-        if numberOfSpiPeripheral > 0:
+        if now is None:
+            now = time.monotonic()
 
-            for myPeripheral in self.listPeripheralSpi:
+        self.count += 1
+        elapsed = now - self.timeStart
 
-                if channel == myPeripheral.channelNumber:
-                    capacitance = raw[2 * channel] * 256 + raw[2 * channel + 1]
-                    capacitance /= self.capacitanceScalingFactor
-                    myPeripheral.value = capacitance
-                    #print("MainmyPeripheral.value = ", myPeripheral.value)
+        if elapsed >= self.window:
+            self.rate = self.count / elapsed
+            self.count = 0
+            self.timeStart = now
 
-    def spi_listToCsv(self):
-        #print("\033[0;35;40m spi_listToCsv()\033[0m")
+    def getRate(self, now=None):
 
         """
 
-        Display the values in a csv format in the terminal.
+        :returns: float : Number of events per second over the last window.
 
         """
 
-        listToCsv = ""
-        numberOfSpiPeripheralConnected = len(self.listPeripheralSpi) - 1
+        if now is None:
+            now = time.monotonic()
 
-        if numberOfSpiPeripheralConnected > 0:
+        elapsed = now - self.timeStart
 
-            for myPeripheral in self.listPeripheralSpi:
-                listToCsv += ("%s ," % myPeripheral.value)
+        if elapsed >= 2 * self.window:
+            return self.count / elapsed
+        return self.rate
 
-        print("\n")
-        print(listToCsv)
 
-    def spi_getValuesCsv(self):
-        #print("\033[0;35;40m spi_getValuesCsv()\033[0m")
+class StretchSenseLossTracker(object):
+    #print("\033[0;35;40m StretchSenseLossTracker()\033[0m")
 
-        """
+    """
+    Class which counts the frames expected and received from each device, from the sampling period of the
+    device and the time between two frames. A frame arriving after more than one period and a half is
+    preceded by a gap, and a frame arriving after less than half a period is an overrun. When the sampling
+    period of a device is not known it is estimated as the median of its last intervals.
 
-        Return the values in a csv format.
+    :param tolerance: float:
+        Fraction of the period accepted around the expected arrival of each frame.
 
-        :returns: string :
-            16FGV1.0 values in a csv format.
+    """
+
+    # Number of intervals used to estimate an unknown period
+    numberOfIntervals = 64
+
+    def __init__(self, tolerance=0.5):
+        #print("\033[0;35;40m __init__().StretchSenseLossTracker()\033[0m")
+
+        self.tolerance = tolerance
+        self.dictPeriod = {}
+        self.dictStatus = {}
+        self.lock = Lock()
+
+    def setPeriod(self, addr, period):
 
         """
 
-        listToReturn = ""
-        numberOfSpiPeripheralConnected = len(self.listPeripheralSpi) - 1
+        Set the sampling period of a device.
 
-        if numberOfSpiPeripheralConnected > 0:
+        :param addr: string :
+            Address of the device.
 
-            for myPeripheral in self.listPeripheralSpi:
-                listToReturn += ("%s ," % myPeripheral.value)
+        :param period: float :
+            Sampling period in seconds, None to estimate it, 0 to only count the frames of a device whose
+            frames are not samples at a regular period.
 
-        return listToReturn
+        """
 
-    def spi_getListPeripheral(self):
-        #print("\033[0;35;40m spi_getListPeripheral()\033[0m")
+        with self.lock:
+            if period is None:
+                self.dictPeriod.pop(addr, None)
+            else:
+                self.dictPeriod[addr] = int(period * 1e9)
+
+    def reset(self, addr):
 
         """
 
-        Return a list of all peripheral created by spi_generateTenChannel().
+        Forget the frames counted for a device, when it is connected or configured again.
 
-        :returns: list :
-            List containing all the information of each SPI peripheral connected.
+        :param addr: string :
+            Address of the device.
 
         """
 
-        return self.listPeripheralSpi
+        with self.lock:
+            self.dictStatus.pop(addr, None)
 
-    def spi_close(self):
-        #print("\033[0;35;40m spi_close()\033[0m")
+    def update(self, frame):
 
         """
 
-        Close the SPI transmission.
+        Count a new frame and flag its gap or overrun.
+
+        :param frame: StretchSenseFrame :
+            Frame received, in the order of reception.
 
         """
 
-        self.myDevice.close()
+        with self.lock:
+            status = self.dictStatus.get(frame.addr)
 
-    """
+            if status is None:
+                self.dictStatus[frame.addr] = {"received": 1, "lost": 0, "gaps": 0, "overruns": 0,
+                                               "timeLast": frame.timestamp,
+                                               "intervals": collections.deque(maxlen=self.numberOfIntervals)}
+                return
 
-    Functions : Scan, Print, Connect/Disconnect & Update
+            interval = frame.timestamp - status["timeLast"]
+            status["timeLast"] = frame.timestamp
+            status["received"] += 1
+            status["intervals"].append(interval)
 
-    """
+            period = self.getPeriodLocked(frame.addr)
 
-    def ble_printAllPeripheralsAvailable(self):
-        #print("\033[0;35;40m ble_printAllPeripheralsAvailable()\033[0m")
+            if not period:
+                return
+
+            if interval > period * (1 + self.tolerance):
+                frame.gap = max(int(round(interval / period)) - 1, 1)
+                status["lost"] += frame.gap
+                status["gaps"] += 1
+            elif interval < period * (1 - self.tolerance):
+                frame.overrun = True
+                status["overruns"] += 1
+
+    def getPeriodLocked(self, addr):
 
         """
 
-        Display all the StretchSense's device addresses available around.
+        :returns: int : Sampling period of a device in nanoseconds, configured or estimated, 0 if unknown.
+
+        """
+
+        if addr in self.dictPeriod:
+            return self.dictPeriod[addr]
 
+        intervals = self.dictStatus[addr]["intervals"]
+
+        if len(intervals) < 8:
+            return 0
+        return int(np.median(intervals))
+
+    def getMetrics(self):
 
         """
 
-        numberOfPeripheralAvailable = len(self.listPeripheralAvailable) - 1
+        :returns: {addr: dict} : Frames received and lost, loss rate, number of gaps and overruns and sampling
+            period in seconds of each device.
 
-        if (numberOfPeripheralAvailable == 0):
-            return print("No devices available")
+        """
 
-        elif numberOfPeripheralAvailable >= 1:
+        metrics = {}
 
-            print("Number of StretchSense devices detected : ", numberOfPeripheralAvailable)
+        with self.lock:
+            for (addr, status) in self.dictStatus.items():
+                expected = status["received"] + status["lost"]
+                metrics[addr] = {"received": status["received"],
+                                 "expected": expected,
+                                 "lost": status["lost"],
+                                 "lossRate": status["lost"] / expected,
+                                 "gaps": status["gaps"],
+                                 "overruns": status["overruns"],
+                                 "period": self.getPeriodLocked(addr) / 1e9}
 
-            for myPeripheralAvailable in self.listPeripheralAvailable:
+        return metrics
 
-                if myPeripheralAvailable.addr != '':
-                    print("StretchSense device : %s\n" % (myPeripheralAvailable.addr))
 
-    def ble_printAllPeripheralsConnected(self):
-        #print("\033[0;35;40m ble_printAllPeripheralsConnected()\033[0m")
+class StretchSenseAdapterManager(object):
+    #print("\033[0;35;40m StretchSenseAdapterManager()\033[0m")
 
-        """
-        Display all the StretchSense's device addresses connected.
+    """
+    Class which spreads the BLE connections over several HCI adapters, for example the Raspberry Pi radio
+    and USB dongles. A new device goes to the adapter with the fewest connections, and between adapters
+    equally loaded to the one which received it with the best RSSI. A device keeps its adapter when it is
+    connected again.
 
-        """
+    :param listHci: [int]:
+        Number of each adapter used, 0 for hci0.
 
-        numberOfPeripheralConnected = len(self.listPeripheralIsConnected) - 1
+    """
 
-        if (numberOfPeripheralConnected == 0):
-            return print("No sensors connected")
+    def __init__(self, listHci=(0,)):
+        #print("\033[0;35;40m __init__().StretchSenseAdapterManager()\033[0m")
 
-        elif numberOfPeripheralConnected >= 1:
+        self.listHci = list(listHci)
 
-            for myPeripheralConnected in self.listPeripheralIsConnected:
+        # Adapter given to each device, kept across reconnections
+        self.dictAssignment = {}
 
-                if myPeripheralConnected.addr != '':
-                    print("StretchSense Sensor Connected : %s\n" % (myPeripheralConnected.addr))
+        # Last RSSI of each device on each adapter, keyed by (addr, hci)
+        self.dictRssi = {}
 
-    def ble_scanning(self, scanTime):
-        #print("\033[0;35;40m ble_scanning()\033[0m")
+        # Adapter of each device connected
+        self.dictConnected = {}
+
+        self.lock = Lock()
+
+    def setRssi(self, addr, hci, rssi):
 
         """
 
-        Scan for StretchSense devices in the area and store them in listPeripheralAvailable.
+        Store the signal strength of a device seen by an adapter.
 
-        :param scanTime: int :
-            Time to scan for.
+        :param addr: string :
+            Address of the device.
 
-        """
+        :param hci: int :
+            Adapter which received the advertisement.
 
-        parser = argparse.ArgumentParser()
-        parser.add_argument('-i', '--hci', action='store', type=int, default=0,
-                            help='Interface number for scan')
-        parser.add_argument('-t', '--timeout', action='store', type=int, default=4,
-                            help='Scan delay, 0 for continuous')
-        parser.add_argument('-s', '--sensitivity', action='store', type=int, default=-128,
-                            help='dBm value for filtering far devices')
-        parser.add_argument('-d', '--discover', action='store_true',
-                            help='Connect and discover service to scanned devices')
-        parser.add_argument('-a', '--all', action='store_true',
-                            help='Display duplicate adv responses, by default show new + updated')
-        parser.add_argument('-n', '--new', action='store_true',
-                            help='Display only new adv responses, by default show new + updated')
-        parser.add_argument('-v', '--verbose', action='store_true',
-                            help='Increase output verbosity')
-        arg = parser.parse_args(sys.argv[1:])
-
-        self.Debugging = arg.verbose
-        scanner = btle.Scanner(arg.hci).withDelegate(self.ScanPrint(arg))
-        devicesAvailable = scanner.scan(scanTime)
-        self.listPeripheralInUse = []
+        :param rssi: int :
+            RSSI in dBm.
 
-        for devices in devicesAvailable:
-            deviceAlreadyInTheList = False
+        """
 
-            for (sdid, desc, val) in devices.getScanData():
+        with self.lock:
+            self.dictRssi[(addr, hci)] = rssi
 
-                if (val == StretchSenseAPI.deviceName):
+    def selectAdapter(self, addr):
 
-                    for myDeviceInTheList in self.listPeripheralAvailable:
+        """
 
-                        if (myDeviceInTheList.addr == devices.addr):
-                            deviceAlreadyInTheList = True
+        Choose the adapter used to connect a device.
 
-                    if deviceAlreadyInTheList is False:
-                        self.listPeripheralAvailable.append(devices)
+        :param addr: string :
+            Address of the device.
 
-    def ble_connectOnePeripheral(self, myDeviceAddr):
-        #print("\033[0;35;40m ble_connectOnePeripheral()\033[0m")
+        :returns: int : Adapter to use.
 
         """
 
-        Connect one StretchSense device which is available using its address, generate one or more
-        peripherals as StretchSensePeripheral and store them into listPeripheralIsConnected.
-        The peripheral is also stored in listPeripheralInUse.
+        with self.lock:
+            hci = self.dictAssignment.get(addr)
 
-        :param myDeviceAddr: string :
-            Address of the device that you want to connect.
+            if hci not in self.listHci:
+                load = collections.Counter(self.dictConnected.values())
+                hci = min(self.listHci, key=lambda hci: (load[hci], -self.dictRssi.get((addr, hci), -128)))
+                self.dictAssignment[addr] = hci
+
+            return hci
+
+    def setConnected(self, addr, hci):
 
         """
 
-        numberOfPeripheralAvailable = len(self.listPeripheralAvailable) - 1
+        Count a connection on an adapter.
 
-        if (len(self.listPeripheralIsConnected) - 1) > 0:
-            pass
-        else:
-            self.listPeripheralIsConnected = []
+        :param addr: string :
+            Address of the device connected.
 
-        if numberOfPeripheralAvailable > 0:
-            for myPeripheralAvailable in self.listPeripheralAvailable:
-                if (myPeripheralAvailable.addr == myDeviceAddr):
+        :param hci: int :
+            Adapter used.
 
-                    myPeripheralConnected = btle.Peripheral(myPeripheralAvailable)
-                    myPeripheralConnected.setDelegate(StretchSenseDelegate(myPeripheralConnected))
-                    myPeripheralConnected.deviceAddr = myDeviceAddr
-                    self.listPeripheralInUse.append(myPeripheralConnected)
-                    listOfServices = sorted(myPeripheralConnected.services, key=lambda services: services.hndStart)
+        """
 
-                    for services in listOfServices:
+        with self.lock:
+            self.dictConnected[addr] = hci
 
-                        if services.hndStart == services.hndEnd:
-                            continue
+    def setDisconnected(self, addr=None):
 
-                        if services.uuid == self.serviceUUID2:
-                            myPeripheralConnected.gen = "2"
-                            myPeripheralConnected.uuid = self.serviceUUID2
-                            self.ble_generateOneChannel(myPeripheralConnected)
-                            characteristics = services.getCharacteristics()[0]
-                            myPeripheralConnected.writeCharacteristic(characteristics.valHandle + 1, b"\x01\x00")
-                            continue
+        """
 
-                        if services.uuid == self.serviceUUID3:
-                            myPeripheralConnected.gen = "3"
-                            myPeripheralConnected.uuid = self.serviceUUID3
-                            self.ble_generateTenChannel(myPeripheralConnected)
-                            characteristics = services.getCharacteristics()[0]
-                            myPeripheralConnected.writeCharacteristic(characteristics.valHandle + 1, b"\x01\x00")
-                            continue
+        Forget the connection of a device, or of every device when addr is omitted. The adapter of the
+        device is kept for its next connection.
 
-                        if services.uuid == self.serviceUUID10TT:
-                            myPeripheralConnected.gen = "10TT"
-                            myPeripheralConnected.uuid = self.serviceUUID10TT
-                            self.ble_generateTenChannel(myPeripheralConnected)
-                            characteristics = services.getCharacteristics()
-                            for char in characteristics:
-                                if char.uuid == self.dataUUID10TT:
-                                    myPeripheralConnected.writeCharacteristic(char.valHandle + 1, b"\x01\x00")
-                            continue
+        :param addr: string :
+            Address of the device disconnected.
 
-    def ble_connectAllPeripheral(self):
-        #print("\033[0;35;40m ble_connectAllPeripheral()\033[0m")
+        """
+
+        with self.lock:
+            if addr is None:
+                self.dictConnected.clear()
+            else:
+                self.dictConnected.pop(addr, None)
+
+    def getConnected(self):
 
         """
 
-        Connect all StretchSense devices which are available using their addresses, generate the
-        peripherals as StretchSensePeripheral and store them into listPeripheralIsConnected.
-        Peripherals are also stored in listPeripheralInUse.
+        :returns: {addr: int} : Adapter of each device connected.
 
         """
 
-        numberOfPeripheralAvailable = len(self.listPeripheralAvailable) - 1
-        self.listPeripheralIsConnected = []
-        self.listPeripheralInUse = []
+        with self.lock:
+            return dict(self.dictConnected)
 
-        if numberOfPeripheralAvailable > 0:
 
-            for myPeripheralAvailable in self.listPeripheralAvailable:
+class StretchSenseRingBuffer(object):
+    #print("\033[0;35;40m StretchSenseRingBuffer()\033[0m")
 
-                if myPeripheralAvailable.addr != '':
-                    #print('Address we are trying to connect to : ', myPeripheralAvailable.addr)
-                    myPeripheralConnected = btle.Peripheral(myPeripheralAvailable)
-                    myPeripheralConnected.setDelegate(StretchSenseDelegate(myPeripheralConnected))
-                    myPeripheralConnected.deviceAddr = myPeripheralAvailable.addr
-                    self.listPeripheralInUse.append(myPeripheralConnected)
-                    listOfServices = sorted(myPeripheralConnected.services, key=lambda services: services.hndStart)
+    """
+    Class which keeps the last frames of one device in preallocated NumPy arrays, the oldest frame is
+    overwritten once the buffer is full.
 
-                    for services in listOfServices:
-                        if services.hndStart == services.hndEnd:
-                            continue
+    :param numberOfChannels: int:
+        Number of channels of the device.
 
-                        if services.uuid == self.serviceUUID2:
-                            myPeripheralConnected.gen = '2'
-                            myPeripheralConnected.uuid = self.serviceUUID2
-                            self.ble_generateOneChannel(myPeripheralConnected)
-                            characteristics = services.getCharacteristics()[0]
-                            myPeripheralConnected.writeCharacteristic(characteristics.valHandle + 1, b"\x01\x00")
-                            continue
+    :param length: int:
+        Number of frames kept.
 
-                        if services.uuid == self.serviceUUID3:
-                            myPeripheralConnected.gen = '3'
-                            myPeripheralConnected.uuid = self.serviceUUID3
-                            self.ble_generateTenChannel(myPeripheralConnected)
-                            characteristics = services.getCharacteristics()[0]
-                            myPeripheralConnected.writeCharacteristic(characteristics.valHandle + 1, b"\x01\x00")
-                            continue
+    :param dtype: dtype:
+        Type of the values stored.
 
-                        if services.uuid == self.serviceUUID10TT:
-                            myPeripheralConnected.gen = '10TT'
-                            myPeripheralConnected.uuid = self.serviceUUID10TT
-                            self.ble_generateTenChannel(myPeripheralConnected)
-                            characteristics = services.getCharacteristics()[0]
-                            myPeripheralConnected.writeCharacteristic(characteristics.valHandle + 1, b"\x01\x00")
-                            continue
+    """
 
-    def ble_disconnectOnePeripheral(self, myDeviceAddr):
-        #print("\033[0;35;40m ble_disconnectOnePeripheral()\033[0m")
+    def __init__(self, numberOfChannels, length, dtype=np.float32):
+        #print("\033[0;35;40m __init__().StretchSenseRingBuffer()\033[0m")
+
+        self.numberOfChannels = numberOfChannels
+        self.length = length
+        self.timestamps = np.zeros(length)
+        self.values = np.zeros((length, numberOfChannels), dtype=dtype)
+
+        # Index of the next frame written, and number of frames stored
+        self.index = 0
+        self.count = 0
+
+    def push(self, timestamp, values):
 
         """
-        Disconnect one StretchSense device which is connected using its address, and remove it from
-        listPeripheralIsConnected.
-        The peripheral is also removed from listPeripheralInUse.
 
-        :param myDeviceAddr: string :
-            Address of the device that you want to disconnect.
+        Store one frame.
+
+        :param timestamp: float :
+            Time of the frame.
+
+        :param values: [float] :
+            Value of each channel.
 
         """
 
-        numberOfPeripheralConnected = len(self.listPeripheralIsConnected)
+        self.timestamps[self.index] = timestamp
+        self.values[self.index, :len(values)] = values
+        self.index = (self.index + 1) % self.length
+        self.count = min(self.count + 1, self.length)
 
-        if numberOfPeripheralConnected > 0:
+    def clear(self):
 
-            i = 0
-            for myPeripheralConnected in self.listPeripheralIsConnected:
+        """
 
-                if myPeripheralConnected.addr == myDeviceAddr:
-                    del self.listPeripheralIsConnected[i:i + 10]
-                    break
-                i += 1
+        Forget every frame stored.
 
-            for myPeripheralInUse in self.listPeripheralInUse:
+        """
 
-                if myPeripheralInUse.addr == myDeviceAddr:
-                    self.listPeripheralInUse.remove(myPeripheralInUse)
-                    myPeripheralInUse.disconnect()
+        self.index = 0
+        self.count = 0
 
-    def ble_disconnectAllPeripherals(self):
-        #print("\033[0;35;40m ble_disconnectAllPeripherals()\033[0m")
+    def getLast(self, number=None):
 
         """
 
-        Disconnect all StretchSense devices which are connected, and remove them from both
-        listPeripheralIsConnected and listPeripheralInUse.
+        Returns a copy of the last frames stored, oldest first.
+
+        :param number: int :
+            Number of frames, every frame stored when omitted.
+
+        :returns: (array, array) : Timestamps of the frames, and their values with one column per channel.
 
         """
 
-        for myPeripheralInUse in self.listPeripheralInUse:
-            myPeripheralInUse.disconnect()
-        del self.listPeripheralAvailable[1:]
-        del self.listPeripheralIsConnected[1:]
-        del self.listPeripheralInUse[1:]
+        if number is None or number > self.count:
+            number = self.count
 
-    """
+        start = (self.index - number) % self.length
 
-     Functions : Discover/Generate/Update Services & Characteristics, and wait for notifications
+        if start + number <= self.length:
+            return (self.timestamps[start:start + number].copy(), self.values[start:start + number].copy())
 
-    """
+        return (np.concatenate((self.timestamps[start:], self.timestamps[:self.index])),
+                np.concatenate((self.values[start:], self.values[:self.index])))
 
-    def ble_generateOneChannel(self, peripheral):
-        #print("\033[0;35;40m ble_generateOneChannel()\033[0m")
+    def getSince(self, timestamp):
 
         """
 
-        When a StretchSense gen2 device is connected we create a newSensor receiving the
-        specifications needed.
+        Returns a copy of the frames stored since a given time, oldest first.
 
-        :param peripheral: Peripheral :
-            Using the BLE Peripheral format we can convert it into a StretchSensePeripheral
-            format easier to use.
+        :param timestamp: float :
+            Time of the oldest frame wanted.
 
-        :param periphUUID: UUID :
-            UUID of the StretchSense circuit
+        :returns: (array, array) : Timestamps of the frames, and their values with one column per channel.
 
         """
 
-        # We create a newSensor with the address
-        newSensor = StretchSensePeripheral()
-        newSensor.addr = peripheral.addr
-        newSensor.uuid = peripheral.uuid
-        newSensor.value = 0
-        newSensor.gen = peripheral.gen
-        newSensor.channelNumber = 0
+        # Binary search on the frames in storage order, only the frames returned are copied
+        start = (self.index - self.count) % self.length
+        (low, high) = (0, self.count)
+
+        while low < high:
+            middle = (low + high) // 2
+            if self.timestamps[(start + middle) % self.length] < timestamp:
+                low = middle + 1
+            else:
+                high = middle
 
-        self.listPeripheralIsConnected.append(newSensor)
+        return self.getLast(self.count - low)
 
-    def ble_generateTenChannel(self, peripheral):
-        #print("\033[0;35;40m ble_generateTenChannel()\033[0m")
+    def resize(self, length):
 
         """
 
-        When a StretchSense gen3 device is connected we create ten newSensor receiving the
-        specifications needed.
+        Change the number of frames kept, the last frames stored are kept.
 
-        :param peripheral: Peripheral :
-            Using the BLE Peripheral format we can convert it into a StretchSensePeripheral
-            format easier to use.
+        :param length: int :
+            New number of frames kept.
 
         """
 
-        # We create ten newSensor with the address
-        newSensor1 = StretchSensePeripheral()
-        newSensor1.addr = peripheral.addr
-        newSensor1.uuid = peripheral.uuid
-        newSensor1.value = 0
-        newSensor1.gen = peripheral.gen
-        newSensor1.channelNumber = 0
+        (timestamps, values) = self.getLast(length)
 
-        newSensor2 = StretchSensePeripheral()
-        newSensor2.addr = peripheral.addr
-        newSensor2.uuid = peripheral.uuid
-        newSensor2.value = 0
-        newSensor2.gen = peripheral.gen
-        newSensor2.channelNumber = 1
+        self.length = length
+        self.timestamps = np.zeros(length)
+        self.values = np.zeros((length, self.numberOfChannels), dtype=self.values.dtype)
+        self.count = len(timestamps)
+        self.index = self.count % length
+        self.timestamps[:self.count] = timestamps
+        self.values[:self.count] = values
 
-        newSensor3 = StretchSensePeripheral()
-        newSensor3.addr = peripheral.addr
-        newSensor3.uuid = peripheral.uuid
-        newSensor3.value = 0
-        newSensor3.gen = peripheral.gen
-        newSensor3.channelNumber = 2
 
-        newSensor4 = StretchSensePeripheral()
-        newSensor4.addr = peripheral.addr
-        newSensor4.uuid = peripheral.uuid
-        newSensor4.value = 0
-        newSensor4.gen = peripheral.gen
-        newSensor4.channelNumber = 3
+class StretchSenseRecorder(object):
+    #print("\033[0;35;40m StretchSenseRecorder()\033[0m")
 
-        newSensor5 = StretchSensePeripheral()
-        newSensor5.addr = peripheral.addr
+    """
+    Class which streams a recording to disk line by line, the recording is split in segment files
+    <name>_<index><extension> once a segment is larger than maxSize bytes or older than maxTime seconds.
+    Each segment starts with the header so that it can be read on its own.
+
+    :param filename: string:
+        Path of the recording, the index of the segment is added before the extension.
+
+    :param header: string:
+        Lines written at the start of each segment.
+
+    :param maxSize: int:
+        Size in bytes after which a new segment is opened, never when 0.
+
+    :param maxTime: float:
+        Time in seconds after which a new segment is opened, never when 0.
+
+    :param columns: [dict]:
+        Description of each column given by StretchSenseAPI.getChannelColumns(), written in a sidecar file
+        <name>.json next to the segments.
+
+    :param startTime: float:
+        Date in seconds since the epoch of the origin of the Sample Time column, written in the sidecar file.
+
+    """
+
+    def __init__(self, filename, header="", maxSize=0, maxTime=0, columns=None, startTime=None):
+        #print("\033[0;35;40m __init__().StretchSenseRecorder()\033[0m")
+
+        (self.root, self.extension) = os.path.splitext(filename)
+        self.header = header
+        self.maxSize = maxSize
+        self.maxTime = maxTime
+        self.listSegment = []
+        self.myFile = None
+        self.segmentSize = 0
+        self.segmentStart = 0
+        self.lock = Lock()
+        self.sidecar = None
+
+        if columns is not None:
+            self.sidecar = self.root + ".json"
+            with open(self.sidecar, "w") as myFile:
+                json.dump({"startTime": startTime, "columns": columns}, myFile, indent=4)
+
+        self.openSegment()
+
+    def openSegment(self):
+
+        """
+
+        Close the current segment and open the next one.
+
+        """
+
+        if self.myFile is not None:
+            self.myFile.close()
+
+        filename = "%s_%04d%s" % (self.root, len(self.listSegment), self.extension)
+        self.myFile = open(filename, "w", encoding="utf-8")
+        self.myFile.write(self.header)
+        self.listSegment.append(filename)
+        self.segmentSize = len(self.header.encode())
+        self.segmentStart = time.monotonic()
+
+    def write(self, line):
+
+        """
+
+        Append a line to the recording, opening a new segment first if the current one is full.
+
+        :param line: string :
+            Line to write, with its end of line.
+
+        """
+
+        with self.lock:
+
+            if self.myFile is None:
+                return
+
+            # maxSize is in bytes, non-ASCII characters take several bytes on disk
+            size = len(line.encode())
+
+            if ((self.maxSize and self.segmentSize + size > self.maxSize) or
+                    (self.maxTime and time.monotonic() - self.segmentStart > self.maxTime)):
+                self.openSegment()
+
+            self.myFile.write(line)
+            self.segmentSize += size
+
+    def close(self):
+
+        """
+
+        Close the current segment, the recording cannot be written anymore.
+
+        :returns: [string] : Path of each segment.
+
+        """
+
+        with self.lock:
+
+            if self.myFile is not None:
+                self.myFile.close()
+                self.myFile = None
+
+        return list(self.listSegment)
+
+    def move(self, filename):
+
+        """
+
+        Move the segments of a closed recording. A single segment takes the new name, several segments
+        keep their index after the new name.
+
+        :param filename: string :
+            New path of the recording.
+
+        :returns: [string] : New path of each segment.
+
+        """
+
+        self.close()
+
+        (root, extension) = os.path.splitext(filename)
+        if extension == '':
+            extension = self.extension
+
+        if len(self.listSegment) == 1:
+            listDestination = [root + extension]
+        else:
+            listDestination = ["%s_%04d%s" % (root, index, extension) for index in range(len(self.listSegment))]
+
+        for (source, destination) in zip(self.listSegment, listDestination):
+            shutil.move(source, destination)
+
+        if self.sidecar is not None:
+            shutil.move(self.sidecar, root + ".json")
+            self.sidecar = root + ".json"
+
+        (self.root, self.extension) = (root, extension)
+        self.listSegment = listDestination
+        return list(listDestination)
+
+    @staticmethod
+    def readColumns(filename):
+
+        """
+
+        Read the header of a segment to find each column by its name.
+
+        :param filename: string :
+            Path of any segment of the recording.
+
+        :returns: dict : Index of each column by name.
+
+        """
+
+        with open(filename) as myFile:
+            header = myFile.readline()
+
+        return dict((name.strip(), index) for (index, name) in enumerate(header.split(",")))
+
+
+class StretchSenseTransportLog(object):
+    #print("\033[0;35;40m StretchSenseTransportLog()\033[0m")
+
+    """
+    Class which logs the bytes exchanged with the devices before they are decoded, so that a session can be
+    replayed byte for byte with StretchSenseAPI.replay_open(). The file starts with magic, then each record
+    is a recordStruct header (timestamp in nanoseconds, kind, device, handle, length) followed by its bytes.
+    A RAW_DEVICE record "<addr>\n<uuid>\n<gen>" is written the first time a device is logged.
+
+    :param filename: string:
+        Path of the log.
+
+    :param bufferSize: int:
+        Size in bytes of the write buffer, records reach the disk when it is full or on close().
+
+    """
+
+    magic = b"STRETCHSENSE-RAW\x01"
+    recordStruct = struct.Struct("<qBBHH")
+
+    def __init__(self, filename, bufferSize=1 << 20):
+        #print("\033[0;35;40m __init__().StretchSenseTransportLog()\033[0m")
+
+        self.filename = filename
+        self.myFile = open(filename, "wb", buffering=bufferSize)
+        self.myFile.write(self.magic)
+        self.dictDevice = {}
+        self.lock = Lock()
+
+    def write(self, kind, timestamp, addr, uuid, gen, data, handle=0):
+
+        """
+
+        Append a record to the log.
+
+        :param kind: int :
+            RAW_SPI_CONFIG, RAW_SPI_DATA or RAW_BLE_DATA.
+
+        :param timestamp: int :
+            Time in nanoseconds given by time.monotonic_ns() when the bytes have been exchanged.
+
+        :param addr: string :
+            Address of the device, the addr of its StretchSenseSpiConfiguration for the SPI bus.
+
+        :param uuid: string :
+            Service UUID of the device.
+
+        :param gen: string :
+            Generation of the device.
+
+        :param data: bytes or [int] :
+            Bytes sent or received.
+
+        :param handle: int :
+            Handle of the characteristic for BLE records.
+
+        """
+
+        with self.lock:
+
+            if self.myFile is None:
+                return
+
+            device = self.dictDevice.get(addr)
+
+            if device is None:
+                device = len(self.dictDevice)
+                self.dictDevice[addr] = device
+                description = ("%s\n%s\n%s" % (addr, uuid, gen)).encode()
+                self.myFile.write(self.recordStruct.pack(timestamp, RAW_DEVICE, device, 0, len(description)) + description)
+
+            data = bytes(data)
+            self.myFile.write(self.recordStruct.pack(timestamp, kind, device, handle, len(data)) + data)
+
+    def close(self):
+
+        """
+
+        Flush and close the log, it cannot be written anymore.
+
+        """
+
+        with self.lock:
+
+            if self.myFile is not None:
+                self.myFile.close()
+                self.myFile = None
+
+    @classmethod
+    def isTransportLog(cls, filename):
+
+        """
+
+        :param filename: string :
+            Path of a file.
+
+        :returns: bool : True if the file has been written by StretchSenseTransportLog.
+
+        """
+
+        with open(filename, "rb") as myFile:
+            return myFile.read(len(cls.magic)) == cls.magic
+
+    @classmethod
+    def read(cls, filename):
+
+        """
+
+        Read every record of a log, RAW_DEVICE records are resolved instead of returned.
+
+        :param filename: string :
+            Path of the log.
+
+        :returns: [(int, int, (string, string, string), int, bytes)] : Timestamp, kind, (addr, uuid, gen),
+            handle and bytes of each record, in the order they have been logged.
+
+        """
+
+        with open(filename, "rb") as myFile:
+            content = myFile.read()
+
+        if not content.startswith(cls.magic):
+            raise ValueError("%s is not a StretchSense transport log" % filename)
+
+        listRecord = []
+        dictDevice = {}
+        offset = len(cls.magic)
+
+        # A record cut by a crash at the end of the file is ignored
+        while offset + cls.recordStruct.size <= len(content):
+            (timestamp, kind, device, handle, length) = cls.recordStruct.unpack_from(content, offset)
+            offset += cls.recordStruct.size
+            data = content[offset:offset + length]
+            offset += length
+
+            if len(data) < length:
+                break
+
+            if kind == RAW_DEVICE:
+                dictDevice[device] = tuple(data.decode().split("\n"))
+            else:
+                listRecord.append((timestamp, kind, dictDevice[device], handle, data))
+
+        return listRecord
+
+
+class StretchSenseAPI():
+    #print("\033[0;35;40m StretchSenseAPI()\033[0m")
+
+    """
+
+    Variables : Services & Characteristics UUID
+
+    """
+
+    # The name we use to filter BLE scan results and find only StretchSense's sensors
+    deviceName = 'StretchSense'
+
+    # The UUID used to filter Bluetooth scan results and find the services from StretchSense sensors Gen 3
+    serviceUUID3 = '00001701-7374-7265-7563-6873656e7365'
+    # The UUID used to filter the device characteristics and find the "data characteristic" from StretchSense sensors Gen 3
+    dataUUID3 = '00001702-7374-7265-7563-6873656e7365'
+    # The UUID used to filter the device characteristics and find the "shutdown characteristic" from StretchSense sensors Gen 3
+    shutdownUUID3 = '00001704-7374-7265-7563-6873656e7365'
+    # The UUID used to filter the device characteristics and find the "samplingTime characteristic" from StretchSense sensors Gen 3
+    samplingTimeUUID3 = '00001705-7374-7265-7563-6873656e7365'
+    # The UUID used to filter the device characteristics and find the "average characterisitc" from StretchSense sensors Gen 3
+    averageUUID3 = '00001706-7374-7265-7563-6873656e7365'
+
+    # The UUID used to filter Bluetooth scan results and find the services from StretchSense sensors Gen 2
+    serviceUUID2 = '00001501-7374-7265-7563-6873656e7365'
+    # The UUID used to filter the device characteristics and find the "data characteristic" from StretchSense sensors Gen 2
+    dataUUID2 = '00001502-7374-7265-7563-6873656e7365'
+    # The UUID used to filter the device characteristics and find the "shutdown characteristic" from StretchSense sensors Gen 2
+    shutdownUUID2 = '00001504-7374-7265-7563-6873656e7365'
+    # The UUID used to filter the device characteristics and find the "samplingTime characteristic" from StretchSense sensors Gen 2
+    samplingTimeUUID2 = '00001505-7374-7265-7563-6873656e7365'
+    # The UUID used to filter the device characteristics and find the "average characterisitc" from StretchSense sensors Gen 2
+    averageUUID2 = '00001506-7374-7265-7563-6873656e7365'
+
+    # The UUID used to filter Bluetooth scan results and find the services from StretchSense circuit 10TT
+    serviceUUID10TT = '00601001-7374-7265-7563-6873656e7365'
+    # The UUID used to filter the device characteristics and find the "data characteristic" from StretchSense circuit 10TT
+    dataUUID10TT = '00601002-7374-7265-7563-6873656e7365'
+
+    """
+
+    Variables : Set sensors & info
+
+    """
+    # Number of data samples within the filtering array
+
+    numberOfSample = 30
+
+    # Initialisation value of the sampling time value (SamplingTime = (value +1)*40ms)
+
+    samplingTimeNumber = 0
+
+    # Sized of the filter based on the number of samples
+
+    filteringNumber = 0
+
+    # Time in milliseconds waited for the interrupt pin of the 16FGV1.0 before reading anyway
+
+    interruptTimeout = 100
+
+    # Time in seconds given to the 16FGV1.0 to sample after a trigger
+
+    triggerTime = 0.1
+
+    # Frequency in Hz of each output data rate of the 16FGV1.0
+
+    dictOutputDataRate = {RATE_25HZ: 25, RATE_50HZ: 50, RATE_100HZ: 100, RATE_166HZ: 166, RATE_200HZ: 200,
+                          RATE_250HZ: 250, RATE_500HZ: 500, RATE_1KHZ: 1000}
+
+    # Replay : longest time in seconds replay_mode() waits for the next frame, and number of rows replayed
+    # by each call when replaying as fast as possible
+
+    replayWaitTime = 0.01
+    replayChunk = 256
+
+    # Maximum number of frames kept while nobody reads them with getFrames()
+
+    numberOfFrameQueued = 4096
+
+    # Time in seconds waited for a notification on each device by ble_waitNotifications()
+
+    notificationWaitTime = 0.001
+
+    # Time in seconds without notification after which a device is read with readCharacteristic() instead
+
+    notificationTimeout = 1.0
+
+    # Time in seconds spent in each scanner.process() call of the continuous scan, bounds the time to stop it
+
+    scanProcessTime = 0.2
+
+    def __init__(self, scanConfiguration=None, listHci=None, spiConfiguration=None):
+        #print("\033[0;35;40m __init__().StretchSenseAPI()\033[0m")
+
+        # The lists of peripherals belong to each instance, so several circuits each have their own channels
+
+        # This is the list of peripherals we are using for the SPI
+        self.listPeripheralSpi = [StretchSensePeripheral()]
+
+        # This is the list of peripherals we are using to connect to the BLE
+        self.listPeripheralInUse = [btle.Peripheral()]
+
+        # This is the list of StretchSense Bluetooth peripherals detected by the Raspberry Pi during a scan event
+        self.listPeripheralAvailable = [StretchSensePeripheral()]
+
+        # This is the list of StretchSense Bluetooth peripherals which are connected to the Raspberry Pi after being scanned
+        self.listPeripheralIsConnected = [StretchSensePeripheral()]
+
+        # This is the list of StretchSense Bluetooth peripherals which are saved to the Raspberry Pi after being connected once
+        self.listPeripheralIsOnceConnected = [StretchSensePeripheral()]
+
+        # Settings used by ble_scanning() and ble_startContinuousScanning()
+        if scanConfiguration is None:
+            scanConfiguration = StretchSenseScanConfiguration(deviceName=self.deviceName)
+        self.scanConfiguration = scanConfiguration
+
+        # HCI adapters used to connect the devices, the scanning adapter only by default
+        if listHci is None:
+            listHci = [self.scanConfiguration.hci]
+        self.adapterManager = StretchSenseAdapterManager(listHci)
+
+        # Frames produced by the SPI and BLE transports, oldest first
+        self.listFrames = collections.deque(maxlen=self.numberOfFrameQueued)
+
+        # Stages applied in order to the frames returned by getFrames()
+        self.listProcessingStages = []
+
+        # Frames expected and received from each device
+        self.lossTracker = StretchSenseLossTracker()
+
+        # Raw transfers logged by startTransportLog()
+        self.transportLog = None
+
+        # Recording replayed by replay_mode()
+        self.replay_close()
+
+        # Wall clock and monotonic clock read at the same time, to convert the timestamps of the frames
+        self.timeAnchor = (time.time_ns(), time.monotonic_ns())
+        self.spiTimestamp = 0
+
+        # Wiring and settings of the 16FGV1.0, replaced as a whole by spi_reconfigure()
+        if spiConfiguration is None:
+            spiConfiguration = StretchSenseSpiConfiguration()
+        self.spiConfiguration = spiConfiguration
+
+        # Held while the SPI bus is read or configured, counts the configurations written
+        self.spiLock = Lock()
+        self.spiConfigEpoch = 0
+
+        # End time and number of frames still unsettled after the last configuration, see spi_getSettling(),
+        # and scale of the samples taken before it
+        self.spiSettling = [0, 0]
+        self.spiPreviousScalingFactor = 0
+
+        # Resolution switched after each sample by spi_autoRange(), see spi_enableAutoRange()
+        self.autoRange = False
+        self.autoRangeHigh = 0.9
+        self.autoRangeLow = 0.08
+        self.autoRangeHoldTime = 0.5
+        self.autoRangeModes = (RESOLUTION_1pF, RESOLUTION_1fF)
+        self.autoRangeSince = None
+
+        # StretchSense devices discovered while scanning, keyed by Mac Address
+        self.dictPeripheralAvailable = {}
+        self.scanLock = Lock()
+
+        # Background scanning
+        self.scanThread = None
+        self.scanRunning = False
+
+    """
+
+    Bluepy buffer Scanning class.
+
+    """
+
+    class ScanPrint(btle.DefaultDelegate):
+        #print("\033[0;33;40m ScanPrint()\033[0m")
+
+        # Advertising data types holding the local name and the service UUIDs of a device
+        localNameTypes = (0x08, 0x09)
+        serviceUUIDTypes = (0x02, 0x03, 0x04, 0x05, 0x06, 0x07)
+
+        def __init__(self, scanConfiguration, api=None, callback=None):
+            #print("\033[0;33;40m __init__().ScanPrint()\033[0m")
+            btle.DefaultDelegate.__init__(self)
+            self.scanConfiguration = scanConfiguration
+            self.api = api
+            self.callback = callback
+
+        def handleDiscovery(self, dev, isNewDev, isNewData):
+            #print("\033[0;33;40m handleDiscovery()\033[0m")
+
+            if isNewDev:
+                pass
+            elif isNewData:
+                if self.scanConfiguration.duplicates == SCAN_NEW:
+                    return
+            else:
+                if self.scanConfiguration.duplicates != SCAN_ALL:
+                    return
+
+            if self.isStretchSenseDevice(dev) is False:
+                return
+
+            if self.api is None:
+                return
+
+            isNewPeripheral = self.api.ble_addPeripheralAvailable(dev)
+
+            if self.callback is not None:
+                self.callback(dev, isNewPeripheral)
+
+        def isStretchSenseDevice(self, dev):
+            #print("\033[0;33;40m isStretchSenseDevice()\033[0m")
+
+            if dev.rssi < self.scanConfiguration.sensitivity:
+                return False
+
+            if not dev.scanData:
+                return False
+
+            nameMatch = self.scanConfiguration.deviceName is None
+            uuidMatch = not self.scanConfiguration.serviceUUIDs
+
+            for (sdid, desc, val) in dev.getScanData():
+
+                if sdid in self.localNameTypes:
+                    if val == self.scanConfiguration.deviceName:
+                        nameMatch = True
+
+                elif sdid in self.serviceUUIDTypes:
+                    for uuid in val.lower().split(','):
+                        if uuid.strip() in self.scanConfiguration.serviceUUIDs:
+                            uuidMatch = True
+
+            return nameMatch and uuidMatch
+
+    """
+
+    Serial Peripheral Interface Functions
+
+    """
+
+    def spi_generateTenChannel(self, addr=None, listPeripheral=None):
+        #print("\033[0;35;40m spi_generateTenChannel()\033[0m")
+
+        """
+        This function generate ten peripheral type StretchSensePeripheral used for the SPI.
+
+        :param addr: string :
+            Address of the channels, the one of spiConfiguration if omitted.
+
+        :param listPeripheral: [StretchSensePeripheral] :
+            List receiving the channels, listPeripheralSpi if omitted.
+
+        """
+
+        if addr is None:
+            addr = self.spiConfiguration.addr
+
+        if listPeripheral is None:
+            listPeripheral = self.listPeripheralSpi
+
+        newSensor1 = StretchSensePeripheral()
+        newSensor1.addr = addr
+        newSensor1.uuid = self.serviceUUID3
+        newSensor1.value = 0
+        newSensor1.gen = 3
+        newSensor1.channelNumber = 0
+
+        newSensor2 = StretchSensePeripheral()
+        newSensor2.addr = addr
+        newSensor2.uuid = self.serviceUUID3
+        newSensor2.value = 0
+        newSensor2.gen = 3
+        newSensor2.channelNumber = 1
+
+        newSensor3 = StretchSensePeripheral()
+        newSensor3.addr = addr
+        newSensor3.uuid = self.serviceUUID3
+        newSensor3.value = 0
+        newSensor3.gen = 3
+        newSensor3.channelNumber = 2
+
+        newSensor4 = StretchSensePeripheral()
+        newSensor4.addr = addr
+        newSensor4.uuid = self.serviceUUID3
+        newSensor4.value = 0
+        newSensor4.gen = 3
+        newSensor4.channelNumber = 3
+
+        newSensor5 = StretchSensePeripheral()
+        newSensor5.addr = addr
+        newSensor5.uuid = self.serviceUUID3
+        newSensor5.value = 0
+        newSensor5.gen = 3
+        newSensor5.channelNumber = 4
+
+        newSensor6 = StretchSensePeripheral()
+        newSensor6.addr = addr
+        newSensor6.uuid = self.serviceUUID3
+        newSensor6.value = 0
+        newSensor6.gen = 3
+        newSensor6.channelNumber = 5
+
+        newSensor7 = StretchSensePeripheral()
+        newSensor7.addr = addr
+        newSensor7.uuid = self.serviceUUID3
+        newSensor7.value = 0
+        newSensor7.gen = 3
+        newSensor7.channelNumber = 6
+
+        newSensor8 = StretchSensePeripheral()
+        newSensor8.addr = addr
+        newSensor8.uuid = self.serviceUUID3
+        newSensor8.value = 0
+        newSensor8.gen = 3
+        newSensor8.channelNumber = 7
+
+        newSensor9 = StretchSensePeripheral()
+        newSensor9.addr = addr
+        newSensor9.uuid = self.serviceUUID3
+        newSensor9.value = 0
+        newSensor9.gen = 3
+        newSensor9.channelNumber = 8
+
+        newSensor10 = StretchSensePeripheral()
+        newSensor10.addr = addr
+        newSensor10.uuid = self.serviceUUID3
+        newSensor10.value = 0
+        newSensor10.gen = 3
+        newSensor10.channelNumber = 9
+
+        listPeripheral.append(newSensor1)
+        listPeripheral.append(newSensor2)
+        listPeripheral.append(newSensor3)
+        listPeripheral.append(newSensor4)
+        listPeripheral.append(newSensor5)
+        listPeripheral.append(newSensor6)
+        listPeripheral.append(newSensor7)
+        listPeripheral.append(newSensor8)
+        listPeripheral.append(newSensor9)
+        listPeripheral.append(newSensor10)
+
+    def spi_setup(self):
+        #print("\033[0;33;40m spi_setup()\033[0m")
+
+        """
+
+        Start the setup of the SPI communication, once the sample being read by spi_mode() is done.
+
+        """
+
+        with self.spiLock:
+            self.spi_setupLocked()
+
+    def spi_setupLocked(self):
+        #print("\033[0;33;40m spi_setupLocked()\033[0m")
+
+        """
+
+        Set the SPI communication up, spiLock must be held by the caller.
+
+        """
+
+        configuration = self.spiConfiguration
+
+        # Creating a new setup requires get rid of the old one
+        del self.listPeripheralSpi[0:]
+
+        if getattr(self, 'myDevice', None) is not None:
+            self.myDevice.close()
+
+        # Initialise SPI & GPIO ports
+        self.myDevice = spidev.SpiDev()
+        self.myDevice.open(configuration.bus, configuration.device)
+        self.myDevice.max_speed_hz = configuration.maxSpeedHz
+        self.myDevice.mode = 1
+        self.myDevice.lsbfirst = False
+
+        self.capacitanceScalingFactor = 100
+        self.rawData = [0] * 20
+        self.spi_generateTenChannel()
+
+        # Initialise the data ready and chip enable pins
+        GPIO.setup(configuration.interruptPin, GPIO.IN)
+        GPIO.setup(configuration.cePin, GPIO.OUT, initial=GPIO.HIGH)
+        GPIO.setup(configuration.triggerPin, GPIO.OUT)
+
+        # Configure 16FGV1.0
+        self.spi_writeConfiguration()
+        self.spiConfigEpoch += 1
+
+        # Give the circuit the time to set up
+        time.sleep(0.01)
+
+        # Get capacitance scaling factor
+        self.capacitanceScalingFactor = self.spi_getCapacitanceScalingFactor(configuration.resolutionMode)
+        self.spi_setLossPeriod()
+
+    def spi_setLossPeriod(self):
+        #print("\033[0;35;40m spi_setLossPeriod()\033[0m")
+
+        """
+
+        Restart the loss metrics of the SPI bus for the current configuration.
+
+        """
+
+        configuration = self.spiConfiguration
+
+        # Frames are expected at the output data rate only when the data ready interrupt paces the reads, a
+        # polled read is not a new sample so its timing says nothing about losses
+        self.lossTracker.reset(configuration.addr)
+        if configuration.triggerMode == TRIGGER_ENABLED or configuration.odrMode not in self.dictOutputDataRate:
+            self.lossTracker.setPeriod(configuration.addr, None)
+        elif configuration.interruptMode != INTERRUPT_ENABLED:
+            self.lossTracker.setPeriod(configuration.addr, 0)
+        else:
+            self.lossTracker.setPeriod(configuration.addr, 1.0 / self.dictOutputDataRate[configuration.odrMode])
+
+    def spi_reconfigure(self, odrMode=None, interruptMode=None, triggerMode=None, filterMode=None, resolutionMode=None,
+                        configuration=None):
+        #print("\033[0;35;40m spi_reconfigure()\033[0m")
+
+        """
+
+        Change the configuration of the 16FGV1.0 while it is streaming, with a single transfer on the bus
+        already set up instead of spi_setup(). The transfer waits for the sample being read by spi_mode(),
+        the frames sampled afterwards have a new configEpoch. A configuration with a different wiring sets
+        the bus up again. Settings left to None are not changed.
+
+        :param odrMode: int :
+            New output data rate.
+
+        :param interruptMode: int :
+            New interrupt mode.
+
+        :param triggerMode: int :
+            New trigger mode.
+
+        :param filterMode: int :
+            New filter.
+
+        :param resolutionMode: int :
+            New resolution.
+
+        :param configuration: StretchSenseSpiConfiguration :
+            New configuration, the current one if omitted, the settings above are changed in a copy of it.
+
+        """
+
+        with self.spiLock:
+
+            if configuration is None:
+                configuration = self.spiConfiguration
+
+            configuration = configuration.copy(odrMode=odrMode, interruptMode=interruptMode, triggerMode=triggerMode,
+                                               filterMode=filterMode, resolutionMode=resolutionMode)
+            self.spi_reconfigureLocked(configuration)
+
+    def spi_reconfigureLocked(self, configuration):
+        #print("\033[0;35;40m spi_reconfigureLocked()\033[0m")
+
+        """
+
+        Apply a new configuration, spiLock must be held by the caller.
+
+        :param configuration: StretchSenseSpiConfiguration :
+            New configuration.
+
+        """
+
+        # Nothing to reconfigure yet or another bus, the whole setup is needed
+        if not hasattr(self, 'myDevice') or configuration.getWiring() != self.spiConfiguration.getWiring():
+            self.spiConfiguration = configuration
+            self.spi_setupLocked()
+            return
+
+        previous = self.spiConfiguration
+        self.spiConfiguration = configuration
+        for myPeripheral in self.listPeripheralSpi:
+            if myPeripheral.addr != '':
+                myPeripheral.addr = configuration.addr
+
+        self.spi_writeConfiguration()
+        self.spiPreviousScalingFactor = self.capacitanceScalingFactor
+        self.capacitanceScalingFactor = self.spi_getCapacitanceScalingFactor(configuration.resolutionMode)
+        self.spiConfigEpoch += 1
+
+        # The loss metrics only restart when the frames are expected at another rate
+        if ((configuration.addr, configuration.odrMode, configuration.interruptMode, configuration.triggerMode) !=
+                (previous.addr, previous.odrMode, previous.interruptMode, previous.triggerMode)):
+            self.spi_setLossPeriod()
+
+    def spi_loadConfiguration(self, filename):
+        #print("\033[0;35;40m spi_loadConfiguration()\033[0m")
+
+        """
+
+        Apply a configuration file with spi_reconfigure(), the acquisition does not need to be stopped.
+
+        :param filename: string :
+            Path of a file read by StretchSenseSpiConfiguration.load().
+
+        :returns: StretchSenseSpiConfiguration : The configuration applied.
+
+        """
+
+        self.spi_reconfigure(configuration=StretchSenseSpiConfiguration.load(filename))
+        return self.spiConfiguration
+
+    def spi_enableAutoRange(self, highLevel=0.9, lowLevel=0.08, holdTime=0.5, minResolutionMode=RESOLUTION_1pF,
+                            maxResolutionMode=RESOLUTION_1fF):
+        #print("\033[0;35;40m spi_enableAutoRange()\033[0m")
+
+        """
+
+        Let spi_mode() choose the resolution of the 16FGV1.0. Levels are fractions of the 16 bit range used by
+        the highest channel. The next coarser resolution is written as soon as a sample reaches highLevel, and
+        the next finer one once every sample stayed below lowLevel for holdTime seconds. A resolution step is
+        a factor 10, lowLevel must stay below highLevel / 10 so that a switch never calls for the opposite one.
+        Frames give the scalingFactor of their values, the values stay in pF across switches. The frame which
+        reaches the top of the range is marked saturated, and the frames are marked not settled until the filter
+        only holds samples of the new resolution.
+
+        :param highLevel: float :
+            Level switching to a coarser resolution.
+
+        :param lowLevel: float :
+            Level switching to a finer resolution.
+
+        :param holdTime: float :
+            Time in seconds the values must stay below lowLevel.
+
+        :param minResolutionMode: int :
+            Coarsest resolution used, one of the RESOLUTION_* constants.
+
+        :param maxResolutionMode: int :
+            Finest resolution used, one of the RESOLUTION_* constants.
+
+        """
+
+        if not 0 < lowLevel * 10 < highLevel <= 1:
+            raise ValueError("lowLevel must be below highLevel / 10 and highLevel at most 1")
+
+        with self.spiLock:
+            self.autoRangeHigh = highLevel
+            self.autoRangeLow = lowLevel
+            self.autoRangeHoldTime = holdTime
+            self.autoRangeModes = (minResolutionMode, maxResolutionMode)
+            self.autoRangeSince = None
+            self.autoRange = True
+
+    def spi_disableAutoRange(self):
+        #print("\033[0;35;40m spi_disableAutoRange()\033[0m")
+
+        """
+
+        Stop changing the resolution, the resolution in use is kept.
+
+        """
+
+        self.autoRange = False
+
+    def spi_autoRange(self, frame):
+        #print("\033[0;35;40m spi_autoRange()\033[0m")
+
+        """
+
+        Write a coarser or finer resolution if the frame is too close to the limits of the range, called by
+        spi_mode() with spiLock held after each sample when spi_enableAutoRange() has been called. Frames which
+        are not settled are ignored, unless they reach highLevel after a switch to a finer resolution.
+
+        :param frame: StretchSenseFrame :
+            Last frame of the 16FGV1.0.
+
+        """
+
+        if len(frame.values) == 0:
+            return
+
+        configuration = self.spiConfiguration
+        (minResolutionMode, maxResolutionMode) = self.autoRangeModes
+        level = max(frame.values) * frame.scalingFactor / 65535.0
+
+        # Samples of a finer previous resolution still in the filter raise the level, those of a coarser one
+        # lower it, so only a high level after a switch to a finer resolution can be trusted
+        if not frame.settled and (level < self.autoRangeHigh or self.spiPreviousScalingFactor > frame.scalingFactor):
+            return
+
+        if level >= self.autoRangeHigh:
+            self.autoRangeSince = None
+            if configuration.resolutionMode > minResolutionMode:
+                self.spi_reconfigureLocked(configuration.copy(resolutionMode=configuration.resolutionMode - 1))
+
+        elif level < self.autoRangeLow and configuration.resolutionMode < maxResolutionMode:
+            if self.autoRangeSince is None:
+                self.autoRangeSince = frame.timestamp
+            elif frame.timestamp - self.autoRangeSince >= self.autoRangeHoldTime * 1e9:
+                self.autoRangeSince = None
+                self.spi_reconfigureLocked(configuration.copy(resolutionMode=configuration.resolutionMode + 1))
+
+        else:
+            self.autoRangeSince = None
+
+    def spi_mode(self):
+        #print("spi_mode()")
+
+        """
+
+        This function is called before using the SPI transmission, it verify which mode we are using.
+        In trigger mode spiLock is released while the circuit samples, so the bus can be reconfigured meanwhile.
+
+        """
+        with self.spiLock:
+            configuration = self.spiConfiguration
+            if (configuration.interruptMode == INTERRUPT_DISABLED and configuration.triggerMode == TRIGGER_DISABLED):
+                self.spi_continuousModeCapacitance()
+                return
+            elif (configuration.interruptMode == INTERRUPT_ENABLED and configuration.triggerMode == TRIGGER_DISABLED):
+                self.spi_continuousModeCapacitance()
+                return
+            elif (configuration.interruptMode == INTERRUPT_DISABLED and configuration.triggerMode == TRIGGER_ENABLED):
+                self.spi_triggerSample()
+                configEpoch = self.spiConfigEpoch
+            else:
+                return
+
+        # Allow the circuit to start a sample
+        time.sleep(self.triggerTime)
+
+        with self.spiLock:
+            # A sample triggered before a new configuration is not read
+            if self.spiConfigEpoch == configEpoch:
+                self.spi_readTriggeredCapacitance()
+
+    def spi_triggerModeCapacitance(self):
+        #print("\033[0;35;40m spi_triggerModeCapacitance()\033[0m")
+
+        """
+
+        When TRIGGER is enable we use this SPI function.
+
+        """
+
+        self.spi_triggerSample()
+
+        # Allow the circuit to start a sample
+
+        time.sleep(self.triggerTime)
+
+        self.spi_readTriggeredCapacitance()
+
+    def spi_triggerSample(self):
+        #print("\033[0;35;40m spi_triggerSample()\033[0m")
+
+        """
+
+        Pulse the trigger pin so the 16FGV1.0 starts a sample.
+
+        """
+
+        # Trigger a sample to begin
+        GPIO.output(self.spiConfiguration.triggerPin, GPIO.HIGH)
+        GPIO.output(self.spiConfiguration.triggerPin, GPIO.LOW)
+
+    def spi_readTriggeredCapacitance(self):
+        #print("\033[0;35;40m spi_readTriggeredCapacitance()\033[0m")
+
+        """
+
+        Read the sample started by spi_triggerSample() and queue its frame.
+
+        """
+
+        # Read the sensor data
+        self.readData = self.spi_readCapacitance()
+
+        # Convert the raw data to capacitance
+        for i in range(10):
+            self.spi_extractCapacitance(self.readData, i)
+
+        frame = self.spi_generateFrame()
+        self.pushFrame(frame)
+
+        # Change the resolution of the next samples when the values get close to the limits of the range
+        if self.autoRange:
+            self.spi_autoRange(frame)
+
+    def spi_continuousModeCapacitance(self):
+        #print("\033[0;35;40m spi_continuousModeCapacitance()\033[0m")
+
+        """
+
+        When INTERRUPT is enable or in continuous mode we use this SPI function.
+
+        """
+
+        configuration = self.spiConfiguration
+
+        # Check if the interrupt mode is enabled (in configuration)
+        if (configuration.interruptMode == INTERRUPT_ENABLED):
+            # Don't do anything until the interrupt goes low, without holding the processor
+            if (GPIO.input(configuration.interruptPin) == GPIO.HIGH):
+                GPIO.wait_for_edge(configuration.interruptPin, GPIO.FALLING, timeout=self.interruptTimeout)
+
+        self.readData = self.spi_readCapacitance()
+
+        # Convert the raw data to capacitance
+        for i in range(10):
+            self.spi_extractCapacitance(self.readData, i)
+
+        frame = self.spi_generateFrame()
+        self.pushFrame(frame)
+
+        # Change the resolution of the next samples when the values get close to the limits of the range
+        if self.autoRange:
+            self.spi_autoRange(frame)
+
+        # Wait for the next data packet to start sampling
+        if(configuration.interruptMode == INTERRUPT_ENABLED):
+            # Don't do anything until the interrupt goes high
+            if (GPIO.input(configuration.interruptPin) == GPIO.LOW):
+                GPIO.wait_for_edge(configuration.interruptPin, GPIO.RISING, timeout=self.interruptTimeout)
+
+    def spi_writeConfiguration(self):
+        #print("\033[0;35;40m spi_writeConfiguration()\033[0m")
+
+        """
+
+        Function called in spi_setup() to write the configuration on the SPI bus.
+
+        """
+
+    # 16FGV1.0 requires a configuration package to start streaming the data
+
+        # Set the chip select to low to select device
+        GPIO.output(self.spiConfiguration.cePin, GPIO.LOW)
+
+        # Select configure package and sets it
+        packet = self.spi_getConfigurationPacket()
+        self.myDevice.xfer2(list(packet))
+        self.spiSettling = self.spi_getSettling(self.spiConfiguration, time.monotonic_ns())
+
+        if self.transportLog is not None:
+            self.transportLog.write(RAW_SPI_CONFIG, time.monotonic_ns(), self.spiConfiguration.addr, self.serviceUUID3, 3, packet)
+
+        # Take the chip select to high to de-select
+        GPIO.output(self.spiConfiguration.cePin, GPIO.HIGH)
+
+    def spi_getConfigurationPacket(self):
+        #print("\033[0;35;40m spi_getConfigurationPacket()\033[0m")
+
+        """
+
+        :returns: [int] : Configuration package written by spi_writeConfiguration().
+
+        """
+
+        return self.spiConfiguration.toPacket()
+
+    def spi_readCapacitance(self):
+        #print("\033[0;35;40m spi_readCapacitance()\033[0m")
+
+        """
+
+        Function which read the capacitance in hexadecimal in the SPI bus.
+
+        :returns: int :
+            raw sensing from the 16FGV1.0
+
+        """
+
+    # 16FGV1.0 transmits data in the form of 10, 16bit capacitance values
+
+        # Set the chip select to low to select the device
+        GPIO.output(self.spiConfiguration.cePin, GPIO.LOW)
+
+        # Select Data package to return values
+        raw = self.myDevice.xfer2([DATA, PADDING, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0])
+        self.spiTimestamp = time.monotonic_ns()
+
+        if self.transportLog is not None:
+            self.transportLog.write(RAW_SPI_DATA, self.spiTimestamp, self.spiConfiguration.addr, self.serviceUUID3, 3, raw)
+
+        del raw[:2]
+        return raw
+
+        #Take the chip select to high to de-select
+        GPIO.output(self.spiConfiguration.cePin, GPIO.HIGH)
+
+    def spi_getCapacitanceScalingFactor(self, resolutionConfig):
+        #print("\033[0;33;40m spi_getCapacitanceScalingFactor()\033[0m")
+
+        """
+
+        The 16FGV1.0 has an adjustable LSB resolution this function scales raw data to capacitance based on
+        the configuration.
+
+        :param resolutionConfig: int :
+            Resolution set on the SPI bus during spi_writeConfiguration.
+
+        :returns: int :
+            The scale of the resolution.
+
+        """
+
+        if resolutionConfig == RESOLUTION_1pF:
+            return 1
+
+        elif resolutionConfig == RESOLUTION_100fF:
+            return 10
+
+        elif resolutionConfig == RESOLUTION_10fF:
+            return 100
+
+        elif resolutionConfig == RESOLUTION_1fF:
+            return 1000
+
+        return 1
+
+    def spi_extractCapacitance(self, raw, channel):
+        #print("\033[0;35;40m spi_extractCapacitance()\033[0m")
+
+        """
+
+        Does the conversion of the raw value received by the 16FGV1.0 into a decimal value.
+
+        :param raw: int :
+            Raw is the raw value that we read on the SPI bus.
+        :param channel: int :
+            Number from 0 to 9 corresponding of the channel number to convert the raw value.
+
+        """
+
+        capacitance = 0.0
+        numberOfSpiPeripheral = len(self.listPeripheralSpi)
+        if numberOfSpiPeripheral > 0:
+
+            for myPeripheral in self.listPeripheralSpi:
+
+                if channel == myPeripheral.channelNumber:
+                    capacitance = self.spi_decodeCapacitance(raw, channel, self.capacitanceScalingFactor)
+                    myPeripheral.value = capacitance
+                    #print("MainmyPeripheral.value = ", myPeripheral.value)
+
+    def spi_decodeCapacitance(self, raw, channel, scalingFactor):
+        #print("\033[0;35;40m spi_decodeCapacitance()\033[0m")
+
+        """
+
+        Convert the raw value of one channel read on the SPI bus into a capacitance.
+
+        :param raw: [int] :
+            Bytes of the data package, without its two first bytes.
+
+        :param channel: int :
+            Number from 0 to 9 of the channel.
+
+        :param scalingFactor: int :
+            Scale of the resolution in use, given by spi_getCapacitanceScalingFactor().
+
+        :returns: float : Capacitance of the channel.
+
+        """
+
+        return (raw[2 * channel] * 256 + raw[2 * channel + 1]) / scalingFactor
+
+    def spi_generateFrame(self):
+        #print("\033[0;35;40m spi_generateFrame()\033[0m")
+
+        """
+
+        Gather the last values of the ten SPI channels into a single frame.
+
+        :returns: StretchSenseFrame :
+            Frame holding the current value of each channel of the 16FGV1.0.
+
+        """
+
+        frame = StretchSenseFrame()
+        frame.addr = self.spiConfiguration.addr
+        frame.gen = 3
+        frame.timestamp = self.spiTimestamp
+        frame.configEpoch = self.spiConfigEpoch
+        frame.scalingFactor = self.capacitanceScalingFactor
+        frame.values = [myPeripheral.value for myPeripheral in self.listPeripheralSpi if myPeripheral.addr != '']
+        self.spi_flagFrame(frame, self.spiSettling)
+
+        return frame
+
+    def spi_getFilterTiming(self, filterMode, rate):
+        #print("\033[0;35;40m spi_getFilterTiming()\033[0m")
+
+        """
+
+        Timing of the moving average filter of the 16FGV1.0, which averages max(filterMode, 1) samples. After a
+        configuration is written the filter holds samples taken with the previous one until it has been
+        filled again, plus the sample being converted. The group delay is half the length of the filter plus
+        one sample period.
+
+        :param filterMode: int :
+            Filter, one of the FILTER_* constants.
+
+        :param rate: float :
+            Number of samples per second, 0 if unknown.
+
+        :returns: [int, float, float] : Number of samples until the filter only holds new samples, the time
+            they take in seconds, and the group delay in seconds, 0.0 and infinite when the rate is unknown.
+
+        """
+
+        filterLength = max(filterMode, 1)
+        numberOfSamples = filterLength + 1
+
+        if not rate:
+            return [numberOfSamples, 0.0, float("inf")]
+
+        return [numberOfSamples, numberOfSamples / float(rate), ((filterLength - 1) / 2.0 + 1) / rate]
+
+    def spi_getSettling(self, configuration, timestamp):
+        #print("\033[0;35;40m spi_getSettling()\033[0m")
+
+        """
+
+        Frames of the 16FGV1.0 which are not settled after a configuration is written, as given by
+        spi_getFilterTiming() at the nominal output data rate.
+
+        :param configuration: StretchSenseSpiConfiguration :
+            Configuration written.
+
+        :param timestamp: int :
+            Time in nanoseconds given by time.monotonic_ns() when it has been written.
+
+        :returns: [int, int] : Time in nanoseconds until which, and number of frames for which, the frames
+            are not settled, given to spi_flagFrame().
+
+        """
+
+        (numberOfSamples, settleTime, groupDelay) = self.spi_getFilterTiming(configuration.filterMode,
+                                                                             self.dictOutputDataRate.get(configuration.odrMode, 0))
+
+        return [timestamp + int(settleTime * 1e9), numberOfSamples]
+
+    def spi_flagFrame(self, frame, settling):
+        #print("\033[0;35;40m spi_flagFrame()\033[0m")
+
+        """
+
+        Set saturated and settled of a frame of the 16FGV1.0. A frame is settled once both the time and the
+        number of frames given by spi_getSettling() are over, the bus can be polled faster than the output
+        data rate and triggers can be slower.
+
+        :param frame: StretchSenseFrame :
+            Frame with its values, timestamp and scalingFactor.
+
+        :param settling: [int, int] :
+            Given by spi_getSettling(), its number of frames is decreased.
+
+        """
+
+        if frame.values:
+            frame.saturated = int(round(max(frame.values) * frame.scalingFactor)) >= 65535
+
+        if settling[1] > 0 or frame.timestamp < settling[0]:
+            frame.settled = False
+            settling[1] = max(settling[1] - 1, 0)
+
+    def spi_listToCsv(self):
+        #print("\033[0;35;40m spi_listToCsv()\033[0m")
+
+        """
+
+        Display the values in a csv format in the terminal.
+
+        """
+
+        listToCsv = ""
+        numberOfSpiPeripheralConnected = len(self.listPeripheralSpi) - 1
+
+        if numberOfSpiPeripheralConnected > 0:
+
+            for myPeripheral in self.listPeripheralSpi:
+                listToCsv += ("%s ," % myPeripheral.value)
+
+        print("\n")
+        print(listToCsv)
+
+    def spi_getValuesCsv(self):
+        #print("\033[0;35;40m spi_getValuesCsv()\033[0m")
+
+        """
+
+        Return the values in a csv format.
+
+        :returns: string :
+            16FGV1.0 values in a csv format.
+
+        """
+
+        listToReturn = ""
+        numberOfSpiPeripheralConnected = len(self.listPeripheralSpi) - 1
+
+        if numberOfSpiPeripheralConnected > 0:
+
+            for myPeripheral in self.listPeripheralSpi:
+                listToReturn += ("%s ," % myPeripheral.value)
+
+        return listToReturn
+
+    def spi_getListPeripheral(self):
+        #print("\033[0;35;40m spi_getListPeripheral()\033[0m")
+
+        """
+
+        Return a list of all peripheral created by spi_generateTenChannel().
+
+        :returns: list :
+            List containing all the information of each SPI peripheral connected.
+
+        """
+
+        return self.listPeripheralSpi
+
+    def spi_close(self):
+        #print("\033[0;35;40m spi_close()\033[0m")
+
+        """
+
+        Close the SPI transmission.
+
+        """
+
+        self.myDevice.close()
+
+    """
+
+    Functions : Scan, Print, Connect/Disconnect & Update
+
+    """
+
+    def ble_printAllPeripheralsAvailable(self):
+        #print("\033[0;35;40m ble_printAllPeripheralsAvailable()\033[0m")
+
+        """
+
+        Display all the StretchSense's device addresses available around.
+
+
+        """
+
+        numberOfPeripheralAvailable = len(self.listPeripheralAvailable) - 1
+
+        if (numberOfPeripheralAvailable == 0):
+            return print("No devices available")
+
+        elif numberOfPeripheralAvailable >= 1:
+
+            print("Number of StretchSense devices detected : ", numberOfPeripheralAvailable)
+
+            for myPeripheralAvailable in self.listPeripheralAvailable:
+
+                if myPeripheralAvailable.addr != '':
+                    print("StretchSense device : %s\n" % (myPeripheralAvailable.addr))
+
+    def ble_printAllPeripheralsConnected(self):
+        #print("\033[0;35;40m ble_printAllPeripheralsConnected()\033[0m")
+
+        """
+        Display all the StretchSense's device addresses connected.
+
+        """
+
+        numberOfPeripheralConnected = len(self.listPeripheralIsConnected) - 1
+
+        if (numberOfPeripheralConnected == 0):
+            return print("No sensors connected")
+
+        elif numberOfPeripheralConnected >= 1:
+
+            for myPeripheralConnected in self.listPeripheralIsConnected:
+
+                if myPeripheralConnected.addr != '':
+                    print("StretchSense Sensor Connected : %s\n" % (myPeripheralConnected.addr))
+
+    def ble_scanning(self, scanTime):
+        #print("\033[0;35;40m ble_scanning()\033[0m")
+
+        """
+
+        Scan for StretchSense devices in the area and store them in listPeripheralAvailable. When several
+        adapters are used they all scan at the same time, so that the RSSI of each device is known on each
+        adapter.
+
+        :param scanTime: int :
+            Time to scan for.
+
+        """
+
+        listHci = self.adapterManager.listHci
+
+        if self.scanConfiguration.hci not in listHci:
+            listHci = [self.scanConfiguration.hci] + listHci
+
+        scanners = [btle.Scanner(hci).withDelegate(self.ScanPrint(self.scanConfiguration, self)) for hci in listHci]
+
+        if len(scanners) == 1:
+            scanners[0].scan(scanTime)
+        else:
+            with ThreadPoolExecutor(max_workers=len(scanners)) as executor:
+                list(executor.map(lambda scanner: scanner.scan(scanTime), scanners))
+
+        self.listPeripheralInUse = []
+
+    def ble_addPeripheralAvailable(self, device):
+        #print("\033[0;35;40m ble_addPeripheralAvailable()\033[0m")
+
+        """
+
+        Store a StretchSense device seen during a scan in listPeripheralAvailable, once per Mac Address.
+        A device seen again replaces the previous entry so its RSSI stays up to date.
+
+        :param device: ScanEntry :
+            Device reported by the bluepy scanner.
+
+        :returns: bool : True if the device was not available yet.
+
+        """
+
+        self.adapterManager.setRssi(device.addr, getattr(device, 'iface', self.scanConfiguration.hci), device.rssi)
+
+        with self.scanLock:
+            previousDevice = self.dictPeripheralAvailable.get(device.addr)
+            self.dictPeripheralAvailable[device.addr] = device
+
+            if previousDevice is None:
+                self.listPeripheralAvailable.append(device)
+                return True
+
+            if previousDevice is not device:
+                index = self.listPeripheralAvailable.index(previousDevice)
+                self.listPeripheralAvailable[index] = device
+            return False
+
+    def ble_getRssiPeripheralAvailable(self):
+        #print("\033[0;35;40m ble_getRssiPeripheralAvailable()\033[0m")
+
+        """
+
+        Returns the last signal strength received from each StretchSense device available.
+
+        :returns: {addr: int} : RSSI in dBm of each device, keyed by Mac Address.
+
+        """
+
+        with self.scanLock:
+            return dict((addr, device.rssi) for (addr, device) in self.dictPeripheralAvailable.items())
+
+    def ble_startContinuousScanning(self, callback=None):
+        #print("\033[0;35;40m ble_startContinuousScanning()\033[0m")
+
+        """
+
+        Scan for StretchSense devices in a background thread until ble_stopContinuousScanning() is called.
+        Devices are stored in listPeripheralAvailable as soon as they are discovered, and the scan can
+        run while other devices are connected.
+
+        :param callback: function :
+            Called from the scanning thread as callback(device, isNewDevice) every time a StretchSense
+            device advertises.
+
+        """
+
+        if self.scanRunning is True:
+            return
+
+        self.scanner = btle.Scanner(self.scanConfiguration.hci).withDelegate(self.ScanPrint(self.scanConfiguration, self, callback))
+        self.scanRunning = True
+        self.scanThread = Thread(target=self.ble_continuousScanning)
+        self.scanThread.daemon = True
+        self.scanThread.start()
+
+    def ble_continuousScanning(self):
+        #print("\033[0;35;40m ble_continuousScanning()\033[0m")
+
+        """
+
+        Body of the scanning thread started by ble_startContinuousScanning().
+
+        """
+
+        self.scanner.clear()
+        self.scanner.start()
+
+        try:
+            while self.scanRunning is True:
+                self.scanner.process(self.scanProcessTime)
+        finally:
+            self.scanner.stop()
+
+    def ble_stopContinuousScanning(self):
+        #print("\033[0;35;40m ble_stopContinuousScanning()\033[0m")
+
+        """
+
+        Stop the background scan started by ble_startContinuousScanning() and wait for its thread.
+
+        """
+
+        self.scanRunning = False
+
+        if self.scanThread is not None:
+            self.scanThread.join()
+            self.scanThread = None
+
+    def ble_connectOnePeripheral(self, myDeviceAddr):
+        #print("\033[0;35;40m ble_connectOnePeripheral()\033[0m")
+
+        """
+
+        Connect one StretchSense device which is available using its address, generate one or more
+        peripherals as StretchSensePeripheral and store them into listPeripheralIsConnected.
+        The peripheral is also stored in listPeripheralInUse.
+
+        :param myDeviceAddr: string :
+            Address of the device that you want to connect.
+
+        """
+
+        numberOfPeripheralAvailable = len(self.listPeripheralAvailable) - 1
+
+        if (len(self.listPeripheralIsConnected) - 1) > 0:
+            pass
+        else:
+            self.listPeripheralIsConnected = []
+
+        if numberOfPeripheralAvailable > 0:
+            for myPeripheralAvailable in self.listPeripheralAvailable:
+                if (myPeripheralAvailable.addr == myDeviceAddr):
+
+                    myPeripheralConnected = self.ble_openConnection(myPeripheralAvailable)
+                    myPeripheralConnected.setDelegate(StretchSenseDelegate(myPeripheralConnected, self))
+                    myPeripheralConnected.deviceAddr = myDeviceAddr
+                    self.listPeripheralInUse.append(myPeripheralConnected)
+                    listOfServices = sorted(myPeripheralConnected.services, key=lambda services: services.hndStart)
+
+                    for services in listOfServices:
+
+                        if services.hndStart == services.hndEnd:
+                            continue
+
+                        if services.uuid == self.serviceUUID2:
+                            myPeripheralConnected.gen = "2"
+                            myPeripheralConnected.uuid = self.serviceUUID2
+                            self.ble_generateOneChannel(myPeripheralConnected)
+                            self.ble_enableNotifications(myPeripheralConnected, services, self.dataUUID2)
+                            continue
+
+                        if services.uuid == self.serviceUUID3:
+                            myPeripheralConnected.gen = "3"
+                            myPeripheralConnected.uuid = self.serviceUUID3
+                            self.ble_generateTenChannel(myPeripheralConnected)
+                            self.ble_enableNotifications(myPeripheralConnected, services, self.dataUUID3)
+                            continue
+
+                        if services.uuid == self.serviceUUID10TT:
+                            myPeripheralConnected.gen = "10TT"
+                            myPeripheralConnected.uuid = self.serviceUUID10TT
+                            self.ble_generateTenChannel(myPeripheralConnected)
+                            self.ble_enableNotifications(myPeripheralConnected, services, self.dataUUID10TT)
+                            continue
+
+    def ble_connectAllPeripheral(self):
+        #print("\033[0;35;40m ble_connectAllPeripheral()\033[0m")
+
+        """
+
+        Connect all StretchSense devices which are available using their addresses, generate the
+        peripherals as StretchSensePeripheral and store them into listPeripheralIsConnected.
+        Peripherals are also stored in listPeripheralInUse.
+
+        """
+
+        numberOfPeripheralAvailable = len(self.listPeripheralAvailable) - 1
+        self.listPeripheralIsConnected = []
+        self.listPeripheralInUse = []
+
+        if numberOfPeripheralAvailable > 0:
+
+            for myPeripheralAvailable in self.listPeripheralAvailable:
+
+                if myPeripheralAvailable.addr != '':
+                    #print('Address we are trying to connect to : ', myPeripheralAvailable.addr)
+                    myPeripheralConnected = self.ble_openConnection(myPeripheralAvailable)
+                    myPeripheralConnected.setDelegate(StretchSenseDelegate(myPeripheralConnected, self))
+                    myPeripheralConnected.deviceAddr = myPeripheralAvailable.addr
+                    self.listPeripheralInUse.append(myPeripheralConnected)
+                    listOfServices = sorted(myPeripheralConnected.services, key=lambda services: services.hndStart)
+
+                    for services in listOfServices:
+                        if services.hndStart == services.hndEnd:
+                            continue
+
+                        if services.uuid == self.serviceUUID2:
+                            myPeripheralConnected.gen = '2'
+                            myPeripheralConnected.uuid = self.serviceUUID2
+                            self.ble_generateOneChannel(myPeripheralConnected)
+                            self.ble_enableNotifications(myPeripheralConnected, services, self.dataUUID2)
+                            continue
+
+                        if services.uuid == self.serviceUUID3:
+                            myPeripheralConnected.gen = '3'
+                            myPeripheralConnected.uuid = self.serviceUUID3
+                            self.ble_generateTenChannel(myPeripheralConnected)
+                            self.ble_enableNotifications(myPeripheralConnected, services, self.dataUUID3)
+                            continue
+
+                        if services.uuid == self.serviceUUID10TT:
+                            myPeripheralConnected.gen = '10TT'
+                            myPeripheralConnected.uuid = self.serviceUUID10TT
+                            self.ble_generateTenChannel(myPeripheralConnected)
+                            self.ble_enableNotifications(myPeripheralConnected, services, self.dataUUID10TT)
+                            continue
+
+    def ble_openConnection(self, device):
+        #print("\033[0;35;40m ble_openConnection()\033[0m")
+
+        """
+
+        Connect a device on the adapter chosen by the adapter manager.
+
+        :param device: ScanEntry :
+            Device found while scanning.
+
+        :returns: Peripheral : Device connected, its adapter is stored in its hci attribute.
+
+        """
+
+        hci = self.adapterManager.selectAdapter(device.addr)
+        myPeripheralConnected = btle.Peripheral(device.addr, device.addrType, hci)
+        myPeripheralConnected.hci = hci
+        self.adapterManager.setConnected(device.addr, hci)
+
+        return myPeripheralConnected
+
+    def ble_disconnectOnePeripheral(self, myDeviceAddr):
+        #print("\033[0;35;40m ble_disconnectOnePeripheral()\033[0m")
+
+        """
+        Disconnect one StretchSense device which is connected using its address, and remove it from
+        listPeripheralIsConnected.
+        The peripheral is also removed from listPeripheralInUse.
+
+        :param myDeviceAddr: string :
+            Address of the device that you want to disconnect.
+
+        """
+
+        numberOfPeripheralConnected = len(self.listPeripheralIsConnected)
+
+        if numberOfPeripheralConnected > 0:
+
+            i = 0
+            for myPeripheralConnected in self.listPeripheralIsConnected:
+
+                if myPeripheralConnected.addr == myDeviceAddr:
+                    del self.listPeripheralIsConnected[i:i + 10]
+                    break
+                i += 1
+
+            for myPeripheralInUse in self.listPeripheralInUse:
+
+                if myPeripheralInUse.addr == myDeviceAddr:
+                    self.listPeripheralInUse.remove(myPeripheralInUse)
+                    myPeripheralInUse.disconnect()
+                    self.adapterManager.setDisconnected(myDeviceAddr)
+
+    def ble_disconnectAllPeripherals(self):
+        #print("\033[0;35;40m ble_disconnectAllPeripherals()\033[0m")
+
+        """
+
+        Disconnect all StretchSense devices which are connected, and remove them from both
+        listPeripheralIsConnected and listPeripheralInUse.
+
+        """
+
+        for myPeripheralInUse in self.listPeripheralInUse:
+            myPeripheralInUse.disconnect()
+        self.adapterManager.setDisconnected()
+        with self.scanLock:
+            self.dictPeripheralAvailable.clear()
+            del self.listPeripheralAvailable[1:]
+        del self.listPeripheralIsConnected[1:]
+        del self.listPeripheralInUse[1:]
+
+    """
+
+     Functions : Discover/Generate/Update Services & Characteristics, and wait for notifications
+
+    """
+
+    def ble_generateOneChannel(self, peripheral, listPeripheral=None):
+        #print("\033[0;35;40m ble_generateOneChannel()\033[0m")
+
+        """
+
+        When a StretchSense gen2 device is connected we create a newSensor receiving the
+        specifications needed.
+
+        :param peripheral: Peripheral :
+            Using the BLE Peripheral format we can convert it into a StretchSensePeripheral
+            format easier to use.
+
+        :param listPeripheral: [StretchSensePeripheral] :
+            List receiving the channels, listPeripheralIsConnected if omitted.
+
+        :param periphUUID: UUID :
+            UUID of the StretchSense circuit
+
+        """
+
+        if listPeripheral is None:
+            listPeripheral = self.listPeripheralIsConnected
+
+        # We create a newSensor with the address
+        newSensor = StretchSensePeripheral()
+        newSensor.addr = peripheral.addr
+        newSensor.uuid = peripheral.uuid
+        newSensor.value = 0
+        newSensor.gen = peripheral.gen
+        newSensor.channelNumber = 0
+
+        listPeripheral.append(newSensor)
+
+    def ble_generateTenChannel(self, peripheral, listPeripheral=None):
+        #print("\033[0;35;40m ble_generateTenChannel()\033[0m")
+
+        """
+
+        When a StretchSense gen3 device is connected we create ten newSensor receiving the
+        specifications needed.
+
+        :param peripheral: Peripheral :
+            Using the BLE Peripheral format we can convert it into a StretchSensePeripheral
+            format easier to use.
+
+        :param listPeripheral: [StretchSensePeripheral] :
+            List receiving the channels, listPeripheralIsConnected if omitted.
+
+        """
+
+        if listPeripheral is None:
+            listPeripheral = self.listPeripheralIsConnected
+
+        # We create ten newSensor with the address
+        newSensor1 = StretchSensePeripheral()
+        newSensor1.addr = peripheral.addr
+        newSensor1.uuid = peripheral.uuid
+        newSensor1.value = 0
+        newSensor1.gen = peripheral.gen
+        newSensor1.channelNumber = 0
+
+        newSensor2 = StretchSensePeripheral()
+        newSensor2.addr = peripheral.addr
+        newSensor2.uuid = peripheral.uuid
+        newSensor2.value = 0
+        newSensor2.gen = peripheral.gen
+        newSensor2.channelNumber = 1
+
+        newSensor3 = StretchSensePeripheral()
+        newSensor3.addr = peripheral.addr
+        newSensor3.uuid = peripheral.uuid
+        newSensor3.value = 0
+        newSensor3.gen = peripheral.gen
+        newSensor3.channelNumber = 2
+
+        newSensor4 = StretchSensePeripheral()
+        newSensor4.addr = peripheral.addr
+        newSensor4.uuid = peripheral.uuid
+        newSensor4.value = 0
+        newSensor4.gen = peripheral.gen
+        newSensor4.channelNumber = 3
+
+        newSensor5 = StretchSensePeripheral()
+        newSensor5.addr = peripheral.addr
         newSensor5.uuid = peripheral.uuid
         newSensor5.value = 0
         newSensor5.gen = peripheral.gen
         newSensor5.channelNumber = 4
 
-        newSensor6 = StretchSensePeripheral()
-        newSensor6.addr = peripheral.addr
-        newSensor6.uuid = peripheral.uuid
-        newSensor6.value = 0
-        newSensor6.gen = peripheral.gen
-        newSensor6.channelNumber = 5
+        newSensor6 = StretchSensePeripheral()
+        newSensor6.addr = peripheral.addr
+        newSensor6.uuid = peripheral.uuid
+        newSensor6.value = 0
+        newSensor6.gen = peripheral.gen
+        newSensor6.channelNumber = 5
+
+        newSensor7 = StretchSensePeripheral()
+        newSensor7.addr = peripheral.addr
+        newSensor7.uuid = peripheral.uuid
+        newSensor7.value = 0
+        newSensor7.gen = peripheral.gen
+        newSensor7.channelNumber = 6
+
+        newSensor8 = StretchSensePeripheral()
+        newSensor8.addr = peripheral.addr
+        newSensor8.uuid = peripheral.uuid
+        newSensor8.value = 0
+        newSensor8.gen = peripheral.gen
+        newSensor8.channelNumber = 7
+
+        newSensor9 = StretchSensePeripheral()
+        newSensor9.addr = peripheral.addr
+        newSensor9.uuid = peripheral.uuid
+        newSensor9.value = 0
+        newSensor9.gen = peripheral.gen
+        newSensor9.channelNumber = 8
+
+        newSensor10 = StretchSensePeripheral()
+        newSensor10.addr = peripheral.addr
+        newSensor10.uuid = peripheral.uuid
+        newSensor10.value = 0
+        newSensor10.gen = peripheral.gen
+        newSensor10.channelNumber = 9
+
+        listPeripheral.append(newSensor1)
+        listPeripheral.append(newSensor2)
+        listPeripheral.append(newSensor3)
+        listPeripheral.append(newSensor4)
+        listPeripheral.append(newSensor5)
+        listPeripheral.append(newSensor6)
+        listPeripheral.append(newSensor7)
+        listPeripheral.append(newSensor8)
+        listPeripheral.append(newSensor9)
+        listPeripheral.append(newSensor10)
+
+    def ble_discoverServices(self):
+        #print("\033[0;35;40m ble_discoverServices()\033[0m")
+
+        """
+
+        Display on the terminal all the services for each StretchSense devices connected.
+
+        """
+
+        for myPeripheral in self.listPeripheralInUse:
+
+            listOfServices = sorted(myPeripheral.services, key=lambda services: services.hndStart)
+
+            for services in listOfServices:
+
+                print(services)
+
+    def ble_discoverCharacteristics(self):
+        #print("\033[0;35;40m ble_discoverCharacteristics()\033[0m")
+
+        """
+        Display on the terminal all the characteristics for each StretchSense devices connected.
+
+        """
+
+        for myPeripheral in self.listPeripheralInUse:
+
+            listOfServices = sorted(myPeripheral.services, key=lambda services: services.hndStart)
+
+            for services in listOfServices:
+
+                characteristics = services.getCharacteristics()
+
+                for chars in characteristics:
+
+                    print(chars)
+
+    def ble_updateOneChannelWithNotifications(self, data, addr, listPeripheral=None):
+        #print("\033[0;35;40m ble_updateOneChannelWithNotifications()\033[0m")
+
+        """
+
+        Update data from one or more StretchSense gen2 devices connected using BLE notifications
+        and stores its value.
+
+        :param data: UTF-8 characters :
+            data transmitted by the device once a notification is detected.
+
+        :param addr: string :
+            Address of the gen2 we want to update.
+
+        :param listPeripheral: [StretchSensePeripheral] :
+            Channels to update, globalSensor if omitted.
+
+        """
+
+        if listPeripheral is None:
+            listPeripheral = globalSensor
+
+        numberOfPeripheralConnected = len(listPeripheral)
+
+        if numberOfPeripheralConnected >= 1:
+            for myPeripheral in listPeripheral:
+                if myPeripheral.addr == addr:
+                    decimalValue = int(binascii.b2a_hex(data), 16) / 10.0
+                    myPeripheral.value = decimalValue
+                    #print("myPeripheral.value = ", myPeripheral.value)
+
+    def ble_updateOneChannel(self):
+        #print("\033[0;35;40m ble_updateOneChannel()\033[0m")
+
+        """
+
+        Update once the value of every StretchSense gen2 devices connected without using BLE notifications.
+
+        """
+
+        global globalSensor
+        globalSensor = self.listPeripheralIsConnected
+
+        for myPeripheral in self.listPeripheralInUse:
+
+            if getattr(myPeripheral, 'uuid', None) == self.serviceUUID2 and getattr(myPeripheral, 'dataHandle', None) is not None:
+                # The notifications and the configuration writes of the device hold the same lock
+                with myPeripheral.lock:
+                    self.ble_readCharacteristic(myPeripheral)
+
+    def ble_updateTenChannelWithNotifications(self, data, addr, listPeripheral=None):
+        #print("\033[0;35;40m ble_updateTenChannelWithNotifications()\033[0m")
+
+        """
+
+        Update data from one or more StretchSense gen3 devices connected using BLE notifications
+        and stores its value.
+
+        :param data: UTF-8 characters :
+            data transmitted by the device once a notification is detected.
+
+        :param addr: string :
+            Address of the gen3 we want to update.
+
+        :param listPeripheral: [StretchSensePeripheral] :
+            Channels to update, globalSensor if omitted.
+
+        """
+
+        if listPeripheral is None:
+            listPeripheral = globalSensor
+
+        numberOfPeripheralConnected = len(listPeripheral)
+
+        if numberOfPeripheralConnected >= 10:
+            for myPeripheral in listPeripheral:
+                if myPeripheral.addr == addr:
+                    index = listPeripheral.index(myPeripheral)
+
+                    decimalValue = (binascii.b2a_hex(data))
+                    splitted = [decimalValue[i:i + 4] for i in range(0, len(decimalValue), 4)]
+                    listPeripheral[index + 0].value = int((splitted[0]), 16) / 10.0
+                    listPeripheral[index + 1].value = int((splitted[1]), 16) / 10.0
+                    listPeripheral[index + 2].value = int((splitted[2]), 16) / 10.0
+                    listPeripheral[index + 3].value = int((splitted[3]), 16) / 10.0
+                    listPeripheral[index + 4].value = int((splitted[4]), 16) / 10.0
+                    listPeripheral[index + 5].value = int((splitted[5]), 16) / 10.0
+                    listPeripheral[index + 6].value = int((splitted[6]), 16) / 10.0
+                    listPeripheral[index + 7].value = int((splitted[7]), 16) / 10.0
+                    listPeripheral[index + 8].value = int((splitted[8]), 16) / 10.0
+                    listPeripheral[index + 9].value = int((splitted[9]), 16) / 10.0
+                    break
+
+    def ble_updateTenChannel(self):
+        #print("\033[0;35;40m ble_updateTenChannel()\033[0m")
+
+        """
+
+        Update once the value of every StretchSense gen3 and 10TT devices connected without BLE using notifications.
+
+        """
+
+        global globalSensor
+        globalSensor = self.listPeripheralIsConnected
+
+        for myPeripheral in self.listPeripheralInUse:
+
+            if getattr(myPeripheral, 'uuid', None) in (self.serviceUUID3, self.serviceUUID10TT) and getattr(myPeripheral, 'dataHandle', None) is not None:
+                # The notifications and the configuration writes of the device hold the same lock
+                with myPeripheral.lock:
+                    self.ble_readCharacteristic(myPeripheral)
+
+    def ble_generateFrame(self, addr, timestamp=None, listPeripheral=None):
+        #print("\033[0;35;40m ble_generateFrame()\033[0m")
+
+        """
+
+        Gather the last values of every channel of one connected device into a single frame.
+
+        :param addr: string :
+            Address of the device.
+
+        :param timestamp: int :
+            Time in nanoseconds given by time.monotonic_ns() when the values have been received, now if omitted.
+
+        :param listPeripheral: [StretchSensePeripheral] :
+            Channels holding the values, globalSensor if omitted.
+
+        :returns: StretchSenseFrame :
+            Frame holding the current value of each channel of the device.
+
+        """
+
+        if listPeripheral is None:
+            listPeripheral = globalSensor
+
+        frame = StretchSenseFrame()
+        frame.addr = addr
+        frame.timestamp = time.monotonic_ns() if timestamp is None else timestamp
+
+        for myPeripheral in listPeripheral:
+            if myPeripheral.addr == addr:
+                frame.gen = myPeripheral.gen
+                frame.values.append(myPeripheral.value)
+
+        return frame
+
+    def ble_updateAllPeripherals(self):
+        #print("\033[0;35;40m ble_updateAllPeripherals()\033[0m")
+
+        """
+
+        Update the value of the capacitance of each StretchSense devices which are connected, with one
+        read of the data characteristic per device.
+
+        """
+
+        global globalSensor
+        globalSensor = self.listPeripheralIsConnected
+
+        for myPeripheral in self.listPeripheralInUse:
+            if getattr(myPeripheral, 'dataHandle', None) is None:
+                continue
+
+            with myPeripheral.lock:
+                self.ble_readCharacteristic(myPeripheral)
+
+    def ble_enableNotifications(self, peripheral, services, dataUUID):
+        #print("\033[0;35;40m ble_enableNotifications()\033[0m")
+
+        """
+
+        Find the data characteristic of a device which has just been connected, keep its handle for the
+        read engine and enable its notifications.
+
+        :param peripheral: Peripheral :
+            Device connected.
+
+        :param services: Service :
+            StretchSense service of the device.
+
+        :param dataUUID: string :
+            UUID of the data characteristic of this service.
+
+        """
+
+        peripheral.lock = Lock()
+        peripheral.dictHandles = {}
+        peripheral.readMode = READ_NOTIFICATIONS
+        peripheral.timeReadMode = time.monotonic()
+        peripheral.timeLastNotification = peripheral.timeReadMode
+        peripheral.rateMeter = StretchSenseRateMeter()
+        self.lossTracker.reset(peripheral.deviceAddr)
+
+        for chars in services.getCharacteristics():
+
+            if chars.uuid == dataUUID:
+                peripheral.dataHandle = chars.getHandle()
+                peripheral.writeCharacteristic(peripheral.dataHandle + 1, b"\x01\x00")
+                break
+
+    def ble_updatePeripheralWithData(self, peripheral, data, timestamp=None):
+        #print("\033[0;35;40m ble_updatePeripheralWithData()\033[0m")
+
+        """
+
+        Decode the content of the data characteristic of a device, received by notification or read,
+        store the values of each channel and queue the new frame.
+
+        :param peripheral: Peripheral :
+            Device which sent the data.
+
+        :param data: bytes :
+            Content of the data characteristic.
+
+        :param timestamp: int :
+            Time in nanoseconds given by time.monotonic_ns() when the data has been received, now if omitted.
+
+        """
+
+        if timestamp is None:
+            timestamp = time.monotonic_ns()
+
+        if self.transportLog is not None:
+            self.transportLog.write(RAW_BLE_DATA, timestamp, peripheral.deviceAddr, peripheral.uuid, peripheral.gen,
+                                    data, getattr(peripheral, 'dataHandle', None) or 0)
+
+        global globalSensor
+        globalSensor = self.listPeripheralIsConnected
+
+        if peripheral.uuid == self.serviceUUID2:
+            self.ble_updateOneChannelWithNotifications(data, peripheral.deviceAddr)
+        else:
+            self.ble_updateTenChannelWithNotifications(data, peripheral.deviceAddr)
+
+        peripheral.rateMeter.tick()
+        self.pushFrame(self.ble_generateFrame(peripheral.deviceAddr, timestamp))
+
+    def ble_readCharacteristic(self, peripheral):
+        #print("\033[0;35;40m ble_readCharacteristic()\033[0m")
+
+        """
+
+        Read once the data characteristic of a device using its cached handle, every channel of the device
+        is updated by this single read.
+
+        :param peripheral: Peripheral :
+            Device to read.
+
+        """
+
+        if getattr(peripheral, 'dataHandle', None) is None:
+            return
+
+        data = peripheral.readCharacteristic(peripheral.dataHandle)
+        self.ble_updatePeripheralWithData(peripheral, data, time.monotonic_ns())
+
+    def ble_readPeripheral(self, peripheral):
+        #print("\033[0;35;40m ble_readPeripheral()\033[0m")
+
+        """
+
+        Read engine for one device. Devices are read through their notifications, when a device stops
+        notifying for notificationTimeout seconds it is read with readCharacteristic() instead, until
+        notifications come back.
+
+        :param peripheral: Peripheral :
+            Device to update.
+
+        """
+
+        if getattr(peripheral, 'dataHandle', None) is None:
+            return
+
+        with peripheral.lock:
+            self.ble_readPeripheralLocked(peripheral)
+
+    def ble_readPeripheralLocked(self, peripheral):
+        #print("\033[0;35;40m ble_readPeripheralLocked()\033[0m")
+
+        """
+
+        Body of ble_readPeripheral(), called with the lock of the device held: wait for its notifications,
+        or read its data characteristic while it is polled, and switch between the two read modes.
+
+        :param peripheral: Peripheral :
+            Device to update, its lock must be held by the caller.
+
+        """
+
+        now = time.monotonic()
+
+        if peripheral.readMode == READ_NOTIFICATIONS:
+            peripheral.waitForNotifications(self.notificationWaitTime)
+
+            if now - peripheral.timeLastNotification > self.notificationTimeout:
+                peripheral.readMode = READ_POLLING
+                peripheral.timeReadMode = now
+
+        else:
+            # Pending notifications are handled by bluepy while it waits for the read response
+            self.ble_readCharacteristic(peripheral)
+
+            if peripheral.timeLastNotification > peripheral.timeReadMode:
+                peripheral.readMode = READ_NOTIFICATIONS
+                peripheral.timeReadMode = now
+
+    def ble_waitNotifications(self):
+        #print("\033[0;35;40m ble_waitNotifications()\033[0m")
+
+        """
+        When called, run into all connected devices waiting for notification from each of them
+        and store the new data in their value slot. Devices which stopped notifying are read instead.
+
+        """
+
+        numberOfPeripheralInUse = len(self.listPeripheralInUse)
+
+        if numberOfPeripheralInUse > 0:
+
+            global globalSensor
+            globalSensor = self.listPeripheralIsConnected
+
+            for myPeripheral in self.listPeripheralInUse:
+                self.ble_readPeripheral(myPeripheral)
+
+    def ble_getCharacteristicHandle(self, peripheral, uuid):
+        #print("\033[0;35;40m ble_getCharacteristicHandle()\033[0m")
+
+        """
+
+        Returns the handle of one characteristic of a connected device, the handle is discovered once and
+        then kept with the device.
+
+        :param peripheral: Peripheral :
+            Device connected.
+
+        :param uuid: string :
+            UUID of the characteristic.
+
+        :returns: int : Handle of the characteristic, None if the device does not have it.
+
+        """
+
+        if uuid not in peripheral.dictHandles:
+            characteristics = peripheral.getCharacteristics(uuid=uuid)
+
+            if characteristics:
+                peripheral.dictHandles[uuid] = characteristics[0].getHandle()
+            else:
+                peripheral.dictHandles[uuid] = None
+
+        return peripheral.dictHandles[uuid]
+
+    def ble_writeConfiguration(self, peripheral, uuid, value):
+        #print("\033[0;35;40m ble_writeConfiguration()\033[0m")
+
+        """
+
+        Write a one byte setting on a connected device and read it back.
+
+        :param peripheral: Peripheral :
+            Device connected.
+
+        :param uuid: string :
+            UUID of the setting characteristic.
+
+        :param value: int :
+            New value of the setting, from 0 to 255.
+
+        :returns: bool : True if the value read back is the value written, False without writing anything
+            if the value does not fit in one byte.
+
+        """
+
+        if not isinstance(value, int) or not 0 <= value <= 255:
+            return False
+
+        handle = self.ble_getCharacteristicHandle(peripheral, uuid)
+
+        if handle is None:
+            return False
+
+        peripheral.writeCharacteristic(handle, bytes([value]), True)
+        readBack = peripheral.readCharacteristic(handle)
+
+        return len(readBack) > 0 and readBack[0] == value
+
+    def ble_configurePeripheral(self, peripheral, samplingTimeNumber=None, filteringNumber=None):
+        #print("\033[0;35;40m ble_configurePeripheral()\033[0m")
+
+        """
+
+        Set the sampling time and the averaging of one connected gen2 or gen3 device.
+
+        :param peripheral: Peripheral :
+            Device connected.
+
+        :param samplingTimeNumber: int :
+            Sampling time of the device, SamplingTime = (samplingTimeNumber + 1) * 40ms. None to keep it.
+
+        :param filteringNumber: int :
+            Number of samples averaged by the device. None to keep it.
+
+        :returns: bool : True if every setting has been read back with the value written.
+
+        """
+
+        if peripheral.uuid == self.serviceUUID2:
+            samplingTimeUUID = self.samplingTimeUUID2
+            averageUUID = self.averageUUID2
+        elif peripheral.uuid == self.serviceUUID3:
+            samplingTimeUUID = self.samplingTimeUUID3
+            averageUUID = self.averageUUID3
+        else:
+            return False
+
+        verified = True
+
+        with peripheral.lock:
+            try:
+                if samplingTimeNumber is not None:
+                    if self.ble_writeConfiguration(peripheral, samplingTimeUUID, samplingTimeNumber):
+                        peripheral.samplingTimeNumber = samplingTimeNumber
+                        self.lossTracker.reset(peripheral.deviceAddr)
+                        self.lossTracker.setPeriod(peripheral.deviceAddr, (samplingTimeNumber + 1) * 0.04)
+                    else:
+                        verified = False
+
+                if filteringNumber is not None:
+                    if self.ble_writeConfiguration(peripheral, averageUUID, filteringNumber):
+                        peripheral.filteringNumber = filteringNumber
+                    else:
+                        verified = False
+
+            except btle.BTLEException:
+                verified = False
+
+        return verified
+
+    def ble_configureAllPeripherals(self, samplingTimeNumber=None, filteringNumber=None, listAddr=None):
+        #print("\033[0;35;40m ble_configureAllPeripherals()\033[0m")
+
+        """
+
+        Set the sampling time and the averaging of every connected device, the devices are configured at
+        the same time.
+
+        :param samplingTimeNumber: int :
+            Sampling time of the devices, SamplingTime = (samplingTimeNumber + 1) * 40ms. None to keep it.
+
+        :param filteringNumber: int :
+            Number of samples averaged by the devices. None to keep it.
+
+        :param listAddr: [string] :
+            Addresses of the devices to configure, every connected device when omitted.
+
+        :returns: {addr: bool} : True for each device whose settings have been verified.
+
+        """
+
+        listPeripheral = []
+
+        for myPeripheral in self.listPeripheralInUse:
+
+            if getattr(myPeripheral, 'dataHandle', None) is None:
+                continue
+
+            if listAddr is None or myPeripheral.deviceAddr in listAddr:
+                listPeripheral.append(myPeripheral)
+
+        if not listPeripheral:
+            return {}
+
+        with ThreadPoolExecutor(max_workers=len(listPeripheral)) as executor:
+            results = executor.map(lambda myPeripheral: self.ble_configurePeripheral(myPeripheral, samplingTimeNumber, filteringNumber), listPeripheral)
+
+            return dict(zip([myPeripheral.deviceAddr for myPeripheral in listPeripheral], results))
+
+    def ble_getReadStatus(self):
+        #print("\033[0;35;40m ble_getReadStatus()\033[0m")
+
+        """
+
+        Returns how each connected device is read by the read engine.
+
+        :returns: {addr: (int, float)} : READ_NOTIFICATIONS or READ_POLLING, and the number of frames
+            received per second, keyed by the address of each device.
+
+        """
+
+        status = {}
+
+        for myPeripheral in self.listPeripheralInUse:
+
+            if getattr(myPeripheral, 'dataHandle', None) is not None:
+                status[myPeripheral.deviceAddr] = (myPeripheral.readMode, myPeripheral.rateMeter.getRate())
+
+        return status
+
+    def getMetrics(self):
+        #print("\033[0;35;40m getMetrics()\033[0m")
+
+        """
+
+        Returns the acquisition metrics of each device.
+
+        :returns: {addr: dict} : Frames received, expected and lost, loss rate, number of gaps and overruns,
+            sampling period in seconds, and for BLE devices the read mode, the number of frames received
+            per second and the adapter used, keyed by the address of each device.
+
+        """
+
+        metrics = self.lossTracker.getMetrics()
+
+        for (addr, (readMode, rate)) in self.ble_getReadStatus().items():
+            metrics.setdefault(addr, {}).update({"readMode": readMode, "rate": rate})
+
+        for (addr, hci) in self.adapterManager.getConnected().items():
+            metrics.setdefault(addr, {})["hci"] = hci
+
+        return metrics
+
+    def ble_getAdapterMetrics(self):
+        #print("\033[0;35;40m ble_getAdapterMetrics()\033[0m")
+
+        """
+
+        Returns the load of each HCI adapter.
+
+        :returns: {hci: dict} : Addresses of the devices connected and number of frames received per second,
+            keyed by adapter.
+
+        """
+
+        metrics = dict((hci, {"devices": [], "rate": 0.0}) for hci in self.adapterManager.listHci)
+        status = self.ble_getReadStatus()
+
+        for (addr, hci) in self.adapterManager.getConnected().items():
+            adapter = metrics.setdefault(hci, {"devices": [], "rate": 0.0})
+            adapter["devices"].append(addr)
+            adapter["rate"] += status.get(addr, (READ_NOTIFICATIONS, 0.0))[1]
+
+        return metrics
+
+    """
+
+    Functions : Lists of Peripherals
+
+    """
+
+    def ble_getListPeripheralAvailable(self):
+        #print("\033[0;35;40m ble_getListPeripheralAvailable()\033[0m")
+
+        """
+
+        Returns the list of all devices available in the area.
+
+        :returns: [Peripheral] : List of all the devices available.
+
+        """
+
+        return self.listPeripheralAvailable
+
+    def ble_getListAddrPeripheralAvailable(self):
+        #print("\033[0;35;40m ble_getListAddrPeripheralAvailable()\033[0m")
+
+        """
+
+        Returns the list of all devices address available in the area.
+
+        :returns: [addr] : List of all devices available addresses.
+
+        """
+
+        listAddr = []
+        numberOfPeripheralAvailable = len(self.listPeripheralAvailable)
+
+        if (self.listPeripheralAvailable[0].addr == ''):
+            return 0
+
+        elif numberOfPeripheralAvailable != 0:
+
+            for i in [numberOfPeripheralAvailable - 1]:
+                listAddr.append(self.listPeripheralAvailable[i].addr)
+                print(listAddr)
+
+        return listAddr
+
+    def ble_getListPeripheralIsConnected(self):
+        #print("\033[0;35;40m ble_getListPeripheralIsConnected()\033[0m")
+
+        """
+
+        Returns the list of all devices connected.
+
+        :returns: [StretchSensePeripheral] : List of all devices connected.
+
+        """
+
+        return self.listPeripheralIsConnected
+
+    def ble_getListPeripheralOnceConnected(self):
+        #print("\033[0;35;40m ble_getListPeripheralOnceConnected()\033[0m")
+
+        """
+
+        Returns the list of all devices once connected.
+
+        :returns: [StretchSensePeripheral] : List of all devices once connected.
+
+        """
+
+        return self.listPeripheralIsOnceConnected
+
+    def ble_getListPeripheralInUse(self):
+        #print("\033[0;35;40m ble_getListPeripheralInUse()\033[0m")
+
+        """
+
+        Returns the list of all devices currently in use.
+
+        :returns: [Peripheral] : List of all devices we are using.
+
+        """
+
+        return self.listPeripheralInUse
+
+    def ble_listToCsv(self):
+        #print("\033[0;35;40m ble_listToCsv()\033[0m")
+
+        """
+
+        Displays on the terminal the values of each connected devices in a csv format.
+
+        """
+
+        listToCsv = ""
+        numberOfPeripheralConnected = len(self.listPeripheralIsConnected)
+
+        if numberOfPeripheralConnected >= 1:
+
+            for myPeripheral in self.listPeripheralIsConnected:
+                listToCsv += ("%s ," % myPeripheral.value)
+
+        listToCsv += ("\n")
+        print(listToCsv)
+
+    def ble_getValuesCsv(self):
+        #print("\033[0;35;40m ble_getValuesCsv()\033[0m")
+
+        """
+
+        Returns the values of each connected devices in a csv format.
+
+        :returns: string : Values of each connected devices.
+
+        """
+
+        listToReturn = ""
+        numberOfPeripheralConnected = len(self.listPeripheralIsConnected)
+
+        if numberOfPeripheralConnected > 0:
+
+            for myPeripheral in self.listPeripheralIsConnected:
+                listToReturn += ("%s , " % myPeripheral.value)
+
+        return listToReturn
+
+    """
+
+    Functions : Recording
+
+    """
+
+    def timestampToWallClock(self, timestamp):
+        #print("\033[0;35;40m timestampToWallClock()\033[0m")
+
+        """
+
+        Convert the timestamp of a frame to a date.
+
+        :param timestamp: int :
+            Time in nanoseconds given by time.monotonic_ns().
+
+        :returns: float : Time in seconds since the epoch, as given by time.time().
+
+        """
+
+        return (self.timeAnchor[0] + timestamp - self.timeAnchor[1]) / 1e9
+
+    def getChannelColumns(self, listPeripheral, firstColumn=2):
+        #print("\033[0;35;40m getChannelColumns()\033[0m")
+
+        """
+
+        Describe the column of each channel of a recording, from the list of channels in use.
+
+        :param listPeripheral: [StretchSensePeripheral] :
+            Channels recorded, in the order of the columns.
+
+        :param firstColumn: int :
+            Index of the column of the first channel.
+
+        :returns: [dict] : Name, column, device address, generation and channel number of each channel.
+
+        """
+
+        listColumns = []
+
+        for myPeripheral in listPeripheral:
+
+            if myPeripheral.addr == '':
+                continue
+
+            listColumns.append({"name": "%s/%s" % (myPeripheral.addr, myPeripheral.channelNumber),
+                                "column": firstColumn + len(listColumns),
+                                "addr": myPeripheral.addr,
+                                "gen": str(myPeripheral.gen),
+                                "channel": int(myPeripheral.channelNumber)})
+
+        return listColumns
+
+    def getRecordingHeader(self, listColumns):
+        #print("\033[0;35;40m getRecordingHeader()\033[0m")
+
+        """
+
+        Returns the header line of a recording.
+
+        :param listColumns: [dict] :
+            Columns given by getChannelColumns().
+
+        :returns: string : Header line of the .csv file.
+
+        """
+
+        return "#, Sample Time, " + ", ".join(column["name"] for column in listColumns) + "\n"
+
+    def startTransportLog(self, filename):
+        #print("\033[0;35;40m startTransportLog()\033[0m")
+
+        """
+
+        Log every SPI transfer and BLE notification to a StretchSenseTransportLog before it is decoded, the
+        log can be replayed byte for byte with replay_open().
+
+        :param filename: string :
+            Path of the log.
+
+        :returns: StretchSenseTransportLog : The log written.
+
+        """
+
+        self.stopTransportLog()
+        transportLog = StretchSenseTransportLog(filename)
+
+        # The configuration of a bus already set up is needed to decode its transfers
+        if hasattr(self, 'myDevice'):
+            transportLog.write(RAW_SPI_CONFIG, time.monotonic_ns(), self.spiConfiguration.addr, self.serviceUUID3, 3,
+                               self.spi_getConfigurationPacket())
+
+        self.transportLog = transportLog
+        return transportLog
+
+    def stopTransportLog(self):
+        #print("\033[0;35;40m stopTransportLog()\033[0m")
+
+        """
+
+        Stop and close the log started by startTransportLog().
+
+        """
+
+        transportLog = self.transportLog
+        self.transportLog = None
+
+        if transportLog is not None:
+            transportLog.close()
+
+    """
+
+    Functions : Replay
+
+    """
+
+    def replay_open(self, filename, speed=1.0):
+        #print("\033[0;35;40m replay_open()\033[0m")
+
+        """
+
+        Load a recording made by the GUI, a capture made by StretchSenseCapture or a transport log made by
+        startTransportLog(), so that replay_mode() produces its frames as if they were received again.
+
+        :param filename: string or [string] :
+            Path of the recording, or of each of its segments in order.
+
+        :param speed: float :
+            1.0 to replay with the original timing, N to replay N times faster, 0 to replay as fast as
+            possible.
+
+        :returns: [StretchSensePeripheral] : Channels of the recording.
+
+        """
+
+        if isinstance(filename, str):
+            listFilename = [filename]
+        else:
+            listFilename = list(filename)
+
+        if StretchSenseTransportLog.isTransportLog(listFilename[0]):
+            return self.replay_openTransportLog(listFilename, speed)
+
+        with open(listFilename[0]) as myFile:
+            listNames = [name.strip() for name in myFile.readline().split(",")]
+
+        listTimes = []
+        listFrames = []
+        dictNumberOfChannels = {}
+
+        if listNames[0] == "Address":
+
+            # Capture : address, time and values of one frame on each row
+            for myFilename in listFilename:
+                with open(myFilename) as myFile:
+                    myFile.readline()
+
+                    for line in myFile:
+                        fields = [field.strip() for field in line.split(",")]
+                        values = [float(field) for field in fields[2:] if field != '']
+                        listTimes.append(float(fields[1]))
+                        listFrames.append((fields[0], values))
+                        dictNumberOfChannels[fields[0]] = len(values)
+
+            dictGen = {}
+
+        else:
+
+            # GUI recording : counter, time and every channel on each row, columns named "<addr>/<channel>"
+            dictColumns = collections.OrderedDict()
+
+            for (column, name) in enumerate(listNames):
+                if column >= 2 and "/" in name:
+                    (addr, channel) = name.rsplit("/", 1)
+                    dictColumns.setdefault(addr, []).append(column)
+
+            sidecar = re.sub(r"_\d{4}$", "", os.path.splitext(listFilename[0])[0]) + ".json"
+            dictGen = {}
+
+            if os.path.isfile(sidecar):
+                with open(sidecar) as myFile:
+                    for column in json.load(myFile).get("columns", []):
+                        dictGen[column["addr"]] = column["gen"]
+
+            for myFilename in listFilename:
+                rows = np.atleast_2d(np.genfromtxt(myFilename, delimiter=",", skip_header=1, comments=None))
+
+                if rows.size == 0:
+                    continue
+
+                for (addr, listColumns) in dictColumns.items():
+                    dictNumberOfChannels[addr] = len(listColumns)
+
+                for row in rows.tolist():
+                    for (addr, listColumns) in dictColumns.items():
+                        listTimes.append(row[1])
+                        listFrames.append((addr, [row[column] for column in listColumns]))
+
+        order = np.argsort(np.array(listTimes, dtype=np.float64), kind="stable")
+        self.replay_close()
+        self.replayTimes = (np.array(listTimes, dtype=np.float64)[order] * 1e9).astype(np.int64)
+        self.replayFrames = [listFrames[index] for index in order.tolist()]
+        self.replayGen = dictGen
+        self.replaySpeed = speed
+        self.replayIndex = 0
+        self.replayStart = None
+
+        self.listPeripheralReplay = []
+
+        for (addr, numberOfChannels) in dictNumberOfChannels.items():
+            for channel in range(numberOfChannels):
+                newSensor = StretchSensePeripheral()
+                newSensor.addr = addr
+                newSensor.gen = dictGen.get(addr, '')
+                newSensor.channelNumber = channel
+                self.listPeripheralReplay.append(newSensor)
+
+        return self.listPeripheralReplay
+
+    def replay_openTransportLog(self, filename, speed=1.0):
+        #print("\033[0;35;40m replay_openTransportLog()\033[0m")
+
+        """
+
+        Load a transport log made by startTransportLog(), replay_mode() gives its bytes again to the SPI and
+        BLE decoders, in the order and with the timing they have been logged.
+
+        :param filename: string or [string] :
+            Path of the log, or of several logs replayed one after the other.
+
+        :param speed: float :
+            1.0 to replay with the original timing, N to replay N times faster, 0 to replay as fast as
+            possible.
+
+        :returns: [StretchSensePeripheral] : Channels of the devices logged.
+
+        """
+
+        if isinstance(filename, str):
+            filename = [filename]
+
+        listRecord = []
+        for myFilename in filename:
+            listRecord.extend(StretchSenseTransportLog.read(myFilename))
+
+        self.replay_close()
+        self.replayRaw = True
+        self.replaySpeed = speed
+
+        # Stand-ins of the devices, each with its own decoding state, the acquisition in progress is left untouched
+        dictPeripheral = collections.OrderedDict()
+        listTimes = []
+
+        for (timestamp, kind, (addr, uuid, gen), handle, data) in listRecord:
+
+            if addr not in dictPeripheral:
+                peripheral = StretchSensePeripheral()
+                peripheral.addr = addr
+                peripheral.deviceAddr = addr
+                peripheral.uuid = uuid
+                peripheral.gen = gen
+                peripheral.dataHandle = handle
+                peripheral.isSpi = kind != RAW_BLE_DATA
+                peripheral.spiConfiguration = StretchSenseSpiConfiguration(addr=addr)
+                peripheral.scalingFactor = self.spi_getCapacitanceScalingFactor(peripheral.spiConfiguration.resolutionMode)
+                peripheral.configEpoch = 0
+                peripheral.settling = [0, 0]
+                dictPeripheral[addr] = peripheral
+
+            listTimes.append(timestamp)
+            self.replayFrames.append((kind, dictPeripheral[addr], data))
+
+        if listTimes:
+            self.replayTimes = np.array(listTimes, dtype=np.int64) - listTimes[0]
+
+        for peripheral in dictPeripheral.values():
+            if peripheral.isSpi:
+                self.spi_generateTenChannel(peripheral.addr, self.listPeripheralReplay)
+            elif peripheral.uuid == self.serviceUUID2:
+                self.ble_generateOneChannel(peripheral, self.listPeripheralReplay)
+            else:
+                self.ble_generateTenChannel(peripheral, self.listPeripheralReplay)
+
+        return self.listPeripheralReplay
+
+    def replay_injectTransfer(self, timestamp, kind, peripheral, data):
+        #print("\033[0;35;40m replay_injectTransfer()\033[0m")
+
+        """
+
+        Give the bytes of one record of a transport log to the decoder of its transport, the values are
+        stored in the channels of the replay and never in the ones of the devices acquired.
+
+        :param timestamp: int :
+            Time in nanoseconds given to the frame produced.
+
+        :param kind: int :
+            RAW_SPI_CONFIG, RAW_SPI_DATA or RAW_BLE_DATA.
+
+        :param peripheral: StretchSensePeripheral :
+            Stand-in of the device logged, made by replay_openTransportLog().
+
+        :param data: bytes :
+            Bytes logged.
+
+        """
+
+        if self.transportLog is not None:
+            self.transportLog.write(kind, timestamp, peripheral.addr, peripheral.uuid, peripheral.gen, data,
+                                    peripheral.dataHandle)
+
+        if kind == RAW_BLE_DATA:
+            if peripheral.uuid == self.serviceUUID2:
+                self.ble_updateOneChannelWithNotifications(data, peripheral.addr, self.listPeripheralReplay)
+            else:
+                self.ble_updateTenChannelWithNotifications(data, peripheral.addr, self.listPeripheralReplay)
+
+            self.pushFrame(self.ble_generateFrame(peripheral.addr, timestamp, self.listPeripheralReplay))
+
+        elif kind == RAW_SPI_DATA:
+            raw = list(data)[2:]
+
+            frame = StretchSenseFrame()
+            frame.addr = peripheral.addr
+            frame.gen = 3
+            frame.timestamp = timestamp
+            frame.configEpoch = peripheral.configEpoch
+            frame.scalingFactor = peripheral.scalingFactor
+
+            for myPeripheral in self.listPeripheralReplay:
+                if myPeripheral.addr == peripheral.addr:
+                    myPeripheral.value = self.spi_decodeCapacitance(raw, myPeripheral.channelNumber, peripheral.scalingFactor)
+                    frame.values.append(myPeripheral.value)
+
+            self.spi_flagFrame(frame, peripheral.settling)
+            self.pushFrame(frame)
+
+        elif kind == RAW_SPI_CONFIG:
+            peripheral.spiConfiguration = peripheral.spiConfiguration.fromPacket(data)
+            peripheral.scalingFactor = self.spi_getCapacitanceScalingFactor(peripheral.spiConfiguration.resolutionMode)
+            peripheral.configEpoch += 1
+            peripheral.settling = self.spi_getSettling(peripheral.spiConfiguration, timestamp)
+
+    def replay_mode(self):
+        #print("\033[0;35;40m replay_mode()\033[0m")
+
+        """
+
+        Queue the frames of the recording which are due, like spi_mode() or ble_waitNotifications() with a
+        live device. Waits at most replayWaitTime seconds when no frame is due yet.
+
+        """
+
+        numberOfFrames = len(self.replayFrames)
+
+        if self.replayIndex >= numberOfFrames:
+            time.sleep(self.replayWaitTime)
+            return
+
+        now = time.monotonic_ns()
+
+        if self.replayStart is None:
+            self.replayStart = now - (int(self.replayTimes[0] / self.replaySpeed) if self.replaySpeed else int(self.replayTimes[0]))
+
+        if self.replaySpeed:
+            end = int(np.searchsorted(self.replayTimes, (now - self.replayStart) * self.replaySpeed, side='right'))
+
+            if end == self.replayIndex:
+                wait = (self.replayStart + self.replayTimes[self.replayIndex] / self.replaySpeed - now) / 1e9
+                time.sleep(min(max(wait, 0.0), self.replayWaitTime))
+                return
+
+            timestamps = (self.replayStart + self.replayTimes[self.replayIndex:end] / self.replaySpeed).astype(np.int64)
+        else:
+            end = min(self.replayIndex + self.replayChunk, numberOfFrames)
+            timestamps = self.replayStart + self.replayTimes[self.replayIndex:end]
+
+        if self.replayRaw:
+            for (timestamp, (kind, peripheral, data)) in zip(timestamps.tolist(), self.replayFrames[self.replayIndex:end]):
+                self.replay_injectTransfer(timestamp, kind, peripheral, data)
+
+            self.replayIndex = end
+            return
+
+        for (timestamp, (addr, values)) in zip(timestamps.tolist(), self.replayFrames[self.replayIndex:end]):
+            frame = StretchSenseFrame()
+            frame.addr = addr
+            frame.gen = self.replayGen.get(addr, '')
+            frame.values = list(values)
+            frame.timestamp = timestamp
+            self.pushFrame(frame)
+
+        self.replayIndex = end
+
+    def replay_isOpen(self):
+        #print("\033[0;35;40m replay_isOpen()\033[0m")
+
+        """
+
+        :returns: bool : True if a recording has been opened with replay_open().
+
+        """
+
+        return len(self.listPeripheralReplay) > 0
+
+    def replay_isFinished(self):
+        #print("\033[0;35;40m replay_isFinished()\033[0m")
+
+        """
+
+        :returns: bool : True once every frame of the recording has been queued.
+
+        """
+
+        return self.replayIndex >= len(self.replayFrames)
+
+    def replay_getListPeripheral(self):
+        #print("\033[0;35;40m replay_getListPeripheral()\033[0m")
+
+        """
+
+        :returns: [StretchSensePeripheral] : Channels of the recording replayed.
+
+        """
+
+        return self.listPeripheralReplay
+
+    def replay_close(self):
+        #print("\033[0;35;40m replay_close()\033[0m")
+
+        """
+
+        Forget the recording replayed.
+
+        """
+
+        self.replayTimes = np.zeros(0, dtype=np.int64)
+        self.replayFrames = []
+        self.replayRaw = False
+        self.replayGen = {}
+        self.replaySpeed = 1.0
+        self.replayIndex = 0
+        self.replayStart = None
+        self.listPeripheralReplay = []
+
+    """
+
+    Functions : Frames
+
+    """
+
+    def pushFrame(self, frame):
+        #print("\033[0;35;40m pushFrame()\033[0m")
+
+        """
+
+        Count a new frame in the loss metrics and queue it so it can be read with getFrames(). When nobody
+        reads the frames the oldest ones are dropped once numberOfFrameQueued is reached.
+
+        :param frame: StretchSenseFrame :
+            Frame produced by one of the transports.
+
+        """
+
+        self.lossTracker.update(frame)
+        self.listFrames.append(frame)
+
+    def getFrames(self):
+        #print("\033[0;35;40m getFrames()\033[0m")
+
+        """
+
+        Returns every frame received since the last call, oldest first, after the processing stages.
+
+        :returns: [StretchSenseFrame] : Batch of frames.
+
+        """
+
+        batch = []
+
+        while self.listFrames:
+            batch.append(self.listFrames.popleft())
+
+        for stage in self.listProcessingStages:
+            batch = stage.process(batch)
+
+        return batch
+
+    def addProcessingStage(self, stage):
+        #print("\033[0;35;40m addProcessingStage()\033[0m")
+
+        """
+
+        Add a stage at the end of the processing of the frames returned by getFrames().
+
+        :param stage: object :
+            Object with a process(batch) method which returns the processed batch.
+
+        """
+
+        self.listProcessingStages.append(stage)
+
+    def removeProcessingStage(self, stage):
+        #print("\033[0;35;40m removeProcessingStage()\033[0m")
+
+        """
+
+        Remove a stage added with addProcessingStage().
+
+        :param stage: object :
+            Stage to remove.
+
+        """
+
+        if stage in self.listProcessingStages:
+            self.listProcessingStages.remove(stage)
+
+
+"""
+
+Class StretchSenseDelegate : Class to handle the BLE notifications
+
+"""
+
+
+class StretchSenseDelegate(btle.DefaultDelegate):
+    #print("\033[0;35;40m StretchSenseDelegate()\033[0m")
+
+    def __init__(self, peripheral, api=None):
+        #print("\033[0;35;40m __init__().StretchSenseDelegate()\033[0m")
+
+        btle.DefaultDelegate.__init__(self)
+        self.peripheral = peripheral
+        self.addr = self.peripheral.addr
+        self.api = api
+
+    def handleNotification(self, cHandle, data):
+        #print("\033[0;35;40m StretchSenseDelegateHandleNotification()\033[0m")
+
+        if self.api is not None:
+            timestamp = time.monotonic_ns()
+            self.peripheral.timeLastNotification = timestamp / 1e9
+            self.api.ble_updatePeripheralWithData(self.peripheral, data, timestamp)
+            return
+
+        for myPeripheral in globalSensor:
+
+            if myPeripheral.addr == self.addr:
+                if myPeripheral.uuid == StretchSenseAPI.serviceUUID2:
+                    StretchSenseAPI.ble_updateOneChannelWithNotifications(self, data, self.addr)
+
+                if myPeripheral.uuid == StretchSenseAPI.serviceUUID3:
+                    StretchSenseAPI.ble_updateTenChannelWithNotifications(self, data, self.addr)
+
+                if myPeripheral.uuid == StretchSenseAPI.serviceUUID10TT:
+                    StretchSenseAPI.ble_updateTenChannelWithNotifications(self, data, self.addr)
+                break
+
+"""
+
+Class StretchSenseAsyncAPI : asyncio front-end of the StretchSense API
+
+"""
+
+
+class StretchSenseAsyncAPI(object):
+    #print("\033[0;35;40m StretchSenseAsyncAPI()\033[0m")
+
+    """
+    Class which wraps a StretchSenseAPI so it can be used from an asyncio event loop.
+
+    Every blocking call (scan, connect, SPI setup, reads) is run on an internal executor. The executor
+    has a single worker by default: StretchSenseAPI, bluepy and spidev are not thread safe, so the calls
+    are serialized exactly as they would be with the blocking API while the event loop stays free.
+
+    :param api: StretchSenseAPI:
+        API to wrap, a new one is created when omitted.
+
+    :param executor: Executor:
+        Executor used to run the blocking calls, a single worker ThreadPoolExecutor when omitted.
+
+    """
+
+    def __init__(self, api=None, executor=None):
+        #print("\033[0;35;40m __init__().StretchSenseAsyncAPI()\033[0m")
+
+        if api is None:
+            api = StretchSenseAPI()
+        if executor is None:
+            executor = ThreadPoolExecutor(max_workers=1)
+
+        self.api = api
+        self.executor = executor
+
+    async def _run(self, function, *args, **kwargs):
+        return await asyncio.get_running_loop().run_in_executor(self.executor, functools.partial(function, *args, **kwargs))
+
+    async def ble_scanning(self, scanTime):
+        #print("\033[0;35;40m ble_scanning().StretchSenseAsyncAPI()\033[0m")
+
+        """
+
+        Awaitable version of StretchSenseAPI.ble_scanning().
+
+        :param scanTime: int :
+            Time to scan for.
+
+        :returns: [Peripheral] : List of all the devices available.
+
+        """
+
+        await self._run(self.api.ble_scanning, scanTime)
+        return self.api.ble_getListPeripheralAvailable()
+
+    async def ble_connectOnePeripheral(self, myDeviceAddr):
+        #print("\033[0;35;40m ble_connectOnePeripheral().StretchSenseAsyncAPI()\033[0m")
+
+        """
+
+        Awaitable version of StretchSenseAPI.ble_connectOnePeripheral().
+
+        :param myDeviceAddr: string :
+            Address of the device that you want to connect.
+
+        """
+
+        await self._run(self.api.ble_connectOnePeripheral, myDeviceAddr)
+
+    async def ble_connectAllPeripheral(self):
+        #print("\033[0;35;40m ble_connectAllPeripheral().StretchSenseAsyncAPI()\033[0m")
+
+        """
+
+        Awaitable version of StretchSenseAPI.ble_connectAllPeripheral().
+
+        :returns: [StretchSensePeripheral] : List of all devices connected.
+
+        """
+
+        await self._run(self.api.ble_connectAllPeripheral)
+        return self.api.ble_getListPeripheralIsConnected()
+
+    async def ble_disconnectAllPeripherals(self):
+        #print("\033[0;35;40m ble_disconnectAllPeripherals().StretchSenseAsyncAPI()\033[0m")
+
+        """
+
+        Awaitable version of StretchSenseAPI.ble_disconnectAllPeripherals().
+
+        """
+
+        await self._run(self.api.ble_disconnectAllPeripherals)
+
+    async def ble_configureAllPeripherals(self, samplingTimeNumber=None, filteringNumber=None, listAddr=None):
+        #print("\033[0;35;40m ble_configureAllPeripherals().StretchSenseAsyncAPI()\033[0m")
+
+        """
+
+        Awaitable version of StretchSenseAPI.ble_configureAllPeripherals().
+
+        :returns: {addr: bool} : True for each device whose settings have been verified.
+
+        """
+
+        return await self._run(self.api.ble_configureAllPeripherals, samplingTimeNumber, filteringNumber, listAddr)
+
+    async def spi_setup(self):
+        #print("\033[0;35;40m spi_setup().StretchSenseAsyncAPI()\033[0m")
+
+        """
+
+        Awaitable version of StretchSenseAPI.spi_setup(), configures the 16FGV1.0 with the current settings.
+
+        """
+
+        await self._run(self.api.spi_setup)
+
+    async def spi_close(self):
+        #print("\033[0;35;40m spi_close().StretchSenseAsyncAPI()\033[0m")
+
+        """
+
+        Awaitable version of StretchSenseAPI.spi_close().
+
+        """
+
+        await self._run(self.api.spi_close)
+
+    async def spi_reconfigure(self, odrMode=None, interruptMode=None, triggerMode=None, filterMode=None,
+                              resolutionMode=None, configuration=None):
+        #print("\033[0;35;40m spi_reconfigure().StretchSenseAsyncAPI()\033[0m")
+
+        """
+
+        Awaitable version of StretchSenseAPI.spi_reconfigure(), waits for spiLock without blocking the loop.
+
+        """
+
+        await self._run(self.api.spi_reconfigure, odrMode, interruptMode, triggerMode, filterMode, resolutionMode,
+                        configuration)
+
+    async def spi_loadConfiguration(self, filename):
+        #print("\033[0;35;40m spi_loadConfiguration().StretchSenseAsyncAPI()\033[0m")
+
+        """
+
+        Awaitable version of StretchSenseAPI.spi_loadConfiguration().
+
+        :returns: StretchSenseSpiConfiguration : The configuration applied.
+
+        """
+
+        return await self._run(self.api.spi_loadConfiguration, filename)
+
+    async def spi_tune(self, tuner, targetNoise, maxDelay=None, apply=True, useCache=True):
+        #print("\033[0;35;40m spi_tune().StretchSenseAsyncAPI()\033[0m")
+
+        """
+
+        Awaitable version of StretchSenseSpiTuner.tune(), the SPI bus must not be read meanwhile.
+
+        :param tuner: StretchSenseSpiTuner :
+            Tuner of the wrapped API.
+
+        :returns: dict : The measure chosen, as given by StretchSenseSpiTuner.recommend().
+
+        """
+
+        return await self._run(tuner.tune, targetNoise, maxDelay, apply=apply, useCache=useCache)
+
+    async def replay_open(self, filename, speed=1.0):
+        #print("\033[0;35;40m replay_open().StretchSenseAsyncAPI()\033[0m")
+
+        """
+
+        Awaitable version of StretchSenseAPI.replay_open(), the frames are then read with SOURCE_REPLAY.
+
+        :returns: [StretchSensePeripheral] : Channels of the recording.
+
+        """
+
+        return await self._run(self.api.replay_open, filename, speed)
+
+    async def read(self, source, batchTime=0.0):
+        #print("\033[0;35;40m read().StretchSenseAsyncAPI()\033[0m")
+
+        """
+
+        Read the transport at least once, and keep reading it for batchTime seconds.
+
+        :param source: int :
+            SOURCE_SPI, SOURCE_BLE or SOURCE_REPLAY.
+
+        :param batchTime: float :
+            Time spent reading before returning the batch.
+
+        :returns: [StretchSenseFrame] : Every frame received during the read.
+
+        """
+
+        return await self._run(self._readBatch, source, batchTime)
+
+    async def frames(self, source, batchTime=0.02):
+        #print("\033[0;35;40m frames().StretchSenseAsyncAPI()\033[0m")
+
+        """
+
+        Asynchronous iterator over the frames of a transport, grouped in batches.
+
+            async for batch in asyncApi.frames(SOURCE_BLE):
+                ...
+
+        Empty batches are not yielded, and a replay stops at the end of the recording.
+
+        :param source: int :
+            SOURCE_SPI, SOURCE_BLE or SOURCE_REPLAY.
+
+        :param batchTime: float :
+            Time spent reading the transport for each batch.
+
+        """
+
+        while True:
+            batch = await self.read(source, batchTime)
+            if batch:
+                yield batch
+            elif source == SOURCE_REPLAY and self.api.replay_isFinished():
+                return
+
+    def close(self):
+        #print("\033[0;35;40m close().StretchSenseAsyncAPI()\033[0m")
+
+        """
+
+        Stop the internal executor once the pending calls are done.
+
+        """
+
+        self.executor.shutdown(wait=True)
+
+    def _readBatch(self, source, batchTime):
+
+        timeEnd = time.monotonic() + batchTime
+
+        while True:
+            if source == SOURCE_SPI:
+                self.api.spi_mode()
+            elif source == SOURCE_BLE:
+                self.api.ble_waitNotifications()
+            elif source == SOURCE_REPLAY:
+                self.api.replay_mode()
+            if time.monotonic() >= timeEnd:
+                break
+
+        return self.api.getFrames()
+
+
+"""
+
+Class StretchSenseAligner : Resampling of several devices on a common clock
+
+"""
+
+
+class StretchSenseAligner(object):
+    #print("\033[0;35;40m StretchSenseAligner()\033[0m")
+
+    """
+    Processing stage which resamples the frames of every device on a common timeline of rate frames per
+    second. It keeps the last frames of each device, and once every device had delay seconds to deliver
+    its values for a tick it emits one frame per device with the timestamp of the tick. A frame is marked
+    stale when the last value received before the tick is older than staleTime seconds.
+
+    :param rate: float:
+        Number of ticks per second of the common timeline.
+
+    :param staleTime: float:
+        Age in seconds after which the values of a device are stale.
+
+    :param delay: float:
+        Time in seconds waited for late frames before resampling a tick, staleTime when omitted.
+
+    :param mode: int:
+        ALIGN_LINEAR to interpolate between the frames, ALIGN_HOLD to keep the last value.
+
+    :param length: int:
+        Number of frames kept for each device.
+
+    """
+
+    def __init__(self, rate, staleTime=0.1, delay=None, mode=ALIGN_LINEAR, length=256):
+        #print("\033[0;35;40m __init__().StretchSenseAligner()\033[0m")
+
+        self.period = int(1e9 / rate)
+        self.staleTime = int(staleTime * 1e9)
+        self.delay = self.staleTime if delay is None else int(delay * 1e9)
+        self.mode = mode
+        self.length = length
+        self.dictBuffer = {}
+        self.dictGen = {}
+        self.nextTick = None
+        self.lastTimestamp = 0
+
+    def push(self, frame):
+
+        """
+
+        Keep a frame in the history of its device.
+
+        :param frame: StretchSenseFrame :
+            Frame received.
+
+        """
+
+        myBuffer = self.dictBuffer.get(frame.addr)
+
+        if myBuffer is None:
+            myBuffer = StretchSenseRingBuffer(len(frame.values), self.length)
+            self.dictBuffer[frame.addr] = myBuffer
+            self.dictGen[frame.addr] = frame.gen
+
+        myBuffer.push(frame.timestamp, frame.values)
+        self.lastTimestamp = max(self.lastTimestamp, frame.timestamp)
+
+        if self.nextTick is None:
+            self.nextTick = -(-frame.timestamp // self.period) * self.period
+
+    def pop(self):
+
+        """
+
+        Resample every device on the ticks which are not waiting for late frames anymore.
+
+        :returns: [StretchSenseFrame] : One frame per device and per tick, ordered by tick.
+
+        """
+
+        if self.nextTick is None:
+            return []
+
+        # Ticks older than the history kept are skipped
+        timeEnd = self.lastTimestamp - self.delay
+        ticks = np.arange(max(self.nextTick, timeEnd - self.length * self.period), timeEnd + 1, self.period, dtype=np.int64)
+
+        if len(ticks) == 0:
+            return []
+
+        self.nextTick = int(ticks[-1]) + self.period
+        listResampled = []
+
+        for (addr, myBuffer) in self.dictBuffer.items():
+            (timestamps, values) = myBuffer.getLast()
+            last = np.searchsorted(timestamps, ticks, side='right') - 1
+            stale = (last < 0) | (ticks - timestamps[np.maximum(last, 0)] > self.staleTime)
+
+            if self.mode == ALIGN_LINEAR:
+                resampled = np.column_stack([np.interp(ticks, timestamps, values[:, channel]) for channel in range(values.shape[1])])
+            else:
+                resampled = values[np.maximum(last, 0)]
+
+            listResampled.append((addr, resampled.tolist(), stale.tolist()))
+
+        batch = []
+
+        for (index, tick) in enumerate(ticks.tolist()):
+            for (addr, resampled, stale) in listResampled:
+                frame = StretchSenseFrame()
+                frame.addr = addr
+                frame.gen = self.dictGen[addr]
+                frame.values = resampled[index]
+                frame.timestamp = tick
+                frame.stale = stale[index]
+                batch.append(frame)
+
+        return batch
+
+    def process(self, batch):
+
+        """
+
+        Add the frames of the batch to the history of their device and replace the batch by the frames
+        resampled on the ticks now complete, one frame per device and per tick. The batch returned may be
+        empty while the aligner waits for late frames.
+
+        :param batch: [StretchSenseFrame] :
+            Frames received.
+
+        :returns: [StretchSenseFrame] : Resampled frames.
+
+        """
+
+        for frame in batch:
+            self.push(frame)
+
+        return self.pop()
+
+
+"""
+
+Class StretchSenseCalibration : Conversion of the capacitance of each sensor with its own polynomial
+
+"""
+
+
+class StretchSenseCalibration(object):
+    #print("\033[0;35;40m StretchSenseCalibration()\033[0m")
+
+    """
+    Processing stage which converts the capacitance of each channel with a polynomial of its own, for
+    example to get the stretch of the sensor. The coefficients of each (device address, channel) are stored
+    in a .json file, highest degree first as with numpy.polyval(). For each device they are gathered in one
+    array with a column per channel, so that every frame of the device in a batch is converted at once.
+    Channels without coefficients are left unchanged.
+
+    :param filename: string:
+        .json file of coefficients to load.
+
+    """
+
+    def __init__(self, filename=None):
+        #print("\033[0;35;40m __init__().StretchSenseCalibration()\033[0m")
+
+        # Coefficients of each channel, keyed by "<addr>/<channel>" as in the recordings
+        self.dictCoefficients = {}
+
+        # Arrays of coefficients of each device, keyed by (addr, number of channels)
+        self.dictArrays = {}
+
+        if filename is not None:
+            self.load(filename)
+
+    def load(self, filename):
+
+        """
+
+        Load the coefficients of a .json file, replacing the ones of the same channels.
+
+        :param filename: string :
+            .json file written by save().
+
+        """
+
+        with open(filename) as myFile:
+            dictCoefficients = json.load(myFile)["sensors"]
+
+        for (name, coefficients) in dictCoefficients.items():
+            self.dictCoefficients[name] = [float(coefficient) for coefficient in coefficients]
+
+        self.dictArrays = {}
+
+    def save(self, filename):
+
+        """
+
+        Write the coefficients in a .json file.
+
+        :param filename: string :
+            .json file to write.
+
+        """
+
+        with open(filename, "w") as myFile:
+            json.dump({"sensors": self.dictCoefficients}, myFile, indent=4, sort_keys=True)
+
+    def setCoefficients(self, addr, channel, coefficients):
+
+        """
+
+        Set the polynomial of one channel.
+
+        :param addr: string :
+            Address of the device.
+
+        :param channel: int :
+            Channel number.
+
+        :param coefficients: [float] :
+            Coefficients, highest degree first. None to leave the channel unchanged.
+
+        """
+
+        name = "%s/%s" % (addr, channel)
+
+        if coefficients is None:
+            self.dictCoefficients.pop(name, None)
+        else:
+            self.dictCoefficients[name] = [float(coefficient) for coefficient in coefficients]
+
+        self.dictArrays = {}
+
+    def getArray(self, addr, numberOfChannels):
+
+        """
+
+        :returns: array : Coefficients of every channel of a device, one row per degree highest first and one
+            column per channel.
+
+        """
+
+        key = (addr, numberOfChannels)
+        coefficients = self.dictArrays.get(key)
+
+        if coefficients is None:
+            listCoefficients = [self.dictCoefficients.get("%s/%s" % (addr, channel), [1.0, 0.0]) for channel in range(numberOfChannels)]
+            degree = max(len(channelCoefficients) for channelCoefficients in listCoefficients)
+            coefficients = np.zeros((degree, numberOfChannels))
+
+            for (channel, channelCoefficients) in enumerate(listCoefficients):
+                coefficients[degree - len(channelCoefficients):, channel] = channelCoefficients
+
+            self.dictArrays[key] = coefficients
+
+        return coefficients
+
+    def process(self, batch):
+
+        """
+
+        Replace the values of each frame of the batch by the polynomial of their channel, evaluated with
+        Horner's method over all the frames of a device at once. Channels without coefficients keep their
+        value, the frames are modified in place.
+
+        :param batch: [StretchSenseFrame] :
+            Frames received.
+
+        :returns: [StretchSenseFrame] : Calibrated frames.
+
+        """
+
+        dictFrames = collections.defaultdict(list)
+
+        for frame in batch:
+            dictFrames[(frame.addr, len(frame.values))].append(frame)
+
+        for ((addr, numberOfChannels), listFrames) in dictFrames.items():
+
+            if numberOfChannels == 0:
+                continue
+
+            coefficients = self.getArray(addr, numberOfChannels)
+            values = np.array([frame.values for frame in listFrames], dtype=np.float64)
+
+            # Horner's method over every frame and channel of the device
+            calibrated = np.full(values.shape, coefficients[0])
+            for row in coefficients[1:]:
+                calibrated = calibrated * values + row
+
+            for (frame, frameValues) in zip(listFrames, calibrated.tolist()):
+                frame.values = frameValues
+
+        return batch
+
+    def fitRecording(self, filename, referenceFilename, degree=2):
+
+        """
+
+        Fit the polynomial of every channel of a recording made with the GUI, against a reference file
+        holding the expected value of each channel on the same rows, under the same column names.
+
+        :param filename: string :
+            Recording of the capacitance.
+
+        :param referenceFilename: string :
+            .csv file of the reference values, with a header line naming the columns as in the recording.
+
+        :param degree: int :
+            Degree of the polynomials.
+
+        :returns: {string: float} : Root mean square error of the fit of each channel, keyed by column name.
+
+        """
+
+        dictColumns = StretchSenseRecorder.readColumns(filename)
+        dictReferenceColumns = StretchSenseRecorder.readColumns(referenceFilename)
+
+        # A file of one row or of one column is read as a flat array, it is given back its columns
+        values = np.genfromtxt(filename, delimiter=",", skip_header=1, comments=None).reshape(-1, len(dictColumns))
+        reference = np.genfromtxt(referenceFilename, delimiter=",", skip_header=1, comments=None).reshape(-1, len(dictReferenceColumns))
+        numberOfRows = min(len(values), len(reference))
+        dictError = {}
+
+        for (name, column) in dictColumns.items():
+
+            if "/" not in name or name not in dictReferenceColumns:
+                continue
+
+            x = values[:numberOfRows, column]
+            y = reference[:numberOfRows, dictReferenceColumns[name]]
+            valid = np.isfinite(x) & np.isfinite(y)
+
+            if np.count_nonzero(valid) <= degree:
+                continue
+
+            coefficients = np.polyfit(x[valid], y[valid], degree)
+            self.dictCoefficients[name] = coefficients.tolist()
+            dictError[name] = float(np.sqrt(np.mean((np.polyval(coefficients, x[valid]) - y[valid]) ** 2)))
+
+        self.dictArrays = {}
+        return dictError
+
+
+"""
+
+Class StretchSenseAutoZero : Tracking of the baseline of each channel
+
+"""
+
+
+class StretchSenseAutoZero(object):
+    #print("\033[0;35;40m StretchSenseAutoZero()\033[0m")
+
+    """
+    Processing stage which follows the resting value of each channel, to compensate the drift of the
+    sensors with temperature and wear. The baseline follows a value under it within fallTime seconds and a
+    value above it within riseTime seconds, so it stays close to the lowest values of the channel. A channel
+    stretched more than activeThreshold above its baseline is active and its baseline is frozen until it
+    comes back. Each frame updates every channel of its device at once.
+
+    :param riseTime: float:
+        Time constant in seconds of the baseline going up.
+
+    :param fallTime: float:
+        Time constant in seconds of the baseline going down.
+
+    :param activeThreshold: float:
+        Distance to the baseline above which a channel is active, in the unit of the values.
+
+    :param subtract: bool:
+        True to replace the values by their distance to the baseline, False to only set frame.baseline.
+
+    """
+
+    def __init__(self, riseTime=30.0, fallTime=1.0, activeThreshold=5.0, subtract=True):
+        #print("\033[0;35;40m __init__().StretchSenseAutoZero()\033[0m")
+
+        self.riseTime = riseTime
+        self.fallTime = fallTime
+        self.activeThreshold = activeThreshold
+        self.subtract = subtract
+
+        # Baseline and timestamp of the last frame of each device
+        self.dictBaseline = {}
+        self.dictTimestamp = {}
+
+    def reset(self, addr=None):
+
+        """
+
+        Start the baseline again from the next frame of a device, or of every device when addr is omitted.
+
+        :param addr: string :
+            Address of the device.
+
+        """
+
+        if addr is None:
+            self.dictBaseline = {}
+            self.dictTimestamp = {}
+        else:
+            self.dictBaseline.pop(addr, None)
+            self.dictTimestamp.pop(addr, None)
+
+    def getBaseline(self, addr):
+
+        """
+
+        :returns: [float] : Baseline of each channel of a device, None if no frame has been received.
+
+        """
+
+        baseline = self.dictBaseline.get(addr)
+        return None if baseline is None else baseline.tolist()
+
+    def update(self, frame):
+
+        """
+
+        Update the baseline of the device of a frame, and remove it from the values of the frame.
+
+        :param frame: StretchSenseFrame :
+            Frame received.
+
+        """
+
+        values = np.asarray(frame.values, dtype=np.float64)
+        baseline = self.dictBaseline.get(frame.addr)
+
+        if baseline is None or len(baseline) != len(values):
+            baseline = values.copy()
+            self.dictBaseline[frame.addr] = baseline
+        else:
+            elapsed = max(frame.timestamp - self.dictTimestamp[frame.addr], 0) / 1e9
+            difference = values - baseline
+            rate = np.where(difference < 0, -np.expm1(-elapsed / self.fallTime), -np.expm1(-elapsed / self.riseTime))
+            rate[difference > self.activeThreshold] = 0.0
+            baseline += rate * difference
+
+        self.dictTimestamp[frame.addr] = frame.timestamp
+        frame.baseline = baseline.tolist()
+
+        if self.subtract:
+            frame.values = (values - baseline).tolist()
+
+    def process(self, batch):
+
+        """
+
+        Update the baseline of each device with the frames of the batch in order, and set frame.baseline on
+        each frame. With subtract the values become their distance to the baseline, the frames are
+        modified in place.
+
+        :param batch: [StretchSenseFrame] :
+            Frames received.
+
+        :returns: [StretchSenseFrame] : Frames with their baseline.
+
+        """
+
+        for frame in batch:
+            self.update(frame)
+
+        return batch
+
+
+"""
+
+Class StretchSenseEventEngine : Threshold detection on the live frames
+
+"""
+
+
+class StretchSenseEvent:
+    #print("\033[0;35;40m StretchSenseEvent()\033[0m")
+
+    """
+    Class which describes a threshold crossed by a channel.
+
+    :param name: string:
+        Name of the rule.
+
+    :param addr: string:
+        Address of the device.
+
+    :param channel: int:
+        Channel number.
+
+    :param edge: int:
+        EDGE_RISING when the rule becomes active, EDGE_FALLING when it is released.
+
+    :param timestamp: int:
+        Timestamp of the frame which triggered the event, in nanoseconds.
+
+    :param value: float:
+        Value of the channel in this frame.
+
+    """
+
+    def __init__(self):
+        #print("\033[0;35;40m __init__().StretchSenseEvent()\033[0m")
+
+        self.name = ''
+        self.addr = ''
+        self.channel = 0
+        self.edge = EDGE_RISING
+        self.timestamp = 0
+        self.value = 0.0
+
+
+class StretchSenseEventEngine(object):
+    #print("\033[0;35;40m StretchSenseEventEngine()\033[0m")
+
+    """
+    Processing stage which checks threshold rules on the frames and calls its subscribers on each edge.
+    A rule becomes active once its channel stayed above the threshold for minDuration seconds, and is
+    released once it stayed under threshold - hysteresis for minDuration seconds, two edges of a rule being
+    at least debounce seconds apart. A falling rule works the other way, under the threshold. The rules of
+    each device are compiled into arrays so that each frame checks all of them at once.
+
+    """
+
+    def __init__(self):
+        #print("\033[0;35;40m __init__().StretchSenseEventEngine()\033[0m")
+
+        self.listRules = []
+        self.listSubscribers = []
+
+        # Arrays of the rules of each device, compiled when needed
+        self.dictCompiled = None
+        self.lock = Lock()
+
+    def addRule(self, addr, channel, threshold, hysteresis=0.0, minDuration=0.0, debounce=0.0, falling=False, name=None):
+
+        """
+
+        Add a threshold rule.
+
+        :param addr: string :
+            Address of the device.
+
+        :param channel: int :
+            Channel number.
+
+        :param threshold: float :
+            Value crossed to activate the rule.
+
+        :param hysteresis: float :
+            Distance back from the threshold needed to release the rule.
+
+        :param minDuration: float :
+            Time in seconds the channel has to stay past the threshold, or back, for an edge.
+
+        :param debounce: float :
+            Minimum time in seconds between two edges of the rule.
+
+        :param falling: bool :
+            True to activate the rule when the value goes under the threshold.
+
+        :param name: string :
+            Name given to the events, "<addr>/<channel>" when omitted.
+
+        :returns: string : Name of the rule.
+
+        """
+
+        if name is None:
+            name = "%s/%s" % (addr, channel)
+
+        with self.lock:
+            self.listRules.append({"name": name, "addr": addr, "channel": int(channel), "threshold": float(threshold),
+                                   "hysteresis": float(hysteresis), "minDuration": minDuration, "debounce": debounce,
+                                   "falling": falling})
+            self.dictCompiled = None
+
+        return name
+
+    def removeRule(self, name):
+
+        """
+
+        Remove every rule with a name.
+
+        :param name: string :
+            Name of the rule.
+
+        """
+
+        with self.lock:
+            self.listRules = [rule for rule in self.listRules if rule["name"] != name]
+            self.dictCompiled = None
+
+    def subscribe(self, callback):
+
+        """
+
+        Call a function on each event.
+
+        :param callback: function :
+            Called as callback(event) with a StretchSenseEvent, from the thread reading the frames.
+
+        """
+
+        self.listSubscribers.append(callback)
+
+    def unsubscribe(self, callback):
+
+        """
+
+        Stop calling a function given to subscribe().
+
+        :param callback: function :
+            Function to remove.
+
+        """
+
+        if callback in self.listSubscribers:
+            self.listSubscribers.remove(callback)
+
+    def compile(self):
+
+        """
+
+        Gather the rules of each device into arrays, the state of every rule starts again.
+
+        :returns: {addr: dict} : Arrays of the rules of each device.
+
+        """
+
+        dictRules = collections.defaultdict(list)
+
+        for rule in self.listRules:
+            dictRules[rule["addr"]].append(rule)
+
+        dictCompiled = {}
+
+        for (addr, listRules) in dictRules.items():
+            sign = np.array([-1.0 if rule["falling"] else 1.0 for rule in listRules])
+            dictCompiled[addr] = {"rules": listRules,
+                                  "channel": np.array([rule["channel"] for rule in listRules], dtype=np.intp),
+                                  "sign": sign,
+                                  "activate": sign * np.array([rule["threshold"] for rule in listRules]),
+                                  "release": sign * np.array([rule["threshold"] for rule in listRules]) - np.array([rule["hysteresis"] for rule in listRules]),
+                                  "minDuration": np.array([int(rule["minDuration"] * 1e9) for rule in listRules], dtype=np.int64),
+                                  "debounce": np.array([int(rule["debounce"] * 1e9) for rule in listRules], dtype=np.int64),
+                                  "active": np.zeros(len(listRules), dtype=bool),
+                                  "pending": np.full(len(listRules), -1, dtype=np.int64),
+                                  "lastEdge": np.full(len(listRules), np.iinfo(np.int64).min // 2, dtype=np.int64)}
+
+        return dictCompiled
+
+    def process(self, batch):
+
+        """
+
+        Check the rules of each device against the frames of the batch in order, and call the subscribers
+        with a StretchSenseEvent for each edge found. The batch is returned unchanged.
+
+        :param batch: [StretchSenseFrame] :
+            Frames received.
+
+        :returns: [StretchSenseFrame] : Same frames.
+
+        """
+
+        with self.lock:
+            if self.dictCompiled is None:
+                self.dictCompiled = self.compile()
+            dictCompiled = self.dictCompiled
+
+        for frame in batch:
+            compiled = dictCompiled.get(frame.addr)
+
+            if compiled is None:
+                continue
+
+            channel = compiled["channel"]
+            values = np.asarray(frame.values, dtype=np.float64)
+            valid = channel < len(values)
+            x = compiled["sign"] * values[np.where(valid, channel, 0)]
+            active = compiled["active"]
+            pending = compiled["pending"]
+            timestamp = frame.timestamp
+
+            # Rules past their threshold, to activate or to release
+            crossing = valid & np.where(active, x < compiled["release"], x > compiled["activate"])
+            pending[~crossing] = -1
+            pending[crossing & (pending < 0)] = timestamp
+
+            edges = crossing & (timestamp - pending >= compiled["minDuration"]) & (timestamp - compiled["lastEdge"] >= compiled["debounce"])
+
+            if not edges.any():
+                continue
+
+            for index in np.flatnonzero(edges).tolist():
+                event = StretchSenseEvent()
+                event.name = compiled["rules"][index]["name"]
+                event.addr = frame.addr
+                event.channel = int(channel[index])
+                event.edge = EDGE_FALLING if active[index] else EDGE_RISING
+                event.timestamp = timestamp
+                event.value = float(values[channel[index]])
+
+                for callback in list(self.listSubscribers):
+                    callback(event)
+
+            active[edges] = ~active[edges]
+            pending[edges] = -1
+            compiled["lastEdge"][edges] = timestamp
+
+        return batch
+
+
+"""
+
+Class StretchSenseCapture : Recording of the frames around events only
+
+"""
+
+
+class StretchSenseCapture(object):
+    #print("\033[0;35;40m StretchSenseCapture()\033[0m")
+
+    """
+    Processing stage which keeps the last preTime seconds of frames of each device in memory, and writes
+    them to a new capture file when trigger() is called, followed by the frames received during the next
+    postTime seconds. A trigger arriving while a capture is written extends it instead of starting another
+    one. Triggers can come from the application, from a StretchSenseEventEngine with handleEvent(), from a
+    GPIO input with enableGpioTrigger() or from an uncaught exception with enableCrashTrigger().
+
+    Each row of a capture holds the address of the device, the time in seconds from the first trigger and
+    the values of the frame. The .json sidecar gives the date of the first trigger. A capture is finished
+    postTime seconds after its last trigger even if no frame arrives anymore.
+
+    :param directory: string:
+        Folder where the captures are written.
 
-        newSensor7 = StretchSensePeripheral()
-        newSensor7.addr = peripheral.addr
-        newSensor7.uuid = peripheral.uuid
-        newSensor7.value = 0
-        newSensor7.gen = peripheral.gen
-        newSensor7.channelNumber = 6
+    :param preTime: float:
+        Time in seconds kept before a trigger.
 
-        newSensor8 = StretchSensePeripheral()
-        newSensor8.addr = peripheral.addr
-        newSensor8.uuid = peripheral.uuid
-        newSensor8.value = 0
-        newSensor8.gen = peripheral.gen
-        newSensor8.channelNumber = 7
+    :param postTime: float:
+        Time in seconds recorded after the last trigger.
 
-        newSensor9 = StretchSensePeripheral()
-        newSensor9.addr = peripheral.addr
-        newSensor9.uuid = peripheral.uuid
-        newSensor9.value = 0
-        newSensor9.gen = peripheral.gen
-        newSensor9.channelNumber = 8
+    :param sampleRate: int:
+        Number of frames per second expected from one device, the memory kept grows if a device is faster.
 
-        newSensor10 = StretchSensePeripheral()
-        newSensor10.addr = peripheral.addr
-        newSensor10.uuid = peripheral.uuid
-        newSensor10.value = 0
-        newSensor10.gen = peripheral.gen
-        newSensor10.channelNumber = 9
+    :param api: StretchSenseAPI:
+        API whose clock gives the date of the captures, so that they match its recordings.
 
-        self.listPeripheralIsConnected.append(newSensor1)
-        self.listPeripheralIsConnected.append(newSensor2)
-        self.listPeripheralIsConnected.append(newSensor3)
-        self.listPeripheralIsConnected.append(newSensor4)
-        self.listPeripheralIsConnected.append(newSensor5)
-        self.listPeripheralIsConnected.append(newSensor6)
-        self.listPeripheralIsConnected.append(newSensor7)
-        self.listPeripheralIsConnected.append(newSensor8)
-        self.listPeripheralIsConnected.append(newSensor9)
-        self.listPeripheralIsConnected.append(newSensor10)
+    """
 
-    def ble_discoverServices(self):
-        #print("\033[0;35;40m ble_discoverServices()\033[0m")
+    # Highest number of frames per second kept for one device
+    maximumSampleRate = 2000
+
+    def __init__(self, directory, preTime=5.0, postTime=5.0, sampleRate=200, api=None):
+        #print("\033[0;35;40m __init__().StretchSenseCapture()\033[0m")
+
+        self.directory = directory
+        self.preTime = int(preTime * 1e9)
+        self.postTime = int(postTime * 1e9)
+        self.length = int(preTime * sampleRate) + 1
+        self.maximumLength = int(preTime * self.maximumSampleRate) + 1
+        self.dictBuffer = {}
+        self.lock = Lock()
+
+        # Rows and closes queued under lock, written in order by flush() without holding lock
+        self.listPending = []
+        self.writeLock = Lock()
+
+        # Ends the capture being written when no frame arrives after its window
+        self.closeTimer = None
+
+        # Capture being written, timestamp of its first trigger and end of its window
+        self.recorder = None
+        self.timeTrigger = 0
+        self.timeEnd = 0
+        self.numberOfCaptures = 0
+        self.listCaptures = []
+
+        # Wall clock and monotonic clock read at the same time, the ones of the API when given
+        if api is not None:
+            self.timeAnchor = api.timeAnchor
+        else:
+            self.timeAnchor = (time.time_ns(), time.monotonic_ns())
+
+    def trigger(self, reason="api", timestamp=None):
 
         """
 
-        Display on the terminal all the services for each StretchSense devices connected.
+        Write the frames of the last preTime seconds to a new capture, or extend the capture being written.
+
+        :param reason: string :
+            Cause of the trigger, added to the name of the capture.
+
+        :param timestamp: int :
+            Time of the trigger in nanoseconds given by time.monotonic_ns(), now if omitted.
 
         """
 
-        for myPeripheral in self.listPeripheralInUse:
+        if timestamp is None:
+            timestamp = time.monotonic_ns()
 
-            listOfServices = sorted(myPeripheral.services, key=lambda services: services.hndStart)
+        with self.lock:
 
-            for services in listOfServices:
+            if self.recorder is not None:
+                self.timeEnd = max(self.timeEnd, timestamp + self.postTime)
+                return
 
-                print(services)
+            self.startCloseTimerLocked(timestamp + self.postTime)
 
-    def ble_discoverCharacteristics(self):
-        #print("\033[0;35;40m ble_discoverCharacteristics()\033[0m")
+            self.numberOfCaptures += 1
+            filename = os.path.join(self.directory, "Capture_%s_%03d_%s.csv" % (time.strftime("%Y%m%d_%H%M%S"), self.numberOfCaptures,
+                                                                                re.sub(r"[^0-9A-Za-z_-]", "_", str(reason))))
+            self.recorder = StretchSenseRecorder(filename, "Address, Sample Time, Values\n", columns=[],
+                                                 startTime=(self.timeAnchor[0] + timestamp - self.timeAnchor[1]) / 1e9)
+            self.listCaptures.append(self.recorder)
+            self.timeTrigger = timestamp
+            self.timeEnd = timestamp + self.postTime
 
-        """
-        Display on the terminal all the characteristics for each StretchSense devices connected.
+            # Frames kept in memory, every device merged in the order of their timestamps
+            listRows = []
 
-        """
+            for (addr, myBuffer) in self.dictBuffer.items():
+                (timestamps, values) = myBuffer.getSince(timestamp - self.preTime)
+                listRows.extend(zip(timestamps.tolist(), [addr] * len(timestamps), values.tolist()))
 
-        for myPeripheral in self.listPeripheralInUse:
+            listRows.sort(key=lambda row: row[0])
 
-            listOfServices = sorted(myPeripheral.services, key=lambda services: services.hndStart)
+            for (frameTimestamp, addr, values) in listRows:
+                self.queueLocked(addr, frameTimestamp, values)
 
-            for services in listOfServices:
+        self.flush()
 
-                characteristics = services.getCharacteristics()
+    def startCloseTimerLocked(self, timeEnd):
 
-                for chars in characteristics:
+        """
 
-                    print(chars)
+        Check at timeEnd if the capture being written is finished.
 
-    def ble_updateOneChannelWithNotifications(self, data, addr):
-        #print("\033[0;35;40m ble_updateOneChannelWithNotifications()\033[0m")
+        :param timeEnd: int :
+            Time in nanoseconds given by time.monotonic_ns().
 
         """
 
-        Update data from one or more StretchSense gen2 devices connected using BLE notifications
-        and stores its value.
+        if self.closeTimer is not None:
+            self.closeTimer.cancel()
 
-        :param data: UTF-8 characters :
-            data transmitted by the device once a notification is detected.
+        self.closeTimer = Timer(max(timeEnd - time.monotonic_ns(), 0) / 1e9, self.closeExpired)
+        self.closeTimer.daemon = True
+        self.closeTimer.start()
 
-        :param addr: string :
-            Address of the gen2 we want to update.
+    def closeExpired(self):
 
         """
 
-        numberOfPeripheralConnected = len(globalSensor)
+        Finish the capture being written once its window is over, called by the close timer.
 
-        if numberOfPeripheralConnected >= 1:
-            for myPeripheral in globalSensor:
-                if myPeripheral.addr == addr:
-                    decimalValue = int(binascii.b2a_hex(data), 16) / 10.0
-                    myPeripheral.value = decimalValue
-                    #print("myPeripheral.value = ", myPeripheral.value)
+        """
 
-    def ble_updateOneChannel(self):
-        #print("\033[0;35;40m ble_updateOneChannel()\033[0m")
+        with self.lock:
+
+            if self.recorder is None:
+                return
+
+            # A later trigger extended the window
+            if time.monotonic_ns() < self.timeEnd:
+                self.startCloseTimerLocked(self.timeEnd)
+                return
+
+            self.listPending.append((self.recorder, None))
+            self.recorder = None
+            self.closeTimer = None
+
+        self.flush()
+
+    def queueLocked(self, addr, timestamp, values):
 
         """
 
-        Update once the value of every StretchSense gen2 devices connected without using BLE notifications.
+        Queue one frame for the capture being written.
 
         """
 
-        numberOfPeripheralConnected = len(self.listPeripheralIsConnected)
+        self.listPending.append((self.recorder, "%s ,%s ," % (addr, (timestamp - self.timeTrigger) / 1e9) +
+                                 "".join("%s ," % value for value in values) + "\n"))
 
-        if numberOfPeripheralConnected >= 1:
+    def flush(self):
 
-            for myPeripheral in self.listPeripheralInUse:
+        """
 
-                for myPeripheralConnected in self.listPeripheralIsConnected:
+        Write the rows queued and close the captures finished, in the order they were queued.
 
-                    if (myPeripheralConnected.gen == 2) & (myPeripheralConnected.addr == myPeripheral.addr):
-                        characteristics = myPeripheral.getCharacteristics()
+        """
 
-                        for chars in characteristics:
+        with self.writeLock:
 
-                            if chars.uuid == self.dataUUID2:
-                                handler = chars.getHandle()
-                                value = myPeripheral.readCharacteristic(handler)
-                                decimalValue = int(binascii.b2a_hex(value), 16) / 10.0
-                                myPeripheralConnected.value = decimalValue
-                                print("myPeripheralConnected.value = ", myPeripheralConnected.value)
+            with self.lock:
+                listPending = self.listPending
+                self.listPending = []
 
-    def ble_updateTenChannelWithNotifications(self, data, addr):
-        #print("\033[0;35;40m ble_updateTenChannelWithNotifications()\033[0m")
+            for (recorder, line) in listPending:
+                if line is None:
+                    recorder.close()
+                else:
+                    recorder.write(line)
 
-        """
+    def close(self):
 
-        Update data from one or more StretchSense gen3 devices connected using BLE notifications
-        and stores its value.
+        """
 
-        :param data: UTF-8 characters :
-            data transmitted by the device once a notification is detected.
+        Finish the capture being written without waiting for the end of its window.
 
-        :param addr: string :
-            Address of the gen3 we want to update.
+        :returns: [string] : Path of the files of the capture, empty if no capture was written.
 
         """
 
-        numberOfPeripheralConnected = len(globalSensor)
+        with self.lock:
 
-        if numberOfPeripheralConnected >= 10:
-            for myPeripheral in globalSensor:
-                if myPeripheral.addr == addr:
-                    index = globalSensor.index(myPeripheral)
+            if self.closeTimer is not None:
+                self.closeTimer.cancel()
+                self.closeTimer = None
 
-                    decimalValue = (binascii.b2a_hex(data))
-                    splitted = [decimalValue[i:i + 4] for i in range(0, len(decimalValue), 4)]
-                    globalSensor[index + 0].value = int((splitted[0]), 16) / 10.0
-                    globalSensor[index + 1].value = int((splitted[1]), 16) / 10.0
-                    globalSensor[index + 2].value = int((splitted[2]), 16) / 10.0
-                    globalSensor[index + 3].value = int((splitted[3]), 16) / 10.0
-                    globalSensor[index + 4].value = int((splitted[4]), 16) / 10.0
-                    globalSensor[index + 5].value = int((splitted[5]), 16) / 10.0
-                    globalSensor[index + 6].value = int((splitted[6]), 16) / 10.0
-                    globalSensor[index + 7].value = int((splitted[7]), 16) / 10.0
-                    globalSensor[index + 8].value = int((splitted[8]), 16) / 10.0
-                    globalSensor[index + 9].value = int((splitted[9]), 16) / 10.0
-                    break
+            recorder = self.recorder
 
-    def ble_updateTenChannel(self):
-        #print("\033[0;35;40m ble_updateTenChannel()\033[0m")
+            if recorder is None:
+                return []
+
+            self.listPending.append((recorder, None))
+            self.recorder = None
+
+        self.flush()
+        return list(recorder.listSegment)
+
+    def process(self, batch):
 
         """
 
-        Update once the value of every StretchSense gen3 devices connected without BLE using notifications.
+        Keep the frames of the batch in the memory of their device, and append them to the capture being
+        written until the end of its window. The batch is returned unchanged.
+
+        :param batch: [StretchSenseFrame] :
+            Frames received.
+
+        :returns: [StretchSenseFrame] : Same frames.
 
         """
 
-        numberOfPeripheralConnected = len(self.listPeripheralIsConnected)
+        with self.lock:
 
-        if numberOfPeripheralConnected >= 10:
+            for frame in batch:
+                myBuffer = self.dictBuffer.get(frame.addr)
 
-            for myPeripheral in self.listPeripheralInUse:
+                if myBuffer is None or myBuffer.numberOfChannels != len(frame.values):
+                    myBuffer = StretchSenseRingBuffer(len(frame.values), self.length, np.float64)
+                    self.dictBuffer[frame.addr] = myBuffer
 
-                for myPeripheralConnected in self.listPeripheralIsConnected:
+                # A full buffer which does not cover preTime is too small for the rate of the device
+                elif (myBuffer.count == myBuffer.length and myBuffer.length < self.maximumLength and
+                        frame.timestamp - myBuffer.timestamps[myBuffer.index] < self.preTime):
+                    myBuffer.resize(min(2 * myBuffer.length, self.maximumLength))
 
-                    if (myPeripheralConnected.gen == 3) & (myPeripheralConnected.addr == myPeripheral.deviceAddr):
-                        characteristics = myPeripheral.getCharacteristics()
+                myBuffer.push(frame.timestamp, frame.values)
 
-                        for chars in characteristics:
+                if self.recorder is None:
+                    continue
 
-                            if chars.uuid == (self.dataUUID3 or self.dataUUID10TT):
-                                handler = chars.getHandle()
-                                value = myPeripheral.readCharacteristic(handler)
-                                decimalValue = (binascii.b2a_hex(value))
-                                splitted = [decimalValue[i:i + 4] for i in range(0, len(decimalValue), 4)]
+                if frame.timestamp > self.timeEnd:
+                    self.listPending.append((self.recorder, None))
+                    self.recorder = None
+                    continue
 
-                                for channel in range(0, 10, 1):
+                self.queueLocked(frame.addr, frame.timestamp, frame.values)
 
-                                    if channel == myPeripheralConnected.channelNumber:
-                                        myPeripheralConnected.value = int((splitted[channel]), 16) / 10.0
-                                        print("myPeripheralConnected.value = ", myPeripheralConnected.value)
-                                        break
-                                break
+        # The files are written without holding lock, a trigger does not wait for the disk
+        self.flush()
 
-    def ble_updateAllPeripherals(self):
-        #print("\033[0;35;40m ble_updateAllPeripherals()\033[0m")
+        return batch
+
+    def handleEvent(self, event):
 
         """
 
-        Update the value of the capacitance of each StretchSense devices which are connected.
+        Trigger a capture on an event, to be given to StretchSenseEventEngine.subscribe().
 
-        """
+        :param event: StretchSenseEvent :
+            Event received.
 
-        listPeripheralUpdated = []
-        numberOfPeripheralInUse = len(self.listPeripheralInUse)
+        """
 
-        if numberOfPeripheralInUse > 0:
+        if event.edge == EDGE_RISING:
+            self.trigger(event.name, event.timestamp)
 
-            for myPeripheral in self.listPeripheralInUse:
+    def enableGpioTrigger(self, pin, edge=None, bounceTime=200):
 
-                if myPeripheral.deviceAddr != '':
-                    skipThisPeripheral = False
+        """
 
-                    for myPeripheralUpdated in listPeripheralUpdated:
+        Trigger a capture on an edge of a GPIO input.
 
-                        if myPeripheral.addr == myPeripheralUpdated.deviceAddr:
-                            skipThisPeripheral = True
+        :param pin: int :
+            GPIO used, numbered as GPIOLAYOUT.
 
-                    if skipThisPeripheral is False:
-                        listOfServices = sorted(myPeripheral.services, key=lambda services: services.hndStart)
+        :param edge: int :
+            GPIO.RISING, GPIO.FALLING or GPIO.BOTH, GPIO.RISING when omitted.
 
-                        for services in listOfServices:
+        :param bounceTime: int :
+            Time in milliseconds during which the next edges are ignored.
 
-                            if services.hndStart == services.hndEnd:
-                                continue
+        """
 
-                            if services.uuid == self.serviceUUID2:
-                                self.ble_updateOneChannel()
-                                listPeripheralUpdated.append(myPeripheral)
-                                continue
+        if edge is None:
+            edge = GPIO.RISING
 
-                            if services.uuid == self.serviceUUID3:
-                                self.ble_updateTenChannel()
-                                listPeripheralUpdated.append(myPeripheral)
-                                continue
+        GPIO.setup(pin, GPIO.IN)
+        GPIO.add_event_detect(pin, edge, callback=lambda channel: self.trigger("gpio%s" % channel), bouncetime=bounceTime)
 
-    def ble_waitNotifications(self):
-        #print("\033[0;35;40m ble_waitNotifications()\033[0m")
+    def enableCrashTrigger(self):
 
         """
-        When called, run into all connected devices waiting for notification from each of them
-        and store the new data in their value slot.
+
+        Write the frames kept in memory when an exception is not caught, in the main thread or in any other
+        thread, before the previous exception handler is called.
 
         """
 
-        numberOfPeripheralInUse = len(self.listPeripheralInUse)
+        previousExceptHook = sys.excepthook
+        previousThreadExceptHook = threading.excepthook
 
-        if numberOfPeripheralInUse > 0:
+        def exceptHook(exceptionType, exception, traceback):
+            self.trigger("crash")
+            self.close()
+            previousExceptHook(exceptionType, exception, traceback)
 
-            global globalSensor
-            globalSensor = self.listPeripheralIsConnected
+        def threadExceptHook(arguments):
+            self.trigger("crash")
+            self.close()
+            previousThreadExceptHook(arguments)
+
+        sys.excepthook = exceptHook
+        threading.excepthook = threadExceptHook
+
+
+"""
+
+Class StretchSenseSpiTuner : Choice of the output data rate and filter of the 16FGV1.0
+
+"""
 
-            for myPeripheral in self.listPeripheralInUse:
-                if myPeripheral.waitForNotifications(0.001):
-                    continue
-                self.listPeripheralIsConnected = globalSensor
+
+class StretchSenseSpiTuner(object):
+    #print("\033[0;35;40m StretchSenseSpiTuner()\033[0m")
 
     """
+    Class which measures the 16FGV1.0 at several output data rates and filters, and chooses the fastest
+    configuration whose noise is low enough. Each configuration is written with spi_reconfigure() and read
+    with spi_mode() for measureTime seconds, the sensors must stay at rest and the acquisition must not be
+    read by another thread while measuring. The measures are kept per board in a JSON cache file, so only
+    new configurations are measured again until clearCache() is called, after the sensors are replaced.
 
-    Functions : Lists of Peripherals
+    The noise of a channel is the standard deviation of its values. The sample rate is the number of frames
+    per second when each read waits for the interrupt or the trigger of a new sample, and the nominal output
+    data rate when the bus is polled, since values which repeat cannot be told apart from new samples with
+    the sensors at rest. The group delay and the time the filter takes to settle are given by
+    StretchSenseAPI.spi_getFilterTiming(). While measuring auto-range is suspended and the frames of the
+    board are kept from the readers of getFrames(), the measures are kept per resolution.
+
+    :param api: StretchSenseAPI :
+        API with its SPI bus set up.
+
+    :param cacheFilename: string :
+        Path of the JSON cache file, measures are not kept if None.
+
+    :param measureTime: float :
+        Time in seconds each configuration is read.
+
+    :param settleTime: float :
+        Time in seconds ignored after each configuration is written, in addition to the length of the filter.
 
     """
 
-    def ble_getListPeripheralAvailable(self):
-        #print("\033[0;35;40m ble_getListPeripheralAvailable()\033[0m")
+    listFilterMode = [FILTER_0PT, FILTER_1PT, FILTER_3PT, FILTER_7PT, FILTER_15PT, FILTER_31PT, FILTER_63PT,
+                      FILTER_127PT, FILTER_255PT]
 
-        """
+    def __init__(self, api, cacheFilename=None, measureTime=1.0, settleTime=0.05):
+        #print("\033[0;35;40m __init__().StretchSenseSpiTuner()\033[0m")
 
-        Returns the list of all devices available in the area.
+        self.api = api
+        self.cacheFilename = cacheFilename
+        self.measureTime = measureTime
+        self.settleTime = settleTime
+        self.dictCache = {}
 
-        :returns: [Peripheral] : List of all the devices available.
+        if cacheFilename is not None and os.path.isfile(cacheFilename):
+            with open(cacheFilename) as myFile:
+                self.dictCache = json.load(myFile)
 
-        """
+    def getBoard(self):
 
-        return self.listPeripheralAvailable
+        """
 
-    def ble_getListAddrPeripheralAvailable(self):
-        #print("\033[0;35;40m ble_getListAddrPeripheralAvailable()\033[0m")
+        :returns: string : Key of the board in the cache, from its address, its place on the bus and its
+            resolution, the noise being measured in the unit of the resolution.
 
         """
 
-        Returns the list of all devices address available in the area.
+        configuration = self.api.spiConfiguration
+        return "%s@%d.%d/%d" % (configuration.addr, configuration.bus, configuration.device, configuration.resolutionMode)
 
-        :returns: [addr] : List of all devices available addresses.
+    def getMeasures(self):
 
         """
 
-        listAddr = []
-        numberOfPeripheralAvailable = len(self.listPeripheralAvailable)
+        :returns: [dict] : Measures of the board kept in the cache.
 
-        if (self.listPeripheralAvailable[0].addr == ''):
-            return 0
+        """
 
-        elif numberOfPeripheralAvailable != 0:
+        return list(self.dictCache.get(self.getBoard(), []))
 
-            for i in [numberOfPeripheralAvailable - 1]:
-                listAddr.append(self.listPeripheralAvailable[i].addr)
-                print(listAddr)
+    def clearCache(self):
 
-        return listAddr
+        """
 
-    def ble_getListPeripheralIsConnected(self):
-        #print("\033[0;35;40m ble_getListPeripheralIsConnected()\033[0m")
+        Forget the measures of the board at every resolution, to tune it again after its sensors have been
+        replaced.
 
         """
 
-        Returns the list of all devices connected.
+        prefix = self.getBoard().rsplit("/", 1)[0] + "/"
 
-        :returns: [StretchSensePeripheral] : List of all devices connected.
+        for board in list(self.dictCache):
+            if board.startswith(prefix):
+                del self.dictCache[board]
+
+        self.saveCache()
+
+    def saveCache(self):
 
         """
 
-        return self.listPeripheralIsConnected
+        Write the measures of every board in the cache file.
 
-    def ble_getListPeripheralOnceConnected(self):
-        #print("\033[0;35;40m ble_getListPeripheralOnceConnected()\033[0m")
+        """
+
+        if self.cacheFilename is None:
+            return
+
+        with open(self.cacheFilename, "w") as myFile:
+            json.dump(self.dictCache, myFile, indent=4)
+
+    def getGroupDelay(self, filterMode, rate):
 
         """
 
-        Returns the list of all devices once connected.
+        :param filterMode: int :
+            Filter, one of the FILTER_* constants, which is its number of points.
 
-        :returns: [StretchSensePeripheral] : List of all devices once connected.
+        :param rate: float :
+            Number of samples per second.
+
+        :returns: float : Delay in seconds between a change of capacitance and the middle of its step, given
+            by StretchSenseAPI.spi_getFilterTiming().
 
         """
 
-        return self.listPeripheralIsOnceConnected
+        return self.api.spi_getFilterTiming(filterMode, rate)[2]
 
-    def ble_getListPeripheralInUse(self):
-        #print("\033[0;35;40m ble_getListPeripheralInUse()\033[0m")
+    def measure(self, odrMode, filterMode):
 
         """
 
-        Returns the list of all devices currently in use.
+        Write a configuration and measure it.
 
-        :returns: [Peripheral] : List of all devices we are using.
+        :param odrMode: int :
+            Output data rate, one of the RATE_* constants.
+
+        :param filterMode: int :
+            Filter, one of the FILTER_* constants.
+
+        :returns: dict : odrMode, filterMode, rate in samples per second, noise of each channel, maxNoise,
+            highest noise of the channels, and groupDelay in seconds.
 
         """
 
-        return self.listPeripheralInUse
+        api = self.api
 
-    def ble_listToCsv(self):
-        #print("\033[0;35;40m ble_listToCsv()\033[0m")
+        # The frames are queued for the tuner only, so they are not changed by the processing stages and not
+        # read by getFrames(). Frames of other devices are given back to the queue of the API.
+        measureQueue = collections.deque(maxlen=api.numberOfFrameQueued)
+
+        # The resolution must not change during the measure
+        with api.spiLock:
+            autoRange = api.autoRange
+            api.autoRange = False
+            (listFrames, api.listFrames) = (api.listFrames, measureQueue)
+
+        try:
+            api.spi_reconfigure(odrMode=odrMode, filterMode=filterMode)
+            epoch = api.spiConfigEpoch
+            configuration = api.spiConfiguration
+            nominalRate = api.dictOutputDataRate.get(odrMode, 0)
+
+            # The filter must be filled with samples of the new configuration
+            settleTime = self.settleTime + api.spi_getFilterTiming(filterMode, nominalRate)[1]
+            timeStart = time.monotonic_ns() + int(settleTime * 1e9)
+            timeEnd = timeStart + int(self.measureTime * 1e9)
+
+            listTimestamps = []
+            listValues = []
+
+            while time.monotonic_ns() < timeEnd:
+                api.spi_mode()
+
+                while measureQueue:
+                    frame = measureQueue.popleft()
+                    if frame.addr != configuration.addr:
+                        listFrames.append(frame)
+                    elif frame.configEpoch == epoch and frame.timestamp >= timeStart:
+                        listTimestamps.append(frame.timestamp)
+                        listValues.append(frame.values)
+
+            values = np.array(listValues, dtype=np.float64).reshape(len(listValues), -1)
+
+            # Each read waits for a new sample with the interrupt or the trigger, a polled bus can be read faster
+            # than the circuit samples, so its rate is the nominal one
+            paced = configuration.interruptMode == INTERRUPT_ENABLED or configuration.triggerMode == TRIGGER_ENABLED
+            duration = (listTimestamps[-1] - listTimestamps[0]) / 1e9 if len(listTimestamps) > 1 else 0.0
+
+            if paced and duration > 0:
+                rate = (len(listTimestamps) - 1) / duration
+            else:
+                rate = float(nominalRate)
+
+            noise = values.std(axis=0).tolist() if len(values) > 0 else []
+
+            return {"odrMode": odrMode, "filterMode": filterMode, "rate": rate, "noise": noise,
+                    "maxNoise": max(noise) if noise else float("inf"), "groupDelay": self.getGroupDelay(filterMode, rate)}
+        finally:
+            with api.spiLock:
+                api.autoRange = autoRange
+                api.autoRangeSince = None
+                api.listFrames = listFrames
+
+            listFrames.extend(frame for frame in measureQueue if frame.addr != api.spiConfiguration.addr)
+
+    def sweep(self, listOdrMode=None, listFilterMode=None, targetNoise=None, maxDelay=None, useCache=True):
 
         """
 
-        Displays on the terminal the values of each connected devices in a csv format.
+        Measure several configurations, the configuration of the board is restored afterwards. Configurations
+        whose group delay would exceed maxDelay are not measured, and longer filters are not measured at a rate
+        once a filter meets targetNoise.
+
+        :param listOdrMode: [int] :
+            Output data rates measured, every rate if None.
+
+        :param listFilterMode: [int] :
+            Filters measured, every filter if None.
+
+        :param targetNoise: float :
+            Highest noise wanted, in the unit of the values.
+
+        :param maxDelay: float :
+            Highest group delay wanted in seconds.
+
+        :param useCache: bool :
+            False to measure again the configurations kept in the cache.
+
+        :returns: [dict] : Measure of each configuration, as given by measure().
 
         """
 
-        listToCsv = ""
-        numberOfPeripheralConnected = len(self.listPeripheralIsConnected)
+        if listOdrMode is None:
+            listOdrMode = sorted(self.api.dictOutputDataRate)
+        if listFilterMode is None:
+            listFilterMode = self.listFilterMode
 
-        if numberOfPeripheralConnected >= 1:
+        board = self.getBoard()
+        dictMeasures = {}
+        if useCache:
+            for result in self.dictCache.get(board, []):
+                dictMeasures[(result["odrMode"], result["filterMode"])] = result
 
-            for myPeripheral in self.listPeripheralIsConnected:
-                listToCsv += ("%s ," % myPeripheral.value)
+        configuration = self.api.spiConfiguration
+        listResults = []
 
-        listToCsv += ("\n")
-        print(listToCsv)
+        try:
+            for odrMode in listOdrMode:
+                for filterMode in sorted(listFilterMode):
 
-    def ble_getValuesCsv(self):
-        #print("\033[0;35;40m ble_getValuesCsv()\033[0m")
+                    if maxDelay is not None and self.getGroupDelay(filterMode, self.api.dictOutputDataRate.get(odrMode, 0)) > maxDelay:
+                        break
+
+                    result = dictMeasures.get((odrMode, filterMode))
+                    if result is None:
+                        result = self.measure(odrMode, filterMode)
+                        dictMeasures[(odrMode, filterMode)] = result
+
+                    listResults.append(result)
+
+                    if targetNoise is not None and result["maxNoise"] <= targetNoise:
+                        break
+        finally:
+            self.api.spi_reconfigure(configuration=configuration)
+
+            self.dictCache[board] = list(dictMeasures.values())
+            self.saveCache()
+
+        return listResults
+
+    def recommend(self, listResults, targetNoise, maxDelay=None):
 
         """
 
-        Returns the values of each connected devices in a csv format.
+        Choose among measures the configuration with the smallest group delay whose noise is below targetNoise,
+        or the least noisy one when none is quiet enough.
 
-        :returns: string : Values of each connected devices.
+        :param listResults: [dict] :
+            Measures given by sweep() or measure().
+
+        :param targetNoise: float :
+            Highest noise wanted, in the unit of the values.
+
+        :param maxDelay: float :
+            Highest group delay accepted in seconds, no limit if None.
+
+        :returns: dict : The measure chosen, with meetsTarget False if it is too noisy, None if no measure
+            fits in maxDelay.
 
         """
 
-        listToReturn = ""
-        numberOfPeripheralConnected = len(self.listPeripheralIsConnected)
+        listCandidates = [result for result in listResults if maxDelay is None or result["groupDelay"] <= maxDelay]
 
-        if numberOfPeripheralConnected > 0:
+        if len(listCandidates) == 0:
+            return None
 
-            for myPeripheral in self.listPeripheralIsConnected:
-                listToReturn += ("%s , " % myPeripheral.value)
+        listQuiet = [result for result in listCandidates if result["maxNoise"] <= targetNoise]
 
-        return listToReturn
+        if listQuiet:
+            best = min(listQuiet, key=lambda result: (result["groupDelay"], -result["rate"]))
+        else:
+            best = min(listCandidates, key=lambda result: (result["maxNoise"], result["groupDelay"]))
 
+        best = dict(best)
+        best["meetsTarget"] = best["maxNoise"] <= targetNoise
+        return best
 
-"""
+    def tune(self, targetNoise, maxDelay=None, apply=True, useCache=True):
 
-Class StretchSenseDelegate : Class to handle the BLE notifications
+        """
 
-"""
+        Sweep the configurations which fit in maxDelay and choose one with recommend().
 
+        :param targetNoise: float :
+            Highest noise wanted, in the unit of the values.
 
-class StretchSenseDelegate(btle.DefaultDelegate):
-    #print("\033[0;35;40m StretchSenseDelegate()\033[0m")
+        :param maxDelay: float :
+            Highest group delay accepted in seconds, no limit if None.
 
-    def __init__(self, peripheral):
-        #print("\033[0;35;40m __init__().StretchSenseDelegate()\033[0m")
+        :param apply: bool :
+            True to write the configuration chosen with spi_reconfigure().
 
-        btle.DefaultDelegate.__init__(self)
-        self.peripheral = peripheral
-        self.addr = self.peripheral.addr
+        :param useCache: bool :
+            False to measure again the configurations kept in the cache.
 
-    def handleNotification(self, cHandle, data):
-        #print("\033[0;35;40m StretchSenseDelegateHandleNotification()\033[0m")
+        :returns: dict : The measure chosen, as given by recommend().
 
-        for myPeripheral in globalSensor:
+        """
 
-            if myPeripheral.addr == self.addr:
-                if myPeripheral.uuid == StretchSenseAPI.serviceUUID2:
-                    StretchSenseAPI.ble_updateOneChannelWithNotifications(self, data, self.addr)
+        listResults = self.sweep(targetNoise=targetNoise, maxDelay=maxDelay, useCache=useCache)
+        best = self.recommend(listResults, targetNoise, maxDelay)
 
-                if myPeripheral.uuid == StretchSenseAPI.serviceUUID3:
-                    StretchSenseAPI.ble_updateTenChannelWithNotifications(self, data, self.addr)
+        if apply and best is not None:
+            self.api.spi_reconfigure(odrMode=best["odrMode"], filterMode=best["filterMode"])
+
+        return best
 
-                if myPeripheral.uuid == StretchSenseAPI.serviceUUID10TT:
-                    StretchSenseAPI.ble_updateTenChannelWithNotifications(self, data, self.addr)
-                break
 
 """
 
@@ -0,0 +1,141 @@
+"""
+
+Stand-ins of RPi.GPIO, spidev and bluepy, installed in sys.modules before stretchSenseLibrary is imported, so
+the tests run on any machine and never drive the pins, the SPI bus or the Bluetooth adapters. Import this
+module before stretchSenseLibrary in every test module.
+
+"""
+
+import os
+import sys
+import types
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+
+class SpiDev(object):
+
+    """
+    Bus which records the transfers, the 16FGV1.0 answers with the bytes returned by respond().
+    """
+
+    def __init__(self):
+        self.sent = []
+        self.isOpen = False
+        self.numberOfOpen = 0
+
+    def open(self, bus, device):
+        self.bus = bus
+        self.device = device
+        self.isOpen = True
+        self.numberOfOpen += 1
+
+    def close(self):
+        self.isOpen = False
+
+    def respond(self, data):
+        return [0] * len(data)
+
+    def xfer2(self, data):
+        self.sent.append(list(data))
+        return list(self.respond(data))
+
+
+class BTLEException(Exception):
+    pass
+
+
+class DefaultDelegate(object):
+
+    def __init__(self):
+        pass
+
+
+class Peripheral(object):
+
+    def __init__(self, deviceAddr=None, addrType="public", iface=None):
+        self.addr = deviceAddr
+        self.addrType = addrType
+        self.iface = iface
+        self.delegate = None
+
+    def withDelegate(self, delegate):
+        self.delegate = delegate
+        return self
+
+    def setDelegate(self, delegate):
+        self.delegate = delegate
+
+    def waitForNotifications(self, timeout):
+        return False
+
+    def disconnect(self):
+        pass
+
+
+class Scanner(object):
+
+    def __init__(self, iface=0):
+        self.iface = iface
+        self.delegate = None
+
+    def withDelegate(self, delegate):
+        self.delegate = delegate
+        return self
+
+    def scan(self, timeout=10):
+        return []
+
+    def clear(self):
+        pass
+
+    def start(self, passive=False):
+        pass
+
+    def process(self, timeout=10):
+        pass
+
+    def stop(self):
+        pass
+
+
+def makeModule(name, **attributes):
+    module = types.ModuleType(name)
+    module.__dict__.update(attributes)
+    sys.modules[name] = module
+    return module
+
+
+def doNothing(*args, **kwargs):
+    return None
+
+
+GPIO = makeModule("RPi.GPIO", BOARD=10, BCM=11, IN=1, OUT=0, HIGH=1, LOW=0, RISING=31, FALLING=32, BOTH=33,
+                  setmode=doNothing, setwarnings=doNothing, setup=doNothing, output=doNothing,
+                  input=lambda pin: 0, wait_for_edge=doNothing, add_event_detect=doNothing,
+                  remove_event_detect=doNothing, cleanup=doNothing)
+RPi = makeModule("RPi", GPIO=GPIO)
+spidev = makeModule("spidev", SpiDev=SpiDev)
+btle = makeModule("bluepy.btle", BTLEException=BTLEException, DefaultDelegate=DefaultDelegate,
+                  Peripheral=Peripheral, Scanner=Scanner, ADDR_TYPE_PUBLIC="public",
+                  ADDR_TYPE_RANDOM="random", helperExe="bluepy-helper")
+bluepy = makeModule("bluepy", btle=btle)
+
+
+def makeFrame(addr, timestamp, values, scalingFactor=None, gen=3):
+
+    """
+
+    :returns: StretchSenseFrame : Frame of a device with the values given.
+
+    """
+
+    import stretchSenseLibrary
+
+    frame = stretchSenseLibrary.StretchSenseFrame()
+    frame.addr = addr
+    frame.gen = gen
+    frame.timestamp = timestamp
+    frame.values = list(values)
+    frame.scalingFactor = scalingFactor
+    return frame
@@ -0,0 +1,59 @@
+"""
+
+Tests of the spreading of the BLE connections over several adapters.
+
+"""
+
+import unittest
+
+import stretchSenseStubs
+import stretchSenseLibrary as lib
+
+
+class TestAdapterManager(unittest.TestCase):
+
+    def setUp(self):
+        self.manager = lib.StretchSenseAdapterManager([0, 1])
+
+    def testBestRssi(self):
+        self.manager.setRssi("aa", 0, -80)
+        self.manager.setRssi("aa", 1, -50)
+
+        self.assertEqual(self.manager.selectAdapter("aa"), 1)
+
+    def testFewestConnections(self):
+        self.manager.setRssi("aa", 0, -40)
+        self.manager.setRssi("bb", 0, -40)
+        self.manager.setRssi("bb", 1, -90)
+
+        self.manager.setConnected("aa", self.manager.selectAdapter("aa"))
+        self.assertEqual(self.manager.selectAdapter("bb"), 1)
+        self.manager.setConnected("bb", 1)
+
+        self.assertEqual(self.manager.getConnected(), {"aa": 0, "bb": 1})
+
+    def testKeepAdapter(self):
+        self.manager.setRssi("aa", 1, -40)
+        self.manager.setConnected("aa", self.manager.selectAdapter("aa"))
+        self.manager.setDisconnected("aa")
+        self.manager.setRssi("aa", 0, -30)
+
+        self.assertEqual(self.manager.getConnected(), {})
+        self.assertEqual(self.manager.selectAdapter("aa"), 1)
+
+    def testDisconnectAll(self):
+        self.manager.setConnected("aa", 0)
+        self.manager.setConnected("bb", 1)
+        self.manager.setDisconnected()
+
+        self.assertEqual(self.manager.getConnected(), {})
+
+    def testAdapterRemoved(self):
+        self.manager.setConnected("aa", self.manager.selectAdapter("aa"))
+        self.manager.listHci = [1]
+
+        self.assertEqual(self.manager.selectAdapter("aa"), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
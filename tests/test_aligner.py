@@ -0,0 +1,59 @@
+"""
+
+Tests of the resampling of the devices on a common clock.
+
+"""
+
+import unittest
+
+import stretchSenseStubs
+import stretchSenseLibrary as lib
+from stretchSenseStubs import makeFrame
+
+
+class TestAligner(unittest.TestCase):
+
+    def testLinear(self):
+        aligner = lib.StretchSenseAligner(rate=100, staleTime=0.05)
+
+        for index in range(11):
+            aligner.push(makeFrame("a", index * 20000000, [index * 2.0]))
+            aligner.push(makeFrame("b", index * 20000000 + 5000000, [100.0]))
+
+        batch = aligner.pop()
+        self.assertTrue(len(batch) > 0)
+
+        for frame in batch:
+            if frame.addr == "a":
+                self.assertAlmostEqual(frame.values[0], frame.timestamp / 1e7)
+            self.assertEqual(frame.timestamp % 10000000, 0)
+
+    def testStale(self):
+        aligner = lib.StretchSenseAligner(rate=100, staleTime=0.03, mode=lib.ALIGN_HOLD)
+
+        for index in range(10):
+            aligner.push(makeFrame("a", index * 10000000, [float(index)]))
+        aligner.push(makeFrame("b", 0, [1.0]))
+
+        dictStale = {}
+        for frame in aligner.pop():
+            dictStale.setdefault(frame.addr, []).append(frame.stale)
+
+        self.assertFalse(any(dictStale["a"]))
+        self.assertFalse(dictStale["b"][0])
+        self.assertTrue(dictStale["b"][-1])
+
+    def testProcess(self):
+        aligner = lib.StretchSenseAligner(rate=100, staleTime=0.02)
+
+        self.assertEqual(aligner.process([makeFrame("a", 0, [0.0])]), [])
+
+        batch = aligner.process([makeFrame("a", index * 10000000, [float(index)]) for index in range(1, 6)])
+
+        self.assertEqual([frame.timestamp for frame in batch], [0, 10000000, 20000000, 30000000])
+        self.assertEqual([frame.values for frame in batch], [[0.0], [1.0], [2.0], [3.0]])
+        self.assertEqual(aligner.process([]), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
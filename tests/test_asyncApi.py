@@ -0,0 +1,82 @@
+"""
+
+Tests of StretchSenseAsyncAPI.
+
+"""
+
+import asyncio
+import os
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+
+import stretchSenseStubs
+import stretchSenseLibrary as lib
+
+
+class TestAsyncApi(unittest.TestCase):
+
+    def setUp(self):
+        self.asyncApi = lib.StretchSenseAsyncAPI()
+        self.addCleanup(self.asyncApi.close)
+
+    def testSpi(self):
+
+        async def run():
+            await self.asyncApi.spi_setup()
+            batch = await self.asyncApi.read(lib.SOURCE_SPI)
+            await self.asyncApi.spi_reconfigure(odrMode=lib.RATE_200HZ, resolutionMode=lib.RESOLUTION_1pF)
+            return (batch, await self.asyncApi.read(lib.SOURCE_SPI))
+
+        (before, after) = asyncio.run(run())
+
+        self.assertEqual(len(before), 1)
+        self.assertEqual(len(before[0].values), 10)
+        self.assertEqual(self.asyncApi.api.spiConfiguration.odrMode, lib.RATE_200HZ)
+        self.assertEqual(after[-1].scalingFactor, 1)
+        self.assertEqual(after[-1].configEpoch, before[0].configEpoch + 1)
+
+    def testLoopStaysFree(self):
+        release = threading.Event()
+
+        def blocking():
+            release.wait(2.0)
+            return "done"
+
+        async def run():
+            call = asyncio.ensure_future(self.asyncApi._run(blocking))
+            ticks = 0
+            while ticks < 5:
+                await asyncio.sleep(0.001)
+                ticks += 1
+            release.set()
+            return (ticks, await call)
+
+        self.assertEqual(asyncio.run(run()), (5, "done"))
+
+    def testReplayFrames(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        filename = os.path.join(directory, "capture.csv")
+
+        with open(filename, "w") as myFile:
+            myFile.write("Address,Time,Values\n")
+            for index in range(20):
+                myFile.write("aa,%f,%d,%d\n" % (index * 0.001, index, 2 * index))
+
+        async def run():
+            await self.asyncApi.replay_open(filename, speed=0)
+            listFrames = []
+            async for batch in self.asyncApi.frames(lib.SOURCE_REPLAY, batchTime=0.0):
+                listFrames.extend(batch)
+            return listFrames
+
+        listFrames = asyncio.run(run())
+
+        self.assertEqual([frame.values for frame in listFrames], [[index, 2 * index] for index in range(20)])
+
+
+if __name__ == '__main__':
+    unittest.main()
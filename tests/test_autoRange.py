@@ -0,0 +1,107 @@
+"""
+
+Tests of the choice of the resolution of the 16FGV1.0 and of the flags of its frames.
+
+"""
+
+import unittest
+
+import stretchSenseStubs
+import stretchSenseLibrary as lib
+from stretchSenseStubs import makeFrame
+
+
+class TestAutoRange(unittest.TestCase):
+
+    def setUp(self):
+        self.api = lib.StretchSenseAPI(spiConfiguration=lib.StretchSenseSpiConfiguration(resolutionMode=lib.RESOLUTION_10fF))
+        self.api.capacitanceScalingFactor = self.api.spi_getCapacitanceScalingFactor(lib.RESOLUTION_10fF)
+
+        # No bus, the configurations written are only recorded
+        self.api.myDevice = None
+        self.listPackets = []
+        self.api.spi_writeConfiguration = lambda: self.listPackets.append(self.api.spi_getConfigurationPacket())
+
+    def testLevels(self):
+        with self.assertRaises(ValueError):
+            self.api.spi_enableAutoRange(highLevel=0.9, lowLevel=0.1)
+        with self.assertRaises(ValueError):
+            self.api.spi_enableAutoRange(highLevel=1.5, lowLevel=0.01)
+
+    def testCoarserAtOnce(self):
+        self.api.spi_enableAutoRange()
+        self.api.spi_autoRange(makeFrame("SPI0", 0, [655.35, 1.0], scalingFactor=100))
+
+        self.assertEqual(self.api.spiConfiguration.resolutionMode, lib.RESOLUTION_100fF)
+        self.assertEqual(self.api.capacitanceScalingFactor, 10)
+        self.assertEqual(len(self.listPackets), 1)
+
+    def testFinerAfterHoldTime(self):
+        self.api.spi_enableAutoRange(holdTime=0.5)
+
+        for timestamp in (0, 200000000, 400000000):
+            self.api.spi_autoRange(makeFrame("SPI0", timestamp, [1.0], scalingFactor=100))
+        self.assertEqual(self.api.spiConfiguration.resolutionMode, lib.RESOLUTION_10fF)
+
+        self.api.spi_autoRange(makeFrame("SPI0", 500000000, [1.0], scalingFactor=100))
+        self.assertEqual(self.api.spiConfiguration.resolutionMode, lib.RESOLUTION_1fF)
+
+    def testHysteresis(self):
+        self.api.spi_enableAutoRange(holdTime=0.0)
+
+        # Between the two levels nothing changes
+        for timestamp in range(10):
+            self.api.spi_autoRange(makeFrame("SPI0", timestamp, [300.0], scalingFactor=100))
+        self.assertEqual(len(self.listPackets), 0)
+
+        # At the coarsest resolution the highest level does not switch
+        self.api.spiConfiguration = self.api.spiConfiguration.copy(resolutionMode=lib.RESOLUTION_1pF)
+        self.api.spi_autoRange(makeFrame("SPI0", 0, [65535.0], scalingFactor=1))
+        self.assertEqual(len(self.listPackets), 0)
+
+    def testUnsettledFrames(self):
+        self.api.spi_enableAutoRange()
+
+        # After a switch to a coarser resolution, samples of the finer one must not switch again
+        frame = makeFrame("SPI0", 0, [6553.5], scalingFactor=10)
+        frame.settled = False
+        self.api.spiPreviousScalingFactor = 100
+        self.api.spiConfiguration = self.api.spiConfiguration.copy(resolutionMode=lib.RESOLUTION_100fF)
+        self.api.spi_autoRange(frame)
+        self.assertEqual(len(self.listPackets), 0)
+
+        # After a switch to a finer resolution, a high level is real
+        frame = makeFrame("SPI0", 0, [655.35], scalingFactor=100)
+        frame.settled = False
+        self.api.spiPreviousScalingFactor = 10
+        self.api.spiConfiguration = self.api.spiConfiguration.copy(resolutionMode=lib.RESOLUTION_10fF)
+        self.api.spi_autoRange(frame)
+        self.assertEqual(self.api.spiConfiguration.resolutionMode, lib.RESOLUTION_100fF)
+
+    def testFlagFrame(self):
+        configuration = lib.StretchSenseSpiConfiguration(odrMode=lib.RATE_100HZ, filterMode=lib.FILTER_3PT)
+        settling = self.api.spi_getSettling(configuration, 0)
+        self.assertEqual(settling, [40000000, 4])
+
+        listSettled = []
+        for (index, timestamp) in enumerate((1000, 2000, 3000, 4000, 30000000, 40000000)):
+            frame = makeFrame("SPI0", timestamp, [65.535 if index == 0 else 1.0], scalingFactor=1000)
+            self.api.spi_flagFrame(frame, settling)
+            listSettled.append(frame.settled)
+            self.assertEqual(frame.saturated, index == 0)
+
+        self.assertEqual(listSettled, [False, False, False, False, False, True])
+
+
+    def testFilterModeZero(self):
+        configuration = lib.StretchSenseSpiConfiguration(odrMode=lib.RATE_1KHZ, filterMode=lib.FILTER_0PT)
+        settling = self.api.spi_getSettling(configuration, 0)
+        self.assertEqual(settling, [2000000, 2])
+
+        frame = makeFrame("SPI0", 2000000, [1.0], scalingFactor=1000)
+        self.api.spi_flagFrame(frame, settling)
+        self.assertFalse(frame.settled)
+
+
+if __name__ == '__main__':
+    unittest.main()
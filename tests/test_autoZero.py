@@ -0,0 +1,66 @@
+"""
+
+Tests of the tracking of the baseline of each channel.
+
+"""
+
+import math
+import unittest
+
+import stretchSenseStubs
+import stretchSenseLibrary as lib
+from stretchSenseStubs import makeFrame
+
+
+class TestAutoZero(unittest.TestCase):
+
+    def testFirstFrame(self):
+        autoZero = lib.StretchSenseAutoZero()
+        frame = autoZero.process([makeFrame("aa", 0, [100.0, 200.0])])[0]
+
+        self.assertEqual(frame.values, [0.0, 0.0])
+        self.assertEqual(frame.baseline, [100.0, 200.0])
+        self.assertEqual(autoZero.getBaseline("aa"), [100.0, 200.0])
+        self.assertIsNone(autoZero.getBaseline("bb"))
+
+    def testRiseAndFall(self):
+        autoZero = lib.StretchSenseAutoZero(riseTime=10.0, fallTime=1.0, activeThreshold=50.0, subtract=False)
+        autoZero.update(makeFrame("aa", 0, [100.0, 100.0]))
+
+        frame = makeFrame("aa", 10**9, [110.0, 90.0])
+        autoZero.update(frame)
+
+        self.assertEqual(frame.values, [110.0, 90.0])
+        self.assertAlmostEqual(frame.baseline[0], 100.0 + 10.0 * (1 - math.exp(-0.1)))
+        self.assertAlmostEqual(frame.baseline[1], 100.0 - 10.0 * (1 - math.exp(-1.0)))
+
+    def testFrozenWhileActive(self):
+        autoZero = lib.StretchSenseAutoZero(riseTime=1.0, fallTime=1.0, activeThreshold=5.0)
+        autoZero.update(makeFrame("aa", 0, [100.0, 100.0]))
+
+        batch = [makeFrame("aa", index * 10**9, [150.0, 102.0]) for index in range(1, 4)]
+        autoZero.process(batch)
+
+        self.assertEqual(autoZero.getBaseline("aa")[0], 100.0)
+        self.assertEqual(batch[-1].values[0], 50.0)
+        self.assertGreater(autoZero.getBaseline("aa")[1], 101.0)
+
+        autoZero.update(makeFrame("aa", 4 * 10**9, [100.0, 102.0]))
+        self.assertEqual(autoZero.getBaseline("aa")[0], 100.0)
+
+    def testReset(self):
+        autoZero = lib.StretchSenseAutoZero()
+        autoZero.update(makeFrame("aa", 0, [100.0]))
+        autoZero.update(makeFrame("bb", 0, [100.0]))
+        autoZero.reset("aa")
+
+        self.assertIsNone(autoZero.getBaseline("aa"))
+        self.assertEqual(autoZero.getBaseline("bb"), [100.0])
+        self.assertEqual(autoZero.process([makeFrame("aa", 10**9, [40.0])])[0].baseline, [40.0])
+
+        autoZero.reset()
+        self.assertIsNone(autoZero.getBaseline("bb"))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,79 @@
+"""
+
+Tests of the conversion of the capacitance of each channel with its own polynomial.
+
+"""
+
+import os
+import shutil
+import tempfile
+import unittest
+
+import stretchSenseStubs
+import stretchSenseLibrary as lib
+from stretchSenseStubs import makeFrame
+
+
+class TestCalibration(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+
+    def testProcess(self):
+        calibration = lib.StretchSenseCalibration()
+        calibration.setCoefficients("aa", 0, [2.0, -1.0, 3.0])
+        calibration.setCoefficients("aa", 2, [0.5, 1.0])
+
+        batch = [makeFrame("aa", 0, [1.0, 5.0, 4.0]), makeFrame("aa", 1, [2.0, 6.0, -2.0]), makeFrame("bb", 0, [7.0])]
+        self.assertIs(calibration.process(batch), batch)
+
+        self.assertEqual(batch[0].values, [4.0, 5.0, 3.0])
+        self.assertEqual(batch[1].values, [9.0, 6.0, 0.0])
+        self.assertEqual(batch[2].values, [7.0])
+
+    def testRemoveCoefficients(self):
+        calibration = lib.StretchSenseCalibration()
+        calibration.setCoefficients("aa", 0, [3.0, 0.0])
+        self.assertEqual(calibration.process([makeFrame("aa", 0, [2.0])])[0].values, [6.0])
+
+        calibration.setCoefficients("aa", 0, None)
+        self.assertEqual(calibration.process([makeFrame("aa", 0, [2.0])])[0].values, [2.0])
+
+    def testSaveLoad(self):
+        filename = os.path.join(self.directory, "calibration.json")
+        calibration = lib.StretchSenseCalibration()
+        calibration.setCoefficients("aa", 1, [1, 2, 3])
+        calibration.save(filename)
+
+        loaded = lib.StretchSenseCalibration(filename)
+
+        self.assertEqual(loaded.dictCoefficients, {"aa/1": [1.0, 2.0, 3.0]})
+
+    def testFitRecording(self):
+        filename = os.path.join(self.directory, "recording.csv")
+        referenceFilename = os.path.join(self.directory, "reference.csv")
+
+        with open(filename, "w") as myFile:
+            myFile.write("#, Sample Time, aa/0, aa/1\n")
+            for index in range(10):
+                myFile.write("%d, %f, %f, %f\n" % (index, index * 0.1, 100.0 + index, 50.0))
+
+        with open(referenceFilename, "w") as myFile:
+            myFile.write("aa/0\n")
+            for index in range(10):
+                x = 100.0 + index
+                myFile.write("%f\n" % (0.5 * x * x - 3.0 * x + 1.0))
+
+        calibration = lib.StretchSenseCalibration()
+        dictError = calibration.fitRecording(filename, referenceFilename, degree=2)
+
+        self.assertEqual(list(dictError), ["aa/0"])
+        self.assertLess(dictError["aa/0"], 1e-6)
+        for (coefficient, expected) in zip(calibration.dictCoefficients["aa/0"], [0.5, -3.0, 1.0]):
+            self.assertAlmostEqual(coefficient, expected, places=4)
+        self.assertAlmostEqual(calibration.process([makeFrame("aa", 0, [104.0, 50.0])])[0].values[0], 0.5 * 104 ** 2 - 312 + 1, places=3)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,106 @@
+"""
+
+Tests of the captures written around the triggers.
+
+"""
+
+import os
+import shutil
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+import stretchSenseStubs
+import stretchSenseLibrary as lib
+from stretchSenseStubs import makeFrame
+
+
+MS = 10**6
+
+
+class TestCapture(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        self.capture = lib.StretchSenseCapture(self.directory, preTime=0.05, postTime=5.0, sampleRate=100)
+        self.addCleanup(self.capture.close)
+        self.start = time.monotonic_ns()
+
+    def feed(self, addr, listTime, value=1.0):
+        batch = [makeFrame(addr, self.start + t * MS, [value, float(t)]) for t in listTime]
+        self.assertIs(self.capture.process(batch), batch)
+
+    def readRows(self, filename):
+        with open(filename) as myFile:
+            self.assertEqual(myFile.readline(), "Address, Sample Time, Values\n")
+            return [[field.strip() for field in line.split(",")][:-1] for line in myFile]
+
+    def testPreAndPostTrigger(self):
+        self.feed("aa", range(0, 100, 10))
+        self.feed("bb", [95])
+        self.capture.trigger("button", self.start + 100 * MS)
+        self.feed("aa", [110, 120])
+
+        listSegment = self.capture.close()
+
+        self.assertEqual(len(listSegment), 1)
+        self.assertTrue(os.path.basename(listSegment[0]).endswith("_001_button_0000.csv"))
+        rows = self.readRows(listSegment[0])
+        self.assertEqual([(row[0], float(row[1])) for row in rows],
+                         [("aa", -0.05), ("aa", -0.04), ("aa", -0.03), ("aa", -0.02), ("aa", -0.01), ("bb", -0.005),
+                          ("aa", 0.01), ("aa", 0.02)])
+        self.assertEqual(rows[-1][2:], ["1.0", "120.0"])
+        self.assertEqual(self.capture.close(), [])
+
+    def testWindow(self):
+        capture = lib.StretchSenseCapture(self.directory, preTime=0.0, postTime=0.02)
+        self.addCleanup(capture.close)
+
+        capture.trigger("first", self.start)
+        capture.trigger("second", self.start + 10 * MS)
+        capture.process([makeFrame("aa", self.start + t * MS, [float(t)]) for t in (5, 25, 31, 40)])
+
+        self.assertIsNone(capture.recorder)
+        self.assertEqual(len(capture.listCaptures), 1)
+        rows = self.readRows(capture.listCaptures[0].listSegment[0])
+        self.assertEqual([row[2] for row in rows], ["5.0", "25.0"])
+
+    def testCloseExpired(self):
+        capture = lib.StretchSenseCapture(self.directory, preTime=0.0, postTime=0.01)
+        self.addCleanup(capture.close)
+
+        capture.trigger()
+        capture.closeTimer.join(2.0)
+
+        self.assertIsNone(capture.recorder)
+        self.assertEqual(capture.listCaptures[0].myFile, None)
+
+    def testHandleEvent(self):
+        event = lib.StretchSenseEvent()
+        event.name = "aa/0"
+        event.edge = lib.EDGE_FALLING
+        event.timestamp = self.start
+        self.capture.handleEvent(event)
+        self.assertIsNone(self.capture.recorder)
+
+        event.edge = lib.EDGE_RISING
+        self.capture.handleEvent(event)
+        self.assertIsNotNone(self.capture.recorder)
+
+    def testGpioTrigger(self):
+        listDetect = []
+
+        with mock.patch.object(lib.GPIO, "add_event_detect", lambda pin, edge, callback, bouncetime: listDetect.append((pin, edge, callback))):
+            self.capture.enableGpioTrigger(17)
+            self.capture.enableGpioTrigger(18, lib.GPIO.FALLING)
+
+        self.assertEqual([detect[:2] for detect in listDetect], [(17, lib.GPIO.RISING), (18, lib.GPIO.FALLING)])
+
+        listDetect[0][2](17)
+        self.assertIn("_gpio17_", self.capture.close()[0])
+
+
+if __name__ == '__main__':
+    unittest.main()
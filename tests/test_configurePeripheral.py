@@ -0,0 +1,79 @@
+"""
+
+Tests of the configuration of the sampling time and of the averaging of the Bluetooth devices.
+
+"""
+
+import unittest
+from threading import Lock
+
+import stretchSenseStubs
+import stretchSenseLibrary as lib
+
+
+class Characteristic(object):
+
+    def __init__(self, handle):
+        self.handle = handle
+
+    def getHandle(self):
+        return self.handle
+
+
+class Peripheral(stretchSenseStubs.Peripheral):
+
+    def __init__(self, uuid, listUUID):
+        stretchSenseStubs.Peripheral.__init__(self, "aa")
+        self.deviceAddr = "aa"
+        self.uuid = uuid
+        self.lock = Lock()
+        self.dictHandles = {}
+        self.dictUUIDHandle = dict((uuid, 0x20 + index) for (index, uuid) in enumerate(listUUID))
+        self.dictValues = {}
+        self.ignoreWrites = False
+
+    def getCharacteristics(self, uuid=None):
+        if uuid in self.dictUUIDHandle:
+            return [Characteristic(self.dictUUIDHandle[uuid])]
+        return []
+
+    def writeCharacteristic(self, handle, value, withResponse=False):
+        if not self.ignoreWrites:
+            self.dictValues[handle] = bytes(value)
+
+    def readCharacteristic(self, handle):
+        return self.dictValues.get(handle, b"\x00")
+
+
+class TestConfigurePeripheral(unittest.TestCase):
+
+    def setUp(self):
+        self.api = lib.StretchSenseAPI()
+        self.peripheral = Peripheral(self.api.serviceUUID3, [self.api.samplingTimeUUID3, self.api.averageUUID3])
+
+    def testConfigure(self):
+        self.assertTrue(self.api.ble_configurePeripheral(self.peripheral, samplingTimeNumber=2, filteringNumber=16))
+        self.assertEqual(self.peripheral.samplingTimeNumber, 2)
+        self.assertEqual(self.peripheral.filteringNumber, 16)
+        self.assertEqual(sorted(self.peripheral.dictValues.values()), [b"\x02", b"\x10"])
+
+    def testNotReadBack(self):
+        self.peripheral.ignoreWrites = True
+        self.assertFalse(self.api.ble_configurePeripheral(self.peripheral, filteringNumber=16))
+        self.assertFalse(hasattr(self.peripheral, 'filteringNumber'))
+
+    def testOutOfRange(self):
+        self.assertFalse(self.api.ble_configurePeripheral(self.peripheral, samplingTimeNumber=256))
+        self.assertFalse(self.api.ble_configurePeripheral(self.peripheral, filteringNumber=-1))
+        self.assertFalse(self.api.ble_writeConfiguration(self.peripheral, self.api.averageUUID3, 1.5))
+        self.assertEqual(self.peripheral.dictValues, {})
+        self.assertEqual(self.peripheral.dictHandles, {})
+
+    def testMissingCharacteristic(self):
+        peripheral = Peripheral(self.api.serviceUUID3, [self.api.samplingTimeUUID3])
+        self.assertFalse(self.api.ble_configurePeripheral(peripheral, samplingTimeNumber=1, filteringNumber=4))
+        self.assertEqual(peripheral.samplingTimeNumber, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,89 @@
+"""
+
+Tests of the discovery of StretchSense devices while scanning, and of the background scan.
+
+"""
+
+import threading
+import unittest
+
+from unittest import mock
+
+import stretchSenseStubs
+import stretchSenseLibrary as lib
+
+
+class ScanEntry(object):
+
+    def __init__(self, addr, rssi=-50, name="StretchSense", iface=0):
+        self.addr = addr
+        self.rssi = rssi
+        self.iface = iface
+        self.scanData = {0x09: name}
+
+    def getScanData(self):
+        return [(sdid, "Name", value) for (sdid, value) in self.scanData.items()]
+
+
+class TestDiscovery(unittest.TestCase):
+
+    def setUp(self):
+        self.api = lib.StretchSenseAPI(lib.StretchSenseScanConfiguration(sensitivity=-80))
+        self.listCalls = []
+        self.delegate = self.api.ScanPrint(self.api.scanConfiguration, self.api,
+                                           lambda device, isNew: self.listCalls.append((device.addr, isNew)))
+
+    def testNewAndUpdated(self):
+        self.delegate.handleDiscovery(ScanEntry("aa", rssi=-60), True, False)
+        self.delegate.handleDiscovery(ScanEntry("aa", rssi=-40), False, True)
+        self.delegate.handleDiscovery(ScanEntry("bb"), True, False)
+
+        self.assertEqual(self.listCalls, [("aa", True), ("aa", False), ("bb", True)])
+        self.assertEqual(self.api.ble_getRssiPeripheralAvailable(), {"aa": -40, "bb": -50})
+        self.assertEqual([device.addr for device in self.api.listPeripheralAvailable[1:]], ["aa", "bb"])
+
+    def testFilters(self):
+        self.delegate.handleDiscovery(ScanEntry("weak", rssi=-90), True, False)
+        self.delegate.handleDiscovery(ScanEntry("other", name="Headphones"), True, False)
+
+        self.assertEqual(self.listCalls, [])
+        self.assertEqual(self.api.ble_getRssiPeripheralAvailable(), {})
+
+    def testDuplicates(self):
+        self.api.scanConfiguration.duplicates = lib.SCAN_NEW
+        self.delegate.handleDiscovery(ScanEntry("aa"), True, False)
+        self.delegate.handleDiscovery(ScanEntry("aa"), False, True)
+        self.assertEqual(self.listCalls, [("aa", True)])
+
+        self.api.scanConfiguration.duplicates = lib.SCAN_ALL
+        self.delegate.handleDiscovery(ScanEntry("aa"), False, False)
+        self.assertEqual(self.listCalls, [("aa", True), ("aa", False)])
+
+
+class TestContinuousScanning(unittest.TestCase):
+
+    def testBackgroundThread(self):
+        discovered = threading.Event()
+
+        class Scanner(stretchSenseStubs.Scanner):
+
+            def process(self, timeout=10):
+                self.delegate.handleDiscovery(ScanEntry("aa"), True, False)
+                discovered.wait(timeout)
+
+        api = lib.StretchSenseAPI()
+        listCalls = []
+
+        with mock.patch.object(lib.btle, "Scanner", Scanner):
+            api.ble_startContinuousScanning(lambda device, isNew: (listCalls.append(isNew), discovered.set()))
+            self.assertTrue(discovered.wait(2.0))
+            api.ble_stopContinuousScanning()
+
+        self.assertIsNone(api.scanThread)
+        self.assertFalse(api.scanRunning)
+        self.assertEqual(listCalls[0], True)
+        self.assertIn("aa", api.ble_getRssiPeripheralAvailable())
+
+
+if __name__ == '__main__':
+    unittest.main()
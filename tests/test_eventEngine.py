@@ -0,0 +1,73 @@
+"""
+
+Tests of the threshold rules checked on the frames.
+
+"""
+
+import unittest
+
+import stretchSenseStubs
+import stretchSenseLibrary as lib
+from stretchSenseStubs import makeFrame
+
+
+MS = 10**6
+
+
+class TestEventEngine(unittest.TestCase):
+
+    def setUp(self):
+        self.engine = lib.StretchSenseEventEngine()
+        self.listEvents = []
+        self.engine.subscribe(lambda event: self.listEvents.append((event.name, event.edge, event.timestamp // MS, event.value)))
+
+    def feed(self, addr, listSample):
+        batch = [makeFrame(addr, time * MS, values) for (time, values) in listSample]
+        self.assertIs(self.engine.process(batch), batch)
+
+    def testHysteresis(self):
+        self.engine.addRule("aa", 1, 10.0, hysteresis=2.0, name="stretch")
+        self.feed("aa", [(0, [0.0, 5.0]), (1, [0.0, 11.0]), (2, [0.0, 9.0]), (3, [0.0, 12.0]), (4, [0.0, 7.0])])
+
+        self.assertEqual(self.listEvents, [("stretch", lib.EDGE_RISING, 1, 11.0), ("stretch", lib.EDGE_FALLING, 4, 7.0)])
+
+    def testMinDuration(self):
+        self.engine.addRule("aa", 0, 10.0, minDuration=0.02)
+        self.feed("aa", [(0, [11.0]), (10, [11.0]), (15, [9.0]), (20, [11.0]), (30, [11.0]), (40, [12.0])])
+
+        self.assertEqual(self.listEvents, [("aa/0", lib.EDGE_RISING, 40, 12.0)])
+
+    def testDebounce(self):
+        self.engine.addRule("aa", 0, 10.0, debounce=0.05)
+        self.feed("aa", [(0, [11.0]), (10, [9.0]), (30, [9.0]), (60, [9.0])])
+
+        self.assertEqual([event[1:3] for event in self.listEvents], [(lib.EDGE_RISING, 0), (lib.EDGE_FALLING, 60)])
+
+    def testFalling(self):
+        self.engine.addRule("aa", 0, 10.0, hysteresis=2.0, falling=True)
+        self.feed("aa", [(0, [12.0]), (1, [9.0]), (2, [11.0]), (3, [13.0])])
+
+        self.assertEqual([event[1:3] for event in self.listEvents], [(lib.EDGE_RISING, 1), (lib.EDGE_FALLING, 3)])
+
+    def testRulesOfEachDevice(self):
+        self.engine.addRule("aa", 0, 10.0)
+        self.engine.addRule("aa", 5, 10.0, name="missing")
+        self.feed("bb", [(0, [20.0])])
+        self.feed("aa", [(0, [20.0])])
+
+        self.assertEqual(self.listEvents, [("aa/0", lib.EDGE_RISING, 0, 20.0)])
+
+    def testRemoveAndUnsubscribe(self):
+        name = self.engine.addRule("aa", 0, 10.0)
+        self.engine.removeRule(name)
+        self.feed("aa", [(0, [20.0])])
+        self.assertEqual(self.listEvents, [])
+
+        self.engine.addRule("aa", 0, 10.0)
+        self.engine.unsubscribe(self.engine.listSubscribers[0])
+        self.feed("aa", [(1, [20.0])])
+        self.assertEqual(self.listEvents, [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,55 @@
+"""
+
+Tests of the count of the frames lost by each device.
+
+"""
+
+import unittest
+
+import stretchSenseStubs
+import stretchSenseLibrary as lib
+from stretchSenseStubs import makeFrame
+
+
+class TestLossTracker(unittest.TestCase):
+
+    def testGapAndOverrun(self):
+        tracker = lib.StretchSenseLossTracker()
+        tracker.setPeriod("a", 0.01)
+
+        listFrames = [makeFrame("a", timestamp, [0.0]) for timestamp in (0, 10000000, 20000000, 50000000, 52000000)]
+        for frame in listFrames:
+            tracker.update(frame)
+
+        self.assertEqual(listFrames[3].gap, 2)
+        self.assertTrue(listFrames[4].overrun)
+
+        metrics = tracker.getMetrics()["a"]
+        self.assertEqual(metrics["received"], 5)
+        self.assertEqual(metrics["lost"], 2)
+        self.assertEqual(metrics["expected"], 7)
+        self.assertEqual(metrics["gaps"], 1)
+        self.assertEqual(metrics["overruns"], 1)
+
+    def testCountOnly(self):
+        tracker = lib.StretchSenseLossTracker()
+        tracker.setPeriod("a", 0)
+
+        for timestamp in (0, 10000000, 90000000, 91000000):
+            tracker.update(makeFrame("a", timestamp, [0.0]))
+
+        metrics = tracker.getMetrics()["a"]
+        self.assertEqual((metrics["received"], metrics["lost"], metrics["overruns"]), (4, 0, 0))
+
+    def testEstimatedPeriod(self):
+        tracker = lib.StretchSenseLossTracker()
+
+        for index in range(20):
+            tracker.update(makeFrame("a", index * 20000000, [0.0]))
+
+        self.assertAlmostEqual(tracker.getMetrics()["a"]["period"], 0.02)
+
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,73 @@
+"""
+
+Tests of the read engine of the Bluetooth devices, which falls back on reads when the notifications stop.
+
+"""
+
+import time
+import unittest
+from threading import Lock
+
+import stretchSenseStubs
+import stretchSenseLibrary as lib
+
+
+class Peripheral(stretchSenseStubs.Peripheral):
+
+    def __init__(self, addr):
+        stretchSenseStubs.Peripheral.__init__(self, addr)
+        self.deviceAddr = addr
+        self.dataHandle = 0x10
+        self.lock = Lock()
+        self.readMode = lib.READ_NOTIFICATIONS
+        self.timeReadMode = time.monotonic()
+        self.timeLastNotification = self.timeReadMode
+        self.listReads = []
+
+    def readCharacteristic(self, handle):
+        self.listReads.append((handle, self.lock.locked()))
+        return b"\x00" * 20
+
+
+class TestReadEngine(unittest.TestCase):
+
+    def setUp(self):
+        self.api = lib.StretchSenseAPI()
+        self.listUpdates = []
+        self.api.ble_updatePeripheralWithData = lambda peripheral, data, timestamp=None: self.listUpdates.append(peripheral.deviceAddr)
+
+    def testUpdateAllHoldsLock(self):
+        peripheral = Peripheral("aa")
+        notReady = Peripheral("bb")
+        notReady.dataHandle = None
+        self.api.listPeripheralInUse = [peripheral, notReady]
+
+        self.api.ble_updateAllPeripherals()
+
+        self.assertEqual(peripheral.listReads, [(0x10, True)])
+        self.assertEqual(notReady.listReads, [])
+        self.assertEqual(self.listUpdates, ["aa"])
+        self.assertFalse(peripheral.lock.locked())
+
+    def testReadModes(self):
+        peripheral = Peripheral("aa")
+
+        self.api.ble_readPeripheral(peripheral)
+        self.assertEqual(peripheral.readMode, lib.READ_NOTIFICATIONS)
+        self.assertEqual(peripheral.listReads, [])
+
+        peripheral.timeLastNotification -= 2 * self.api.notificationTimeout
+        self.api.ble_readPeripheral(peripheral)
+        self.assertEqual(peripheral.readMode, lib.READ_POLLING)
+
+        self.api.ble_readPeripheral(peripheral)
+        self.assertEqual(peripheral.listReads, [(0x10, True)])
+        self.assertEqual(peripheral.readMode, lib.READ_POLLING)
+
+        peripheral.timeLastNotification = time.monotonic()
+        self.api.ble_readPeripheral(peripheral)
+        self.assertEqual(peripheral.readMode, lib.READ_NOTIFICATIONS)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,63 @@
+"""
+
+Tests of the recordings streamed to disk in segment files.
+
+"""
+
+import os
+import shutil
+import tempfile
+import unittest
+
+import stretchSenseStubs
+import stretchSenseLibrary as lib
+
+
+class TestRecorder(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.filename = os.path.join(self.directory, "recording.csv")
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def testSegmentsBySize(self):
+        header = "Time,Value\n"
+        line = "0.1,ééé\n"
+        recorder = lib.StretchSenseRecorder(self.filename, header, maxSize=len(header) + 2 * len(line.encode()))
+
+        for index in range(5):
+            recorder.write(line)
+        listSegment = recorder.close()
+
+        self.assertEqual(len(listSegment), 3)
+        for segment in listSegment:
+            self.assertLessEqual(os.path.getsize(segment), recorder.maxSize)
+            with open(segment, encoding="utf-8") as myFile:
+                self.assertEqual(myFile.readline(), header)
+
+    def testClosed(self):
+        recorder = lib.StretchSenseRecorder(self.filename, "Time\n")
+        recorder.write("1\n")
+        recorder.close()
+        recorder.write("2\n")
+
+        with open(recorder.listSegment[0]) as myFile:
+            self.assertEqual(myFile.read(), "Time\n1\n")
+
+    def testMove(self):
+        recorder = lib.StretchSenseRecorder(self.filename, "Time\n", maxSize=10, columns=[{"name": "Time"}])
+        recorder.write("1.00\n")
+        recorder.write("2.00\n")
+
+        listSegment = recorder.move(os.path.join(self.directory, "moved"))
+
+        self.assertEqual([os.path.basename(segment) for segment in listSegment], ["moved_0000.csv", "moved_0001.csv"])
+        self.assertTrue(all(os.path.exists(segment) for segment in listSegment))
+        self.assertTrue(os.path.exists(os.path.join(self.directory, "moved.json")))
+        self.assertFalse(os.path.exists(os.path.join(self.directory, "recording.json")))
+
+
+if __name__ == '__main__':
+    unittest.main()
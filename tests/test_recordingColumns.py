@@ -0,0 +1,57 @@
+"""
+
+Tests of the columns of the recordings, named after the address and the channel of each device.
+
+"""
+
+import os
+import shutil
+import tempfile
+import unittest
+
+import stretchSenseStubs
+import stretchSenseLibrary as lib
+
+
+def makeChannel(addr, channelNumber, gen=3):
+    channel = lib.StretchSensePeripheral()
+    channel.addr = addr
+    channel.channelNumber = channelNumber
+    channel.gen = gen
+    return channel
+
+
+class TestRecordingColumns(unittest.TestCase):
+
+    def setUp(self):
+        self.api = lib.StretchSenseAPI()
+
+    def testChannelColumns(self):
+        listPeripheral = [makeChannel("aa", 0), lib.StretchSensePeripheral(), makeChannel("aa", 1), makeChannel("bb", 0, gen=2)]
+
+        listColumns = self.api.getChannelColumns(listPeripheral)
+
+        self.assertEqual([column["name"] for column in listColumns], ["aa/0", "aa/1", "bb/0"])
+        self.assertEqual([column["column"] for column in listColumns], [2, 3, 4])
+        self.assertEqual(listColumns[2], {"name": "bb/0", "column": 4, "addr": "bb", "gen": "2", "channel": 0})
+        self.assertEqual(self.api.getChannelColumns(listPeripheral, firstColumn=0)[0]["column"], 0)
+
+    def testReadColumns(self):
+        directory = tempfile.mkdtemp()
+        try:
+            listColumns = self.api.getChannelColumns([makeChannel("aa", 0), makeChannel("aa", 1)])
+            header = self.api.getRecordingHeader(listColumns)
+            self.assertEqual(header, "#, Sample Time, aa/0, aa/1\n")
+
+            recorder = lib.StretchSenseRecorder(os.path.join(directory, "recording.csv"), header)
+            recorder.write("0, 0.0, 1, 2\n")
+            listSegment = recorder.close()
+
+            self.assertEqual(lib.StretchSenseRecorder.readColumns(listSegment[0]),
+                             {"#": 0, "Sample Time": 1, "aa/0": 2, "aa/1": 3})
+        finally:
+            shutil.rmtree(directory)
+
+
+if __name__ == '__main__':
+    unittest.main()
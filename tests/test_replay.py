@@ -0,0 +1,91 @@
+"""
+
+Tests of the replay of the captures and of the recordings of the GUI.
+
+"""
+
+import os
+import shutil
+import tempfile
+import time
+import unittest
+
+import stretchSenseStubs
+import stretchSenseLibrary as lib
+from stretchSenseStubs import makeFrame
+
+
+class TestReplay(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        self.api = lib.StretchSenseAPI()
+
+    def replayAll(self, filename):
+        listPeripheral = self.api.replay_open(filename, speed=0)
+        self.assertTrue(self.api.replay_isOpen())
+
+        while not self.api.replay_isFinished():
+            self.api.replay_mode()
+
+        return (listPeripheral, self.api.getFrames())
+
+    def testCapture(self):
+        capture = lib.StretchSenseCapture(self.directory, preTime=1.0, postTime=1.0)
+        start = time.monotonic_ns()
+        capture.process([makeFrame("aa", start + index * 10**7, [float(index), 2.5]) for index in range(3)])
+        capture.process([makeFrame("bb", start + 5 * 10**6, [7.0])])
+        capture.trigger("test", start + 2 * 10**7)
+        capture.process([makeFrame("aa", start + 3 * 10**7, [3.0, 2.5])])
+        listSegment = capture.close()
+
+        (listPeripheral, frames) = self.replayAll(listSegment)
+
+        self.assertEqual(sorted((channel.addr, channel.channelNumber) for channel in listPeripheral),
+                         [("aa", 0), ("aa", 1), ("bb", 0)])
+        self.assertEqual([(frame.addr, frame.values) for frame in frames],
+                         [("aa", [0.0, 2.5]), ("bb", [7.0]), ("aa", [1.0, 2.5]), ("aa", [2.0, 2.5]), ("aa", [3.0, 2.5])])
+        self.assertEqual([frame.timestamp - frames[0].timestamp for frame in frames], [0, 5 * 10**6, 10**7, 2 * 10**7, 3 * 10**7])
+
+    def testGuiRecording(self):
+        listChannel = []
+        for (addr, gen, channelNumber) in (("aa", 3, 0), ("aa", 3, 1), ("bb", 2, 0)):
+            channel = lib.StretchSensePeripheral()
+            (channel.addr, channel.gen, channel.channelNumber) = (addr, gen, channelNumber)
+            listChannel.append(channel)
+
+        listColumns = self.api.getChannelColumns(listChannel)
+        header = self.api.getRecordingHeader(listColumns)
+        recorder = lib.StretchSenseRecorder(os.path.join(self.directory, "recording.csv"), header,
+                                            maxSize=len(header) + 40, columns=listColumns)
+
+        for index in range(4):
+            recorder.write("%d, %.2f, %d, %d, %d\n" % (index, index * 0.02, 100 + index, 200 + index, 300 + index))
+        listSegment = recorder.close()
+        self.assertGreater(len(listSegment), 1)
+
+        (listPeripheral, frames) = self.replayAll(listSegment)
+
+        self.assertEqual([(channel.addr, channel.gen, channel.channelNumber) for channel in listPeripheral],
+                         [("aa", "3", 0), ("aa", "3", 1), ("bb", "2", 0)])
+        self.assertEqual([(frame.addr, frame.gen, frame.values) for frame in frames[:2]],
+                         [("aa", "3", [100.0, 200.0]), ("bb", "2", [300.0])])
+        self.assertEqual(len(frames), 8)
+        self.assertEqual(frames[-1].values, [303.0])
+        self.assertEqual(frames[-1].timestamp - frames[0].timestamp, 6 * 10**7)
+
+    def testClose(self):
+        filename = os.path.join(self.directory, "capture.csv")
+        with open(filename, "w") as myFile:
+            myFile.write("Address, Sample Time, Values\naa ,0.0 ,1.0 ,\n")
+
+        self.api.replay_open(filename)
+        self.api.replay_close()
+
+        self.assertTrue(self.api.replay_isFinished())
+        self.assertEqual(self.api.replay_getListPeripheral(), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,61 @@
+"""
+
+Tests of the scan configuration, which replaces the adapter and filters taken from the command line.
+
+"""
+
+import sys
+import unittest
+from unittest import mock
+
+import stretchSenseStubs
+import stretchSenseLibrary as lib
+
+
+class TestScanConfiguration(unittest.TestCase):
+
+    def testDefaults(self):
+        scanConfiguration = lib.StretchSenseScanConfiguration()
+        self.assertEqual(scanConfiguration.hci, 0)
+        self.assertEqual(scanConfiguration.sensitivity, -128)
+        self.assertEqual(scanConfiguration.duplicates, lib.SCAN_NEW_AND_UPDATED)
+        self.assertEqual(scanConfiguration.deviceName, "StretchSense")
+
+    def testScanningIgnoresArgv(self):
+        listIface = []
+
+        class Scanner(stretchSenseStubs.Scanner):
+
+            def scan(self, timeout=10):
+                listIface.append((self.iface, timeout))
+                return []
+
+        api = lib.StretchSenseAPI(lib.StretchSenseScanConfiguration(hci=1))
+
+        with mock.patch.object(sys, "argv", ["stretchSenseLibrary.py", "--unknown", "-x"]), \
+                mock.patch.object(lib.btle, "Scanner", Scanner):
+            api.ble_scanning(3)
+
+        self.assertEqual(listIface, [(1, 3)])
+
+    def testServiceUUIDs(self):
+        scanConfiguration = lib.StretchSenseScanConfiguration(deviceName=None, serviceUUIDs=["00001701-7374-7265-7563-6873656e7365"])
+        delegate = lib.StretchSenseAPI.ScanPrint(scanConfiguration)
+
+        class ScanEntry(object):
+            addr = "aa"
+            rssi = -50
+            scanData = True
+
+            def __init__(self, uuid):
+                self.uuid = uuid
+
+            def getScanData(self):
+                return [(0x07, "Complete 128b Services", self.uuid)]
+
+        self.assertTrue(delegate.isStretchSenseDevice(ScanEntry("00001701-7374-7265-7563-6873656e7365")))
+        self.assertFalse(delegate.isStretchSenseDevice(ScanEntry("0000180f-0000-1000-8000-00805f9b34fb")))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,108 @@
+"""
+
+Tests of the configuration of the 16FGV1.0 and of the state kept by each API.
+
+"""
+
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+import stretchSenseStubs
+import stretchSenseLibrary as lib
+
+
+class TestSpiConfiguration(unittest.TestCase):
+
+    def testDefaults(self):
+        configuration = lib.StretchSenseSpiConfiguration()
+        self.assertEqual(configuration.odrMode, lib.ODR_MODE)
+        self.assertEqual(configuration.resolutionMode, lib.RESOLUTION_MODE)
+        self.assertEqual(configuration.cePin, lib.CE_PIN0)
+
+    def testFromDictNames(self):
+        configuration = lib.StretchSenseSpiConfiguration.fromDict({"odrMode": "RATE_1KHZ", "filterMode": "FILTER_255PT",
+                                                                   "device": "SPI1", "cePin": "CE_PIN1", "addr": "board"})
+        self.assertEqual(configuration.odrMode, lib.RATE_1KHZ)
+        self.assertEqual(configuration.filterMode, lib.FILTER_255PT)
+        self.assertEqual(configuration.device, lib.SPI1)
+        self.assertEqual(configuration.cePin, lib.CE_PIN1)
+        self.assertEqual(configuration.addr, "board")
+
+    def testFromDictRejects(self):
+        for dictSettings in ({"odrMod": 1},
+                             {"odrMode": "CE_PIN0"},
+                             {"odrMode": "os"},
+                             {"interruptMode": "INTERRUPT_PIN"},
+                             {"resolutionMode": 42},
+                             {"filterMode": 2},
+                             {"filterMode": True},
+                             {"odrMode": 1.0},
+                             {"device": 2},
+                             {"bus": -1},
+                             {"maxSpeedHz": 0},
+                             {"cePin": lib.TRIGGER_PIN},
+                             {"addr": ""}):
+            with self.assertRaises(ValueError, msg=str(dictSettings)):
+                lib.StretchSenseSpiConfiguration.fromDict(dictSettings)
+
+    def testCopy(self):
+        configuration = lib.StretchSenseSpiConfiguration(addr="board")
+        copy = configuration.copy(odrMode=lib.RATE_200HZ, filterMode=None)
+        self.assertEqual(copy.odrMode, lib.RATE_200HZ)
+        self.assertEqual(copy.filterMode, configuration.filterMode)
+        self.assertEqual(copy.addr, "board")
+        self.assertEqual(configuration.odrMode, lib.ODR_MODE)
+
+    def testPacket(self):
+        configuration = lib.StretchSenseSpiConfiguration(odrMode=lib.RATE_500HZ, filterMode=lib.FILTER_15PT,
+                                                         resolutionMode=lib.RESOLUTION_1fF)
+        packet = configuration.toPacket()
+        self.assertEqual(len(packet), configuration.packetLength)
+        self.assertEqual(packet[0], lib.CONFIG)
+
+        decoded = lib.StretchSenseSpiConfiguration(addr="other").fromPacket(bytes(packet))
+        self.assertEqual(decoded.odrMode, lib.RATE_500HZ)
+        self.assertEqual(decoded.filterMode, lib.FILTER_15PT)
+        self.assertEqual(decoded.resolutionMode, lib.RESOLUTION_1fF)
+        self.assertEqual(decoded.addr, "other")
+
+        with self.assertRaises(ValueError):
+            configuration.fromPacket([lib.DATA] + packet[1:])
+
+    def testLoadJson(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        filename = os.path.join(directory, "spi.json")
+
+        with open(filename, "w") as myFile:
+            json.dump({"odrMode": "RATE_200HZ", "resolutionMode": "RESOLUTION_1pF", "addr": "board"}, myFile)
+
+        configuration = lib.StretchSenseSpiConfiguration.load(filename)
+        self.assertEqual(configuration.odrMode, lib.RATE_200HZ)
+        self.assertEqual(configuration.resolutionMode, lib.RESOLUTION_1pF)
+
+        configuration.save(filename)
+        self.assertEqual(lib.StretchSenseSpiConfiguration.load(filename).toDict(), configuration.toDict())
+
+
+
+class TestApiState(unittest.TestCase):
+
+    def testSeparateLists(self):
+        first = lib.StretchSenseAPI()
+        second = lib.StretchSenseAPI(spiConfiguration=lib.StretchSenseSpiConfiguration(device=lib.SPI1, addr="second"))
+        first.spi_setup()
+        second.spi_setup()
+
+        self.assertIsNot(first.listPeripheralSpi, second.listPeripheralSpi)
+        self.assertIsNot(first.listPeripheralInUse, second.listPeripheralInUse)
+        self.assertEqual(set(channel.addr for channel in first.listPeripheralSpi), {first.spiConfiguration.addr})
+        self.assertEqual(set(channel.addr for channel in second.listPeripheralSpi), {"second"})
+        self.assertEqual(second.myDevice.device, lib.SPI1)
+
+
+if __name__ == '__main__':
+    unittest.main()
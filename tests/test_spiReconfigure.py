@@ -0,0 +1,91 @@
+"""
+
+Tests of the configuration of the 16FGV1.0 while it is streaming.
+
+"""
+
+import threading
+import time
+import unittest
+
+import stretchSenseStubs
+import stretchSenseLibrary as lib
+
+
+class TestSpiReconfigure(unittest.TestCase):
+
+    def setUp(self):
+        self.api = lib.StretchSenseAPI()
+
+    def testReconfigureWithoutSetup(self):
+        self.api.spi_reconfigure(odrMode=lib.RATE_200HZ)
+
+        self.assertTrue(self.api.myDevice.isOpen)
+        self.assertEqual(self.api.spiConfiguration.odrMode, lib.RATE_200HZ)
+        self.assertEqual(len(self.api.listPeripheralSpi), 10)
+
+    def testSingleTransfer(self):
+        self.api.spi_setup()
+        device = self.api.myDevice
+        configEpoch = self.api.spiConfigEpoch
+        scalingFactor = self.api.capacitanceScalingFactor
+        device.sent = []
+
+        self.api.spi_reconfigure(filterMode=lib.FILTER_7PT, resolutionMode=lib.RESOLUTION_1fF)
+
+        self.assertIs(self.api.myDevice, device)
+        self.assertEqual(device.numberOfOpen, 1)
+        self.assertEqual(device.sent, [self.api.spiConfiguration.toPacket()])
+        self.assertEqual(self.api.spiConfigEpoch, configEpoch + 1)
+        self.assertEqual(self.api.capacitanceScalingFactor, 1000)
+        self.assertEqual(self.api.spiPreviousScalingFactor, scalingFactor)
+
+    def testWiringChange(self):
+        self.api.spi_setup()
+        device = self.api.myDevice
+
+        self.api.spi_reconfigure(configuration=self.api.spiConfiguration.copy(device=1))
+
+        self.assertFalse(device.isOpen)
+        self.assertIsNot(self.api.myDevice, device)
+        self.assertTrue(self.api.myDevice.isOpen)
+        self.assertEqual(self.api.myDevice.device, 1)
+
+    def testSetupClosesDevice(self):
+        self.api.spi_setup()
+        device = self.api.myDevice
+        self.api.spi_setup()
+
+        self.assertFalse(device.isOpen)
+        self.assertTrue(self.api.myDevice.isOpen)
+
+    def testSetupWaitsForLock(self):
+        done = threading.Event()
+        thread = threading.Thread(target=lambda: (self.api.spi_setup(), done.set()))
+
+        with self.api.spiLock:
+            thread.start()
+            self.assertFalse(done.wait(0.05))
+
+        thread.join(2.0)
+        self.assertTrue(done.is_set())
+
+    def testReconfigureWhileTriggered(self):
+        self.api.spiConfiguration = self.api.spiConfiguration.copy(interruptMode=lib.INTERRUPT_DISABLED, triggerMode=lib.TRIGGER_ENABLED)
+        self.api.spi_setup()
+        self.api.triggerTime = 0.3
+
+        thread = threading.Thread(target=self.api.spi_mode)
+        thread.start()
+        time.sleep(0.05)
+
+        start = time.monotonic()
+        self.api.spi_reconfigure(filterMode=lib.FILTER_3PT)
+        self.assertLess(time.monotonic() - start, 0.2)
+
+        thread.join(2.0)
+        self.assertEqual(self.api.getFrames(), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,90 @@
+"""
+
+Tests of the choice of the output data rate and filter of the 16FGV1.0.
+
+"""
+
+import os
+import shutil
+import tempfile
+import unittest
+
+import stretchSenseStubs
+import stretchSenseLibrary as lib
+from stretchSenseStubs import makeFrame
+
+
+class TestSpiTuner(unittest.TestCase):
+
+    def setUp(self):
+        self.tuner = lib.StretchSenseSpiTuner(lib.StretchSenseAPI())
+
+    def makeResult(self, odrMode, filterMode, rate, maxNoise):
+        return {"odrMode": odrMode, "filterMode": filterMode, "rate": rate, "noise": [maxNoise], "maxNoise": maxNoise,
+                "groupDelay": self.tuner.getGroupDelay(filterMode, rate)}
+
+    def testGroupDelay(self):
+        self.assertAlmostEqual(self.tuner.getGroupDelay(lib.FILTER_1PT, 100), 0.01)
+        self.assertAlmostEqual(self.tuner.getGroupDelay(lib.FILTER_31PT, 1000), 0.016)
+        self.assertEqual(self.tuner.getGroupDelay(lib.FILTER_1PT, 0), float("inf"))
+
+    def testRecommend(self):
+        listResults = [self.makeResult(lib.RATE_100HZ, lib.FILTER_1PT, 100, 0.4),
+                       self.makeResult(lib.RATE_1KHZ, lib.FILTER_1PT, 1000, 2.0),
+                       self.makeResult(lib.RATE_1KHZ, lib.FILTER_7PT, 1000, 0.3),
+                       self.makeResult(lib.RATE_1KHZ, lib.FILTER_255PT, 1000, 0.05)]
+
+        best = self.tuner.recommend(listResults, targetNoise=0.5)
+        self.assertEqual((best["odrMode"], best["filterMode"]), (lib.RATE_1KHZ, lib.FILTER_7PT))
+        self.assertTrue(best["meetsTarget"])
+
+        best = self.tuner.recommend(listResults, targetNoise=0.01, maxDelay=0.05)
+        self.assertEqual(best["filterMode"], lib.FILTER_7PT)
+        self.assertFalse(best["meetsTarget"])
+
+
+    def testFilterTiming(self):
+        api = self.tuner.api
+        self.assertEqual(api.spi_getFilterTiming(lib.FILTER_0PT, 0), [2, 0.0, float("inf")])
+        self.assertEqual(api.spi_getFilterTiming(lib.FILTER_3PT, 100)[:2], [4, 0.04])
+        self.assertEqual(api.spi_getSettling(lib.StretchSenseSpiConfiguration(odrMode=lib.RATE_100HZ, filterMode=lib.FILTER_3PT), 0),
+                         [40000000, 4])
+
+
+class TestSpiTunerMeasure(unittest.TestCase):
+
+    def setUp(self):
+        self.api = lib.StretchSenseAPI()
+        self.api.spi_setup()
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        self.tuner = lib.StretchSenseSpiTuner(self.api, os.path.join(self.directory, "tuner.json"), measureTime=0.02,
+                                              settleTime=0.0)
+
+    def testMeasure(self):
+        listStage = []
+        self.api.addProcessingStage(type("Stage", (object,), {"process": lambda stage, batch: listStage.extend(batch) or batch})())
+        self.api.pushFrame(makeFrame("ble", 0, [1.0]))
+        self.api.spi_enableAutoRange()
+
+        result = self.tuner.measure(lib.RATE_1KHZ, lib.FILTER_0PT)
+
+        self.assertEqual((result["odrMode"], result["filterMode"], result["rate"]), (lib.RATE_1KHZ, lib.FILTER_0PT, 1000.0))
+        self.assertEqual(result["noise"], [0.0] * 10)
+        self.assertAlmostEqual(result["groupDelay"], 0.001)
+        self.assertTrue(self.api.autoRange)
+        self.assertEqual(listStage, [])
+        self.assertEqual([frame.addr for frame in self.api.getFrames()], ["ble"])
+
+    def testSweepRestoresConfiguration(self):
+        configuration = self.api.spiConfiguration
+
+        listResults = self.tuner.sweep([lib.RATE_1KHZ], [lib.FILTER_0PT, lib.FILTER_1PT])
+
+        self.assertEqual([result["filterMode"] for result in listResults], [lib.FILTER_0PT, lib.FILTER_1PT])
+        self.assertEqual(self.api.spiConfiguration.toDict(), configuration.toDict())
+        self.assertEqual(len(lib.StretchSenseSpiTuner(self.api, self.tuner.cacheFilename).getMeasures()), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,47 @@
+"""
+
+Tests of the monotonic timestamps of the frames and of their conversion to dates.
+
+"""
+
+import time
+import unittest
+
+import stretchSenseStubs
+import stretchSenseLibrary as lib
+
+
+class TestTimestamps(unittest.TestCase):
+
+    def setUp(self):
+        self.api = lib.StretchSenseAPI()
+
+    def testWallClock(self):
+        self.api.timeAnchor = (1500000000 * 10**9, 2 * 10**9)
+
+        self.assertEqual(self.api.timestampToWallClock(2 * 10**9), 1500000000.0)
+        self.assertAlmostEqual(self.api.timestampToWallClock(3500 * 10**6), 1500000001.5)
+
+    def testAnchorIsNow(self):
+        self.assertAlmostEqual(self.api.timestampToWallClock(time.monotonic_ns()), time.time(), delta=0.1)
+
+    def testSpiFrame(self):
+        self.api.spi_setup()
+        listTransfer = []
+
+        def respond(data):
+            listTransfer.append(time.monotonic_ns())
+            return [0] * len(data)
+
+        self.api.myDevice.respond = respond
+        self.api.spi_mode()
+        end = time.monotonic_ns()
+
+        frames = self.api.getFrames()
+        self.assertEqual(len(frames), 1)
+        self.assertGreaterEqual(frames[0].timestamp, listTransfer[-1])
+        self.assertLessEqual(frames[0].timestamp, end)
+
+
+if __name__ == '__main__':
+    unittest.main()
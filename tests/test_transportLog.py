@@ -0,0 +1,124 @@
+"""
+
+Tests of StretchSenseTransportLog and of the replay of transport logs by StretchSenseAPI.
+
+"""
+
+import os
+import shutil
+import tempfile
+import unittest
+
+import stretchSenseStubs
+import stretchSenseLibrary as lib
+
+
+def respondCounter(data):
+    if data[0] == lib.CONFIG:
+        return [0] * len(data)
+    return [0, 0] + [index % 256 for index in range(len(data) - 2)]
+
+
+class TestTransportLog(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+
+    def testReadWrite(self):
+        filename = os.path.join(self.directory, "session.raw")
+
+        log = lib.StretchSenseTransportLog(filename)
+        log.write(lib.RAW_SPI_CONFIG, 10, "SPI0", "uuid3", 3, bytes([lib.CONFIG, 1, 0, 0, 1, 2]))
+        log.write(lib.RAW_SPI_DATA, 20, "SPI0", "uuid3", 3, bytes(range(22)))
+        log.write(lib.RAW_BLE_DATA, 30, "aa:bb", "uuid2", 2, b"\x01\x02", 14)
+        log.close()
+
+        self.assertTrue(lib.StretchSenseTransportLog.isTransportLog(filename))
+
+        listRecord = lib.StretchSenseTransportLog.read(filename)
+        self.assertEqual([record[0] for record in listRecord], [10, 20, 30])
+        self.assertEqual([record[1] for record in listRecord], [lib.RAW_SPI_CONFIG, lib.RAW_SPI_DATA, lib.RAW_BLE_DATA])
+        self.assertEqual(listRecord[2][2], ("aa:bb", "uuid2", "2"))
+        self.assertEqual(listRecord[2][3], 14)
+        self.assertEqual(bytes(listRecord[1][4]), bytes(range(22)))
+
+    def testNotTransportLog(self):
+        filename = os.path.join(self.directory, "recording.csv")
+
+        with open(filename, "w") as myFile:
+            myFile.write("Counter,Time\n")
+
+        self.assertFalse(lib.StretchSenseTransportLog.isTransportLog(filename))
+
+    def record(self, filename):
+        api = lib.StretchSenseAPI(spiConfiguration=lib.StretchSenseSpiConfiguration(addr="LOGGED",
+                                                                                    resolutionMode=lib.RESOLUTION_100fF))
+        api.spi_setup()
+        api.myDevice.respond = respondCounter
+        api.startTransportLog(filename)
+
+        for index in range(3):
+            api.spi_continuousModeCapacitance()
+        api.spi_reconfigure(resolutionMode=lib.RESOLUTION_1fF)
+        for index in range(3):
+            api.spi_continuousModeCapacitance()
+
+        api.stopTransportLog()
+        return api.getFrames()
+
+    def testReplaySpi(self):
+        filename = os.path.join(self.directory, "session.raw")
+        listLive = self.record(filename)
+
+        api = lib.StretchSenseAPI()
+        listChannels = api.replay_open(filename, speed=0)
+        self.assertEqual(set(channel.addr for channel in listChannels), set(["LOGGED"]))
+
+        listReplayed = []
+        while not api.replay_isFinished():
+            api.replay_mode()
+            listReplayed.extend(api.getFrames())
+
+        self.assertEqual([frame.values for frame in listReplayed], [frame.values for frame in listLive])
+        self.assertEqual([frame.scalingFactor for frame in listReplayed], [10, 10, 10, 1000, 1000, 1000])
+        self.assertEqual(listReplayed[0].configEpoch + 1, listReplayed[-1].configEpoch)
+
+    def testReplayLeavesLiveState(self):
+        filename = os.path.join(self.directory, "session.raw")
+        self.record(filename)
+
+        api = lib.StretchSenseAPI(spiConfiguration=lib.StretchSenseSpiConfiguration(addr="LIVE",
+                                                                                    resolutionMode=lib.RESOLUTION_10fF))
+        api.spi_setup()
+        before = (list(api.listPeripheralSpi), [channel.addr for channel in api.listPeripheralSpi],
+                  list(api.listPeripheralIsConnected), api.capacitanceScalingFactor, api.spiConfigEpoch,
+                  api.spiConfiguration.toDict())
+
+        api.replay_open(filename, speed=0)
+        while not api.replay_isFinished():
+            api.replay_mode()
+
+        after = (list(api.listPeripheralSpi), [channel.addr for channel in api.listPeripheralSpi],
+                 list(api.listPeripheralIsConnected), api.capacitanceScalingFactor, api.spiConfigEpoch,
+                 api.spiConfiguration.toDict())
+        self.assertEqual(before, after)
+
+    def testReplayBle(self):
+        filename = os.path.join(self.directory, "ble.raw")
+        log = lib.StretchSenseTransportLog(filename)
+        data = bytes(bytearray([0x00, 0x64] * 10))
+        log.write(lib.RAW_BLE_DATA, 1000, "aa:bb", lib.StretchSenseAPI.serviceUUID3, "3", data, 14)
+        log.close()
+
+        api = lib.StretchSenseAPI()
+        self.assertEqual(len(api.replay_open(filename, speed=0)), 10)
+        api.replay_mode()
+
+        listFrames = api.getFrames()
+        self.assertEqual(len(listFrames), 1)
+        self.assertEqual(listFrames[0].values, [10.0] * 10)
+
+
+if __name__ == '__main__':
+    unittest.main()